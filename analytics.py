@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Treat Quest analytics
+Where the dogs spend their time and where treats get eaten and come back, as
+coarse NumPy histograms - a couple of cell increments and one array compare per
+tick. Shown as a heatmap overlay (cached, refreshed every few seconds) and saved
+as .npz for offline tuning of spawn regions and AI ranges.
+
+    python3 analytics.py [heatmap-space.npz]    # summary of a saved file
+"""
+
+import os
+import sys
+
+import numpy as np
+import pygame
+
+import gamelog
+from paths import STATE_DIR
+
+log = gamelog.get('analytics')
+
+CELL = 24                   # px per histogram cell
+REFRESH_TICKS = 300         # overlay redrawn every 5s at 60 ticks/s
+EXPORT_TICKS = 36000        # and the arrays saved every 10 minutes
+HEATMAP_PATH = os.path.join(STATE_DIR, 'heatmap-space.npz')
+MAPS = ('dogs', 'collections', 'respawns')
+
+# Overlay colour per map (the brightest cells get full alpha)
+COLORS = {'dogs': (80, 160, 255), 'collections': (255, 80, 60), 'respawns': (80, 255, 120)}
+MAX_ALPHA = 150
+
+
+class Heatmaps:
+    """Accumulating histograms over the world - observe() once per sim tick"""
+    def __init__(self, width, height, cell=CELL):
+        self.cell = cell
+        self.cols = width // cell + 1
+        self.rows = height // cell + 1
+        self.maps = {name: np.zeros(self.rows * self.cols) for name in MAPS}
+        self.ticks = 0
+        self.prev_collected = None
+        self.overlay = None
+        self.overlay_tick = None
+
+    def add(self, name, x, y):
+        """Count one point - out-of-world points land on the edge cells"""
+        col = min(max(int(x // self.cell), 0), self.cols - 1)
+        row = min(max(int(y // self.cell), 0), self.rows - 1)
+        self.maps[name][row * self.cols + col] += 1
+
+    def observe(self, world):
+        self.ticks += 1
+        for dog in world.dogs:
+            self.add('dogs', dog.x, dog.y)
+
+        # Treats that were eaten (or stolen) / came back since the last tick - one compare
+        pool, n = world.treat_pool, world.treat_pool.count
+        collected = pool.collected[:n]
+        prev = self.prev_collected
+        if prev is None or len(prev) != n:
+            self.prev_collected = collected.copy()
+            return
+        if (collected != prev).any():
+            for i in np.flatnonzero(collected != prev).tolist():
+                self.add('collections' if collected[i] else 'respawns', pool.x[i], pool.y[i])
+            prev[:] = collected
+
+    def grid(self, name):
+        return self.maps[name].reshape(self.rows, self.cols)
+
+    def draw(self, screen):
+        """Overlay of every map, rebuilt from the histograms every REFRESH_TICKS"""
+        if self.overlay is None or self.ticks - self.overlay_tick >= REFRESH_TICKS:
+            self.overlay = self.render(screen.get_size())
+            self.overlay_tick = self.ticks
+        screen.blit(self.overlay, (0, 0))
+
+    def render(self, size):
+        rgb = np.zeros((self.cols, self.rows, 3))
+        alpha = np.zeros((self.cols, self.rows))
+        for name in MAPS:
+            counts = self.grid(name).T
+            if counts.max() <= 0:
+                continue
+            # Log scale - a few hot spots shouldn't wash out everything else
+            level = np.log1p(counts) / np.log1p(counts.max())
+            rgb += level[:, :, None] * COLORS[name]
+            alpha = np.maximum(alpha, level)
+        small = pygame.Surface((self.cols, self.rows), pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(small)[:] = np.clip(rgb, 0, 255).astype(np.uint8)
+        pygame.surfarray.pixels_alpha(small)[:] = (alpha * MAX_ALPHA).astype(np.uint8)
+        return pygame.transform.smoothscale(small, (self.cols * self.cell, self.rows * self.cell)).subsurface(
+            (0, 0, min(size[0], self.cols * self.cell), min(size[1], self.rows * self.cell)))
+
+    def export(self, path=HEATMAP_PATH):
+        """Arrays for offline analysis: one (rows, cols) grid per map, plus cell size and tick count"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez_compressed(tmp, cell=self.cell, ticks=self.ticks,
+                                **{name: self.grid(name) for name in MAPS})
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("Heatmap not saved: %s", e, event='heatmap_error')
+
+    def load(self, path=HEATMAP_PATH):
+        """Carry on accumulating from a saved file if it has the same grid"""
+        try:
+            with np.load(path) as saved:
+                if int(saved['cell']) != self.cell or saved['dogs'].shape != (self.rows, self.cols):
+                    return False
+                for name in MAPS:
+                    self.maps[name][:] = saved[name].ravel()
+                self.ticks = int(saved['ticks'])
+            return True
+        except (OSError, KeyError, ValueError):
+            return False
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else HEATMAP_PATH
+    with np.load(path) as saved:
+        cell, ticks = int(saved['cell']), int(saved['ticks'])
+        print(f"{path}: {ticks} ticks ({ticks / 3600:.1f} min at 60/s), {cell}px cells")
+        for name in MAPS:
+            grid = saved[name]
+            total = grid.sum()
+            if not total:
+                print(f"  {name:12s} empty")
+                continue
+            rows, cols = np.nonzero(grid >= np.percentile(grid[grid > 0], 90))
+            print(f"  {name:12s} {int(total):8d} counts, hottest cell at ({int(grid.argmax() % grid.shape[1]) * cell}, "
+                  f"{int(grid.argmax() // grid.shape[1]) * cell}), top 10% of cells span "
+                  f"x {cols.min() * cell}-{(cols.max() + 1) * cell}, y {rows.min() * cell}-{(rows.max() + 1) * cell}")
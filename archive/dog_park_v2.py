@@ -11,18 +11,19 @@ import sys
 import math
 import os
 
-os.environ['SDL_VIDEODRIVER'] = 'x11'
-os.environ['SDL_AUDIODRIVER'] = 'dummy'
+# Shared engine modules live in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gamelog
+from precipitation import Precipitation
+from scenes import SharedResources, run_scene
 
-pygame.init()
+log = gamelog.get('park')
 
-info = pygame.display.Info()
-SCREEN_WIDTH = info.current_w if info.current_w > 0 else 1920
-SCREEN_HEIGHT = info.current_h if info.current_h > 0 else 1080
+# Real size is set by create_game() once the display is open
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
 FPS = 60
 
-print(f"Screen: {SCREEN_WIDTH}x{SCREEN_HEIGHT}", flush=True)
-
 # Colors
 SKY_TOP = (135, 206, 235)  # Sky blue
 SKY_BOTTOM = (255, 248, 220)  # Cream horizon
@@ -291,59 +292,16 @@ class Treat:
             pygame.draw.circle(screen, (255, 255, 255), (sx, sy - 14), 3)
 
 
-class RainDrop:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(-100, 0)
-        self.speed = random.randint(8, 15)
-        self.length = random.randint(10, 20)
-    
-    def update(self):
-        self.y += self.speed
-        if self.y > SCREEN_HEIGHT:
-            self.y = random.randint(-50, -10)
-            self.x = random.randint(0, SCREEN_WIDTH)
-    
-    def draw(self, screen):
-        pygame.draw.line(screen, (150, 160, 180),
-                       (self.x, self.y), (self.x - 2, self.y + self.length), 1)
-
-
 class Game:
-    def __init__(self):
-        print("Initializing display...", flush=True)
-        
-        modes = [
-            (pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE, "Fullscreen HW"),
-            (pygame.FULLSCREEN | pygame.DOUBLEBUF, "Fullscreen DB"),
-            (pygame.FULLSCREEN, "Fullscreen"),
-            (0, "Windowed")
-        ]
-        
-        self.screen = None
-        for flags, name in modes:
-            try:
-                self.screen = pygame.display.set_mode((0, 0), flags)
-                print(f"Display mode: {name}", flush=True)
-                break
-            except Exception as e:
-                print(f"{name} failed: {e}", flush=True)
-        
-        if self.screen is None:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-            print("Fallback to fixed size", flush=True)
+    def __init__(self, shared):
+        # Display, clock and fonts are shared with the scene manager
+        self.shared = shared
+        self.screen = shared.screen
+        self.clock = shared.clock
         
-        pygame.display.set_caption("Treat Quest - Harley & Shanti v2")
-        self.clock = pygame.time.Clock()
-        
-        try:
-            self.font = pygame.font.Font(None, 80)
-            self.font_med = pygame.font.Font(None, 56)
-            self.font_small = pygame.font.Font(None, 40)
-        except:
-            self.font = pygame.font.SysFont('arial', 60)
-            self.font_med = pygame.font.SysFont('arial', 40)
-            self.font_small = pygame.font.SysFont('arial', 30)
+        self.font = shared.font(80, 60)
+        self.font_med = shared.font(56, 40)
+        self.font_small = shared.font(40, 30)
         
         # Harley (small) and Shanti (big)
         self.dogs = [
@@ -367,7 +325,7 @@ class Game:
             })
         
         # Rain
-        self.rain = [RainDrop() for _ in range(100)]
+        self.rain = Precipitation(SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Scene elements positions (fixed positions)
         self.hydrant_x = 180
@@ -383,7 +341,7 @@ class Game:
                 'color': (80 + i * 20, 140 + i * 15, 60 + i * 10)
             })
         
-        print("Game initialized!", flush=True)
+        log.info("Game initialized!", event='ready')
     
     def update_weather(self):
         global current_weather, weather_timer
@@ -392,7 +350,7 @@ class Game:
             weather_timer = 0
             choices = ['sunny', 'cloudy', 'raining']
             current_weather = random.choice(choices)
-            print(f"Weather changed to: {current_weather}", flush=True)
+            log.info("Weather changed to: %s", current_weather, event='weather', condition=current_weather)
     
     def draw_hills(self, weather_colors):
         # Back hills (darker)
@@ -514,10 +472,7 @@ class Game:
                            (x + 3, SCREEN_HEIGHT - 102), 2)
     
     def draw_rain(self):
-        if current_weather == 'raining':
-            for drop in self.rain:
-                drop.update()
-                drop.draw(self.screen)
+        self.rain.draw(self.screen)
     
     def draw_weather_indicator(self):
         # Weather icon top right
@@ -577,11 +532,12 @@ class Game:
         
         # Weather
         self.draw_weather_indicator()
-        
-        pygame.display.flip()
     
     def update(self):
         self.update_weather()
+        # Rain falls per sim step, not per drawn frame - the same speed at idle FPS
+        self.rain.set_condition(current_weather)
+        self.rain.update()
         
         for t in self.treats:
             t.update()
@@ -591,25 +547,24 @@ class Game:
             dog.update(self.treats, other)
     
     def run(self):
-        running = True
-        print("Starting Treat Quest v2!", flush=True)
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-            
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-        
-        pygame.quit()
-        sys.exit()
+        log.info("Starting Treat Quest v2!", event='start')
+        run_scene(self, FPS)
+
+
+def create_game(config=None, shared=None):
+    """Build the Dog Park - opens the display unless a scene manager shares one"""
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+    if shared is None:
+        log.info("Initializing display...", event='init')
+        shared = SharedResources("Treat Quest - Harley & Shanti v2", config)
+    SCREEN_WIDTH, SCREEN_HEIGHT = shared.screen.get_size()
+    log.info("Screen: %dx%d", SCREEN_WIDTH, SCREEN_HEIGHT, event='screen', width=SCREEN_WIDTH, height=SCREEN_HEIGHT)
+    
+    game = Game(shared)
+    shared.profile.mark('dog park')
+    return game
 
 
 if __name__ == "__main__":
-    print("Treat Quest v2: Dog Park Edition", flush=True)
-    Game().run()
+    log.info("Treat Quest v2: Dog Park Edition", event='launch')
+    create_game().run()
@@ -0,0 +1,78 @@
+"""
+Treat Quest target assignment
+Matches every chaser (dogs, Bestie) to its own treat in one batched pass, so
+two dogs never burn thrust on the same treat
+"""
+
+import heapq
+
+EXACT_AGENTS = 4     # up to this many chasers, search for the optimal matching
+MISS = 1e6           # cost of leaving a chaser without a target
+
+
+def assign_greedy(costs):
+    """Cheapest pair first off a priority queue - O(P log P) for P reachable pairs"""
+    heap = [(c, a, t) for a, row in enumerate(costs) for t, c in enumerate(row) if c is not None]
+    heapq.heapify(heap)
+    result = [None] * len(costs)
+    taken = set()
+    left = len(costs)
+    while heap and left:
+        _, a, t = heapq.heappop(heap)
+        if result[a] is None and t not in taken:
+            result[a] = t
+            taken.add(t)
+            left -= 1
+    return result
+
+
+def assign_exact(costs):
+    """Minimum total cost matching (as many chasers as possible get a target), by branch and bound"""
+    best = [MISS * (len(costs) + 1), [None] * len(costs)]
+    chosen = [None] * len(costs)
+    # Cheapest options first, so good solutions are found early and prune the rest
+    options = [sorted((c, t) for t, c in enumerate(row) if c is not None) for row in costs]
+
+    def search(agent, total, taken):
+        if total >= best[0]:
+            return
+        if agent == len(costs):
+            best[0], best[1] = total, list(chosen)
+            return
+        for c, t in options[agent]:
+            if t not in taken:
+                chosen[agent] = t
+                taken.add(t)
+                search(agent + 1, total + c, taken)
+                taken.discard(t)
+        chosen[agent] = None
+        search(agent + 1, total + MISS, taken)
+
+    search(0, 0.0, set())
+    return best[1]
+
+
+def assign(costs):
+    """costs[agent][treat], None where out of reach -> treat index (or None) per agent"""
+    if len(costs) <= EXACT_AGENTS:
+        return assign_exact(costs)
+    return assign_greedy(costs)
+
+
+class TargetAssigner:
+    """Runs the matching only when the set of chasers or available treats changes"""
+    def __init__(self):
+        self.key = None
+        self.targets = []
+        self.solves = 0
+
+    def update(self, agents, treats, available, cost):
+        """available: indices of uneaten treats; cost(agent, treat) -> float, or None to rule it out"""
+        key = (tuple(id(a) for a in agents), tuple(available))
+        if key != self.key:
+            self.key = key
+            self.solves += 1
+            candidates = [treats[i] for i in available]
+            picks = assign([[cost(a, t) for t in candidates] for a in agents])
+            self.targets = [candidates[p] if p is not None else None for p in picks]
+        return self.targets
@@ -0,0 +1,146 @@
+"""
+Treat Quest sprite atlas
+Bakes procedurally drawn sprites (and their rotation/animation frames) into one
+texture plus an index, cached on disk keyed by a hash of the drawing code
+"""
+
+import hashlib
+import json
+import math
+import os
+
+import pygame
+
+import gamelog
+from paths import CACHE_DIR
+
+log = gamelog.get('atlas')
+
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 2048
+COLORKEY = (255, 0, 255)
+
+
+class SpriteAtlas:
+    """One surface, many sub-rects - each sprite frame is a single blit"""
+    def __init__(self, surface, index):
+        self.surface = surface
+        # name -> list of (rect, anchor_x, anchor_y)
+        self.sprites = {
+            name: [(pygame.Rect(x, y, w, h), ax, ay) for x, y, w, h, ax, ay in frames]
+            for name, frames in index.items()
+        }
+
+    def has(self, name):
+        return name in self.sprites
+
+    def frame_count(self, name):
+        return len(self.sprites[name])
+
+    def angle_frame(self, name, angle):
+        """Nearest baked rotation frame for an angle in radians"""
+        count = len(self.sprites[name])
+        return int(round(angle / (2 * math.pi) * count)) % count
+
+    def blit(self, screen, name, frame, x, y):
+        rect, ax, ay = self.sprites[name][frame]
+        screen.blit(self.surface, (int(x) - ax, int(y) - ay), rect)
+
+    def blits(self, screen, items):
+        """Many (name, frame, x, y) sprites in one Surface.blits call"""
+        sprites = self.sprites
+        batch = []
+        for name, frame, x, y in items:
+            rect, ax, ay = sprites[name][frame]
+            batch.append((self.surface, (int(x) - ax, int(y) - ay), rect))
+        screen.blits(batch, doreturn=False)
+
+
+def atlas_key(sources, scale):
+    """Hash of the drawing code and scale - any edit to either re-bakes"""
+    digest = hashlib.sha1(f"v{ATLAS_VERSION}|scale={scale}".encode())
+    # The baker itself is part of the drawing code
+    for source in [__file__] + list(sources):
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def bake_atlas(recipes, scale=1.0):
+    """Render every recipe frame into one shelf-packed surface
+
+    recipes: name -> (w, h, anchor_x, anchor_y, frames, draw(surface, cx, cy, frame))
+    """
+    cells = []
+    for name, (w, h, ax, ay, frames, draw) in recipes.items():
+        for frame in range(frames):
+            cell = pygame.Surface((w, h))
+            cell.fill(COLORKEY)
+            draw(cell, ax, ay, frame)
+            if scale != 1.0:
+                # Nearest-neighbour keeps the colorkey edges clean
+                cell = pygame.transform.scale(cell, (int(w * scale), int(h * scale)))
+            cells.append((name, cell, int(ax * scale), int(ay * scale)))
+
+    # Shelf packing, tallest cells first
+    order = sorted(range(len(cells)), key=lambda i: -cells[i][1].get_height())
+    placements = [None] * len(cells)
+    x = y = shelf_h = 0
+    for i in order:
+        cw, ch = cells[i][1].get_size()
+        if x + cw > ATLAS_WIDTH:
+            x, y = 0, y + shelf_h
+            shelf_h = 0
+        placements[i] = (x, y)
+        x += cw
+        shelf_h = max(shelf_h, ch)
+
+    surface = pygame.Surface((ATLAS_WIDTH, max(1, y + shelf_h)))
+    surface.fill(COLORKEY)
+    index = {}
+    for (name, cell, ax, ay), (px, py) in zip(cells, placements):
+        surface.blit(cell, (px, py))
+        index.setdefault(name, []).append((px, py, cell.get_width(), cell.get_height(), ax, ay))
+    return surface, index
+
+
+def load_atlas(name, recipes, sources, scale=1.0, cache_dir=CACHE_DIR):
+    """Load the cached atlas if it matches the current drawing code, else bake and store it"""
+    key = atlas_key(sources, scale)
+    png_path = os.path.join(cache_dir, f"{name}-{key}.png")
+    index_path = os.path.join(cache_dir, f"{name}-{key}.json")
+
+    surface = index = None
+    try:
+        with open(index_path) as f:
+            index = json.load(f)['sprites']
+        surface = pygame.image.load(png_path)
+        if set(index) != set(recipes):
+            surface = None
+    except (OSError, ValueError, KeyError, pygame.error):
+        surface = None
+
+    if surface is None:
+        surface, index = bake_atlas(recipes, scale)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Stale atlases for older drawing code go first
+            for old in os.listdir(cache_dir):
+                if old.startswith(name + '-') and not old.startswith(f"{name}-{key}"):
+                    os.remove(os.path.join(cache_dir, old))
+            # Per-process temp names - several screens may bake on one box at once
+            tmp = f".{os.getpid()}.tmp"
+            pygame.image.save(surface, png_path + tmp + '.png')
+            os.replace(png_path + tmp + '.png', png_path)
+            with open(index_path + tmp, 'w') as f:
+                json.dump({'key': key, 'sprites': index}, f)
+            os.replace(index_path + tmp, index_path)
+            log.info("Baked sprite atlas %s-%s (%dx%d)", name, key, surface.get_width(), surface.get_height(),
+                     event='atlas_baked', atlas=name, key=key)
+        except (OSError, pygame.error) as e:
+            log.warning("Sprite atlas not cached: %s", e, event='atlas_not_cached')
+
+    # No RLEACCEL - RLE makes sub-rect blits from a big sheet several times slower
+    surface = surface.convert()
+    surface.set_colorkey(COLORKEY)
+    return SpriteAtlas(surface, index)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Treat Quest micro-benchmarks
+Times every entity's hot update and draw path in isolation, one frame's worth
+of entities per call, against an offscreen surface the size of the TV. Results
+are kept per git revision so a change can be compared with what came before,
+and anything slower than the last other revision by more than the threshold is
+flagged (exit status 1).
+
+    python3 benchmarks.py                   # everything, saved under this revision
+    python3 benchmarks.py Dog Earth         # just benchmarks with these in the name
+    python3 benchmarks.py --procedural      # draw paths without the baked sprite atlas
+    python3 benchmarks.py --history         # what's been recorded so far
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from paths import STATE_DIR
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(STATE_DIR, 'benchmarks.json')
+SIZE = (1920, 1080)
+SEED = 2026
+REPEATS = 5
+MIN_REPEAT_SECONDS = 0.05    # each repeat runs enough calls to last at least this long
+THRESHOLD = 0.15             # flag anything this much slower than the baseline
+
+# name -> setup(env) returning the callable to time; registered by @benchmark
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def revision():
+    """Short git hash, with -dirty if tracked files have uncommitted changes"""
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return f"{rev}-dirty" if dirty else rev
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Env:
+    """Both editions built once, headless, plus the offscreen surface every draw goes to"""
+    def __init__(self, procedural=False):
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        import pygame
+        import dog_park
+        import main
+        from scenes import SharedResources
+        from weather import weather_cache
+
+        random.seed(SEED)
+        # Fresh weather nobody refetches - no network or curl timing in the numbers
+        weather_cache.update({'condition': 'clear_space', 'temp': 72, 'last_update': time.monotonic()})
+        config = {'video_driver': 'dummy', 'size': SIZE, 'stats': False, 'analytics': False,
+                  'checkpoint_seconds': 0, 'sim_process': False, 'atlas': not procedural}
+        self.shared = SharedResources("Treat Quest benchmarks", config)
+        self.target = pygame.Surface(SIZE).convert()
+
+        self.space = dog_park.create_game(self.shared.config, self.shared)
+        self.world = self.space.world
+        # A minute in, so trails, steering and schedules look like a running game
+        for _ in range(3600):
+            self.world.step()
+        for actor in (self.world.ufo, self.world.space_squirrel, self.world.bestie):
+            if not actor.active:
+                actor.spawn()
+            actor.x, actor.y = SIZE[0] // 2, SIZE[1] // 3
+
+        self.platformer = main.create_game(self.shared.config, self.shared)
+        self.dog_park = dog_park
+        self.main = main
+
+
+@benchmark('SpaceDog.update')
+def space_dog_update(env):
+    world = env.world
+    def run():
+        for dog in world.dogs:
+            dog.update(world.steering)
+    return run
+
+
+@benchmark('SpaceDog.draw')
+def space_dog_draw(env):
+    dogs, target = env.world.dogs, env.target
+    def run():
+        for dog in dogs:
+            dog.draw(target)
+    return run
+
+
+@benchmark('SpaceTreat.update')
+def space_treat_update(env):
+    # Every treat moves in one TreatPool update
+    return env.world.treat_pool.update
+
+
+@benchmark('SpaceTreat.draw')
+def space_treat_draw(env):
+    pool, target = env.world.treat_pool, env.target
+    return lambda: env.dog_park.SpaceTreat.draw_all(target, pool)
+
+
+@benchmark('Asteroid.draw')
+def asteroid_draw(env):
+    pool, target = env.world.asteroid_pool, env.target
+    return lambda: pool.draw(target)
+
+
+@benchmark('UFO.draw')
+def ufo_draw(env):
+    ufo, target = env.world.ufo, env.target
+    return lambda: ufo.draw(target)
+
+
+@benchmark('SpaceSquirrel.draw')
+def squirrel_draw(env):
+    squirrel, target = env.world.space_squirrel, env.target
+    return lambda: squirrel.draw(target)
+
+
+@benchmark('Bestie.draw')
+def bestie_draw(env):
+    bestie, target = env.world.bestie, env.target
+    return lambda: bestie.draw(target)
+
+
+@benchmark('StarField.draw')
+def starfield_draw(env):
+    starfield, target = env.space.starfield, env.target
+    return lambda: starfield.draw(target)
+
+
+@benchmark('Earth.draw')
+def earth_draw(env):
+    earth, target = env.space.earth, env.target
+    return lambda: earth.draw(target)
+
+
+@benchmark('SpaceWorld.step')
+def world_step(env):
+    return env.world.step
+
+
+@benchmark('SpaceGame.draw')
+def space_frame(env):
+    # The whole frame, for scale
+    game = env.space
+    def run():
+        screen, game.screen = game.screen, env.target
+        game.draw()
+        game.screen = screen
+    return run
+
+
+@benchmark('main.Dog.draw')
+def platformer_dog_draw(env):
+    game, target = env.platformer, env.target
+    def run():
+        for dog in game.dogs:
+            dog.draw(target, game.camera_x)
+    return run
+
+
+@benchmark('main.Platform.draw')
+def platform_draw(env):
+    # The ones on screen, as Game.draw culls them
+    game, target = env.platformer, env.target
+    visible = [p for p in game.platforms if -200 < p.x - game.camera_x < env.main.SCREEN_WIDTH + 200]
+    def run():
+        for plat in visible:
+            plat.draw(target, game.camera_x)
+    return run
+
+
+def measure(fn):
+    """(best, median) microseconds per call over REPEATS timed runs, and the calls per run"""
+    fn()  # warm caches
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        if time.perf_counter() - start >= MIN_REPEAT_SECONDS:
+            break
+        calls *= 2
+    runs = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        runs.append((time.perf_counter() - start) / calls * 1e6)
+    runs.sort()
+    return runs[0], runs[len(runs) // 2], calls
+
+
+def load_results(path=RESULTS_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'runs': []}
+
+
+def save_results(results, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(results, f, indent=1)
+    os.replace(tmp, path)
+
+
+def baseline_for(runs, rev, mode, against=None):
+    """name -> (revision, result) from the latest run of another revision (or the one asked for)
+    that timed it, in the same mode on this host"""
+    host = platform.node()
+    baseline = {}
+    for run in reversed(runs):
+        if run['mode'] != mode or run['host'] != host:
+            continue
+        if (against and run['revision'] == against) or (not against and run['revision'] != rev):
+            for name, result in run['results'].items():
+                baseline.setdefault(name, (run['revision'], result))
+    return baseline
+
+
+def show_history(runs):
+    names = sorted({name for run in runs for name in run['results']})
+    for run in runs:
+        print(f"{run['at']}  {run['revision']:14s} {run['mode']:10s} {run['host']}", flush=True)
+    for name in names:
+        cells = [f"{run['results'][name]['median_us']:9.1f}" if name in run['results'] else f"{'-':>9s}"
+                 for run in runs[-8:]]
+        print(f"  {name:20s}" + ''.join(cells), flush=True)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for every Treat Quest update and draw path")
+    parser.add_argument('names', nargs='*', help="only benchmarks containing one of these")
+    parser.add_argument('--procedural', action='store_true', help="draw without the baked sprite atlas")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="regression threshold (0.15 = 15%%)")
+    parser.add_argument('--against', help="compare with this revision instead of the last other one")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--history', action='store_true', help="print recorded runs and exit")
+    args = parser.parse_args()
+
+    results = load_results(args.output)
+    if args.history:
+        show_history(results['runs'])
+        return
+
+    selected = [name for name in BENCHMARKS if not args.names or any(n in name for n in args.names)]
+    if not selected:
+        parser.error(f"no benchmark matches (choose from {', '.join(BENCHMARKS)})")
+
+    rev = revision()
+    mode = 'procedural' if args.procedural else 'atlas'
+    env = Env(args.procedural)
+    baseline = baseline_for(results['runs'], rev, mode, args.against)
+    print(f"Revision {rev} ({mode}), baseline "
+          f"{', '.join(sorted({r for r, _ in baseline.values()})) or 'none'}", flush=True)
+
+    timings = {}
+    regressions = []
+    for name in selected:
+        random.seed(SEED)
+        best, median, calls = measure(BENCHMARKS[name](env))
+        timings[name] = {'best_us': round(best, 2), 'median_us': round(median, 2), 'calls': calls}
+        line = f"  {name:20s} {median:9.1f} us  (best {best:.1f})"
+        if name in baseline:
+            before_rev, before = baseline[name]
+            change = median / before['median_us'] - 1
+            line += f"  {change:+6.1%} vs {before_rev}"
+            if change > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line, flush=True)
+
+    if not args.no_save:
+        results['runs'].append({'revision': rev, 'mode': mode, 'at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                                'host': platform.node(), 'python': platform.python_version(),
+                                'size': list(SIZE), 'results': timings})
+        save_results(results, args.output)
+    if regressions:
+        print(f"Slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}", flush=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
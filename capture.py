@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Treat Quest frame capture
+Screenshots and daily timelapses without stalling the game. The render thread
+only copies the finished frame's raw pixels into a free slot of a shared-memory
+ring (about a millisecond at 1080p); a worker process converts, downscales and
+encodes. If no slot is free the worker is behind, and the frame is dropped
+rather than waited for.
+
+    python3 capture.py screenshot      # ask the running game for a full-size PNG
+    python3 capture.py list            # timelapses so far, with an ffmpeg line for each
+"""
+
+import atexit
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import gamelog
+from paths import STATE_DIR
+
+log = gamelog.get('capture')
+
+CAPTURE_DIR = os.path.join(STATE_DIR, 'capture')
+SCREENSHOT_REQUEST = 'screenshot.request'
+SLOTS = 3
+REQUEST_POLL_SECONDS = 1.0
+DROP_REPORT_SECONDS = 60.0
+
+# What a captured frame is for (bit flags - one frame can be both)
+SCREENSHOT, TIMELAPSE = 1, 2
+
+# Slot states: the render thread moves FREE -> WRITING -> READY, the worker READY -> READING -> FREE
+FREE, WRITING, READY, READING = range(4)
+# Header (int64): stop flag, frames captured, frames dropped, ms between frames the reader
+# wants (0 = none - only the live view uses it), then (state, seq, kind, epoch ms) per slot
+STOP, CAPTURED, DROPPED, WANTED = range(4)
+HEADER_SLOTS = 4
+SLOT_FIELDS = 4
+
+
+class FrameRing:
+    """A few raw frame buffers plus their states in one shared memory block - one writer, one reader"""
+    def __init__(self, frame_bytes, slots=SLOTS, name=None):
+        self.frame_bytes = frame_bytes
+        self.slots = slots
+        header = (HEADER_SLOTS + slots * SLOT_FIELDS) * 8
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header + slots * frame_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        self.slot_info = np.ndarray((slots, SLOT_FIELDS), dtype=np.int64, buffer=self.shm.buf,
+                                    offset=HEADER_SLOTS * 8)
+        self.frames = np.ndarray((slots, frame_bytes), dtype=np.uint8, buffer=self.shm.buf, offset=header)
+        self.seq = 0
+        if self.owner:
+            self.header[:] = 0
+            self.slot_info[:] = 0
+            self.frames[:] = 0  # fault the pages in now, not on the first captured frame
+
+    def put(self, surface, kind):
+        """Copy a surface's pixels into a free slot - False (and counted) if the reader is behind"""
+        free = np.flatnonzero(self.slot_info[:, 0] == FREE)
+        if not len(free):
+            self.header[DROPPED] += 1
+            return False
+        slot = int(free[0])
+        info = self.slot_info[slot]
+        info[0] = WRITING
+        view = surface.get_view('0')
+        np.copyto(self.frames[slot], np.frombuffer(view, dtype=np.uint8))
+        del view  # unlocks the surface
+        self.seq += 1
+        info[1] = self.seq
+        info[2] = kind
+        info[3] = int(time.time() * 1000)
+        info[0] = READY
+        self.header[CAPTURED] += 1
+        return True
+
+    def take(self):
+        """Oldest ready frame as (slot, kind, epoch seconds) - None if there isn't one"""
+        ready = np.flatnonzero(self.slot_info[:, 0] == READY)
+        if not len(ready):
+            return None
+        slot = int(ready[np.argmin(self.slot_info[ready, 1])])
+        self.slot_info[slot, 0] = READING
+        return slot, int(self.slot_info[slot, 2]), self.slot_info[slot, 3] / 1000
+
+    def release(self, slot):
+        self.slot_info[slot, 0] = FREE
+
+    @property
+    def stopped(self):
+        return bool(self.header[STOP])
+
+    def stop(self):
+        self.header[STOP] = 1
+
+    def close(self):
+        # Views have to go before the mapping can be closed
+        del self.header, self.slot_info, self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def to_rgb(raw, geometry, step=1):
+    """Raw 32-bit surface bytes -> (height, width, 3) uint8, using the surface's channel shifts
+
+    step > 1 keeps every step-th pixel each way - a cheap first downscale.
+    """
+    width, height, pitch, shifts = geometry
+    pixels = raw.view(np.uint32).reshape(height, pitch // 4)[::step, :width:step]
+    rgb = np.empty(pixels.shape + (3,), dtype=np.uint8)
+    for channel, shift in enumerate(shifts[:3]):
+        rgb[:, :, channel] = pixels >> shift
+    return rgb
+
+
+def day_dir(directory, at):
+    return os.path.join(directory, 'timelapse', time.strftime('%Y-%m-%d', time.localtime(at)))
+
+
+def prune(directory, keep_days):
+    """Drop timelapse days older than keep_days"""
+    root = os.path.join(directory, 'timelapse')
+    cutoff = time.strftime('%Y-%m-%d', time.localtime(time.time() - keep_days * 86400))
+    try:
+        for name in os.listdir(root):
+            if name[:10] < cutoff:
+                path = os.path.join(root, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+    except OSError:
+        pass
+
+
+def save_frame(rgb, kind, at, settings):
+    """Encode one frame as a screenshot and/or a timelapse frame"""
+    import pygame
+    height, width = rgb.shape[:2]
+    surface = pygame.image.frombuffer(rgb.tobytes(), (width, height), 'RGB')
+    directory = settings['directory']
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(at))
+
+    if kind & SCREENSHOT:
+        os.makedirs(os.path.join(directory, 'screenshots'), exist_ok=True)
+        path = os.path.join(directory, 'screenshots', f"screenshot-{stamp}.png")
+        pygame.image.save(surface, path)
+        log.info("Screenshot saved: %s", path, event='screenshot', path=path)
+
+    if kind & TIMELAPSE:
+        size = (settings['width'], settings['width'] * height // width)
+        small = pygame.transform.smoothscale(surface, size)
+        day = day_dir(directory, at)
+        if settings['format'] == 'raw':
+            # One rgb24 stream per day - ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -i ...
+            os.makedirs(os.path.dirname(day), exist_ok=True)
+            with open(f"{day}-{size[0]}x{size[1]}.rgb", 'ab') as f:
+                f.write(pygame.image.tobytes(small, 'RGB'))
+        else:
+            os.makedirs(day, exist_ok=True)
+            pygame.image.save(small, os.path.join(day, f"{stamp}.{settings['format']}"))
+
+
+def capture_worker(ring_name, frame_bytes, slots, geometry, settings, parent_pid):
+    """Child process: encode whatever the render thread hands over"""
+    # Ctrl-C reaches the whole process group - the game decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ring = FrameRing(frame_bytes, slots, ring_name)
+    pruned_day = None
+    while not ring.stopped and os.getppid() == parent_pid:
+        item = ring.take()
+        if item is None:
+            time.sleep(0.05)
+            continue
+        slot, kind, at = item
+        try:
+            rgb = to_rgb(ring.frames[slot], geometry)
+        finally:
+            # The slot is free again as soon as its pixels are converted
+            ring.release(slot)
+        try:
+            save_frame(rgb, kind, at, settings)
+        except Exception as e:
+            log.warning("Capture failed: %s", e, event='capture_error')
+        today = time.strftime('%Y-%m-%d')
+        if kind & TIMELAPSE and today != pruned_day:
+            pruned_day = today
+            prune(settings['directory'], settings['keep_days'])
+    ring.close()
+
+
+class Capture:
+    """Render-side half - frame(screen) once per finished frame, before the flip"""
+    def __init__(self, config, screen, directory=CAPTURE_DIR):
+        self.interval = config['capture_interval']
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.request_path = os.path.join(directory, SCREENSHOT_REQUEST)
+        now = time.monotonic()
+        self.next_timelapse = now + self.interval if self.interval else None
+        self.next_poll = now
+        self.screenshot_requested = False
+
+        if screen.get_bytesize() != 4:
+            raise ValueError(f"needs a 32-bit display, not {screen.get_bitsize()}-bit")
+        width, height = screen.get_size()
+        geometry = (width, height, screen.get_pitch(), screen.get_shifts())
+        settings = {'directory': directory, 'width': min(config['capture_width'], width),
+                    'format': config['capture_format'], 'keep_days': config['capture_keep_days']}
+        frame_bytes = screen.get_pitch() * height
+        self.ring = FrameRing(frame_bytes)
+        # spawn, not fork - the worker must not inherit our X11 connection
+        context = multiprocessing.get_context('spawn')
+        self.process = context.Process(target=capture_worker, name='treatquest-capture', daemon=True,
+                                       args=(self.ring.name, frame_bytes, SLOTS, geometry, settings, os.getpid()))
+        self.process.start()
+        atexit.register(self.close)
+        every = f"a timelapse frame every {self.interval}s" if self.interval else "screenshots only"
+        log.info("Capture worker %d: %s, into %s", self.process.pid, every, directory, event='capture_started',
+                 interval=self.interval)
+
+    def request_screenshot(self):
+        self.screenshot_requested = True
+
+    def frame(self, screen):
+        now = time.monotonic()
+        kind = 0
+        if self.next_timelapse is not None and now >= self.next_timelapse:
+            kind |= TIMELAPSE
+            # After a stall, carry on from now instead of capturing a burst
+            self.next_timelapse = max(self.next_timelapse + self.interval, now)
+        if now >= self.next_poll:
+            self.next_poll = now + REQUEST_POLL_SECONDS
+            if os.path.exists(self.request_path):
+                try:
+                    os.remove(self.request_path)
+                except OSError:
+                    pass
+                self.screenshot_requested = True
+        if self.screenshot_requested:
+            kind |= SCREENSHOT
+        if not kind or self.ring is None:
+            return
+        if self.ring.put(screen, kind):
+            self.screenshot_requested = False
+        else:
+            # A screenshot stays requested and goes with the next frame that fits
+            log.warning("Capture worker behind - frame dropped", event='capture_dropped',
+                        every=DROP_REPORT_SECONDS, dropped=int(self.ring.header[DROPPED]))
+
+    def close(self):
+        if self.ring is None:
+            return
+        self.ring.stop()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
+        self.ring = None
+
+
+def list_timelapses(directory=CAPTURE_DIR):
+    root = os.path.join(directory, 'timelapse')
+    if not os.path.isdir(root):
+        print(f"No timelapses in {root}")
+        return
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            frames = sorted(os.listdir(path))
+            ext = frames[0].rsplit('.', 1)[-1] if frames else 'jpg'
+            print(f"{name}: {len(frames)} frames\n"
+                  f"  ffmpeg -framerate 30 -pattern_type glob -i '{path}/*.{ext}' -pix_fmt yuv420p {name}.mp4")
+        elif name.endswith('.rgb'):
+            size = name.rsplit('-', 1)[1][:-4]
+            width, height = (int(v) for v in size.split('x'))
+            frames = os.path.getsize(path) // (width * height * 3)
+            print(f"{name}: {frames} frames\n"
+                  f"  ffmpeg -f rawvideo -pix_fmt rgb24 -s {size} -framerate 30 -i '{path}' "
+                  f"-pix_fmt yuv420p {name[:10]}.mp4")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    if command == 'screenshot':
+        os.makedirs(CAPTURE_DIR, exist_ok=True)
+        with open(os.path.join(CAPTURE_DIR, SCREENSHOT_REQUEST), 'w'):
+            pass
+        print(f"Screenshot requested - it lands in {os.path.join(CAPTURE_DIR, 'screenshots')} within a second or two")
+    elif command == 'list':
+        list_timelapses()
+    else:
+        sys.exit(f"usage: {sys.argv[0]} [screenshot|list]")
@@ -0,0 +1,139 @@
+"""
+Treat Quest checkpoints
+The world is saved every few seconds as named sections (arrays as .npy, the rest
+as JSON), so a crash, deploy or power cut resumes the same scene and scores.
+Section files are named by their content hash: a section that hasn't changed since
+the last save isn't written again, and a manifest swapped in atomically says which
+files make up the latest checkpoint.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+import gamelog
+from paths import STATE_DIR
+
+log = gamelog.get('checkpoint')
+
+CHECKPOINT_VERSION = 1
+
+
+def encode_section(value):
+    """(bytes, extension) - arrays as .npy, everything else as JSON"""
+    if isinstance(value, np.ndarray):
+        buf = io.BytesIO()
+        np.save(buf, value, allow_pickle=False)
+        return buf.getvalue(), 'npy'
+    return json.dumps(value, separators=(',', ':')).encode(), 'json'
+
+
+def decode_section(data, extension):
+    if extension == 'npy':
+        return np.load(io.BytesIO(data), allow_pickle=False)
+    return json.loads(data)
+
+
+def write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class CheckpointStore:
+    """Latest checkpoint of one world in a directory - save() from a background thread via submit()"""
+    def __init__(self, name='space', directory=STATE_DIR):
+        self.name = name
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, f"{name}-checkpoint.json")
+        self.written = 0
+        self.pending = None
+        self.thread = None
+        self.wake = threading.Condition()
+        self.lock = threading.Lock()  # the writer thread and a last save at exit
+
+    def __getstate__(self):
+        # Goes to the sim process with the world - the writer thread stays behind
+        return {'name': self.name, 'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'], state['directory'])
+
+    def save(self, sections):
+        """Write changed sections, then the manifest - returns how many section files were written"""
+        with self.lock:
+            return self._save(sections)
+
+    def _save(self, sections):
+        os.makedirs(self.directory, exist_ok=True)
+        files = {}
+        written = 0
+        for section, value in sections.items():
+            data, extension = encode_section(value)
+            filename = f"{self.name}-{section}-{hashlib.sha1(data).hexdigest()[:16]}.{extension}"
+            path = os.path.join(self.directory, filename)
+            if not os.path.exists(path):
+                write_atomic(path, data)
+                written += 1
+            files[section] = filename
+
+        manifest = {'version': CHECKPOINT_VERSION, 'sections': files}
+        write_atomic(self.manifest_path, json.dumps(manifest, indent=1).encode())
+
+        # Section files no manifest points at any more - only ours, other space-* files stay
+        keep = set(files.values())
+        ours = re.compile(rf"{re.escape(self.name)}-.+-[0-9a-f]{{16}}\.(npy|json)(\.\d+\.tmp)?")
+        for old in os.listdir(self.directory):
+            if ours.fullmatch(old) and old not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, old))
+                except OSError:
+                    pass
+        self.written += written
+        return written
+
+    def load(self):
+        """Sections of the latest checkpoint, or None if there isn't a usable one"""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') != CHECKPOINT_VERSION:
+                log.info("Checkpoint version %s ignored (want %d)", manifest.get('version'), CHECKPOINT_VERSION,
+                         event='checkpoint_version')
+                return None
+            sections = {}
+            for section, filename in manifest['sections'].items():
+                with open(os.path.join(self.directory, filename), 'rb') as f:
+                    sections[section] = decode_section(f.read(), filename.rsplit('.', 1)[1])
+            return sections
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Checkpoint unreadable, starting fresh: %s", e, event='checkpoint_unreadable')
+            return None
+
+    def submit(self, sections):
+        """Hand sections to the writer thread - a newer checkpoint replaces one not yet written"""
+        with self.wake:
+            self.pending = sections
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.writer, name='checkpoint', daemon=True)
+                self.thread.start()
+            self.wake.notify()
+
+    def writer(self):
+        while True:
+            with self.wake:
+                while self.pending is None:
+                    self.wake.wait()
+                sections, self.pending = self.pending, None
+            try:
+                self.save(sections)
+            except OSError as e:
+                log.warning("Checkpoint not saved: %s", e, event='checkpoint_error')
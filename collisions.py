@@ -0,0 +1,105 @@
+"""
+Treat Quest collision pipeline
+One broadphase + narrowphase pass per tick that turns overlaps into events
+"""
+
+from collections import namedtuple
+
+# kind is 'platform', 'treat' or 'dog'; side is only set for platforms ('top'/'bottom')
+CollisionEvent = namedtuple('CollisionEvent', ['kind', 'a', 'b', 'side'])
+
+
+class SpatialHash:
+    """Uniform grid broadphase - buckets boxes into fixed-size cells"""
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+
+    def _span(self, left, top, right, bottom):
+        cs = self.cell_size
+        return int(left // cs), int(top // cs), int(right // cs), int(bottom // cs)
+
+    def insert(self, obj, left, top, right, bottom):
+        # Insertion order is kept so queries resolve in a stable order
+        entry = (self.count, obj)
+        self.count += 1
+        x0, y0, x1, y1 = self._span(left, top, right, bottom)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(entry)
+
+    def query(self, left, top, right, bottom):
+        found = {}
+        x0, y0, x1, y1 = self._span(left, top, right, bottom)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for order, obj in self.cells.get((cx, cy), ()):
+                    found[order] = obj
+        return [found[order] for order in sorted(found)]
+
+
+class CollisionWorld:
+    """Static platforms and pickups live in prebuilt grids, dogs are checked once per tick"""
+    def __init__(self, pickup_radius=40, cell_size=128):
+        self.pickup_radius = pickup_radius
+        self.platforms = SpatialHash(cell_size)
+        self.pickups = SpatialHash(cell_size)
+        self.movers = SpatialHash(cell_size)
+
+    def add_platform(self, plat):
+        self.platforms.insert(plat, plat.x, plat.y, plat.x + plat.width, plat.y + plat.height)
+
+    def add_pickup(self, item):
+        r = self.pickup_radius
+        self.pickups.insert(item, item.x - r, item.y - r, item.x + r, item.y + r)
+
+    def step(self, dogs):
+        """Run the collision stage for this tick and return the event list"""
+        events = []
+        self.movers.clear()
+        r = self.pickup_radius
+        r_sq = r * r
+
+        for dog in dogs:
+            half_w, half_h = dog.width // 2, dog.height // 2
+
+            # Platforms - resolved in place so later platforms see the corrected position
+            margin = abs(dog.vy) + 1
+            for plat in self.platforms.query(dog.x - half_w, dog.y - half_h - margin,
+                                             dog.x + half_w, dog.y + half_h + margin):
+                if (dog.x + half_w > plat.x and
+                    dog.x - half_w < plat.x + plat.width and
+                    dog.y + half_h > plat.y and
+                    dog.y - half_h < plat.y + plat.height):
+                    side = dog.resolve_platform(plat)
+                    if side:
+                        events.append(CollisionEvent('platform', dog, plat, side))
+
+            # Pickups - squared distance, no sqrt
+            for item in self.pickups.query(dog.x - r, dog.y - r, dog.x + r, dog.y + r):
+                if not item.collected:
+                    dx = dog.x - item.x
+                    dy = dog.y - item.y
+                    if dx*dx + dy*dy < r_sq:
+                        events.append(CollisionEvent('treat', dog, item, None))
+
+            self.movers.insert(dog, dog.x - half_w, dog.y - half_h, dog.x + half_w, dog.y + half_h)
+
+        # Dog vs dog - each pair reported once
+        order = {id(dog): i for i, dog in enumerate(dogs)}
+        for i, dog in enumerate(dogs):
+            half_w, half_h = dog.width // 2, dog.height // 2
+            for other in self.movers.query(dog.x - half_w, dog.y - half_h,
+                                           dog.x + half_w, dog.y + half_h):
+                if order[id(other)] <= i:
+                    continue
+                if (abs(dog.x - other.x) < half_w + other.width // 2 and
+                    abs(dog.y - other.y) < half_h + other.height // 2):
+                    events.append(CollisionEvent('dog', dog, other, None))
+
+        return events
@@ -5,68 +5,94 @@ Dogs in Space - Zero-G Dog Park
 Harley & Shanti with jetpacks, floating in space!
 """
 
+import atexit
+import json
+import os
 import pygame
 import random
-import sys
 import math
-import os
-import subprocess
-import json
+import numpy as np
+import signal
 from datetime import datetime
 
-os.environ['SDL_VIDEODRIVER'] = 'x11'
-os.environ['SDL_AUDIODRIVER'] = 'dummy'
+import gamelog
+from analytics import EXPORT_TICKS, Heatmaps
+from assignment import TargetAssigner
+from atlas import load_atlas
+from checkpoint import CheckpointStore
+from effects import EffectLayer
+from pools import ASTEROID_SIDES, AsteroidPool, TreatPool
+from precipitation import Precipitation
+from scheduler import Scheduler
+from stats import StatsStore
+from steering import DOG_SOURCE, SteeringField, space_sources
+from scenes import SharedResources, run_scene
+from weather import refresh_weather, weather_cache
 
-pygame.init()
+log = gamelog.get('space')
 
-info = pygame.display.Info()
-SCREEN_WIDTH = info.current_w if info.current_w > 0 else 1920
-SCREEN_HEIGHT = info.current_h if info.current_h > 0 else 1080
+# Real size is set by create_game() once the display is open
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
 FPS = 60
 
-print(f"Space Screen: {SCREEN_WIDTH}x{SCREEN_HEIGHT}", flush=True)
+# Below this slope the dogs just drift (far from any treat)
+STEER_MIN_PULL = 0.0008
 
-# Space weather cache
-space_weather_cache = {'condition': 'sunny', 'temp': 72, 'last_update': 0}
-WEATHER_UPDATE_INTERVAL = 600
+# Dog AI knobs - evolve.py searches these and writes the winners to ai_tuning.json
+AI_TUNING = {
+    'harley_speed': 0.15,      # jetpack thrust per tick
+    'shanti_speed': 0.12,
+    'turn_rate': 0.05,         # fraction of the heading error turned per tick
+    'coast_distance': 100,     # px - stop thrusting this close to the target treat
+    'chase_range': 500,        # px - treats further away aren't assigned
+    'drift_chance': 0.02,      # per tick, a random nudge and spin
+    'damping': 0.98,           # velocity kept per tick (space friction)
+}
+AI_TUNING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai_tuning.json')
 
-def get_tampa_weather():
-    """Fetch weather (now from Space Station Tampa!)"""
-    global space_weather_cache
-    now = pygame.time.get_ticks()
-    
-    if now - space_weather_cache['last_update'] < WEATHER_UPDATE_INTERVAL * 1000:
-        return space_weather_cache
-    
+
+def load_ai_tuning(path=AI_TUNING_PATH):
+    """Evolved dog AI settings from evolve.py, if there are any - True if loaded"""
     try:
-        cmd = [
-            'curl', '-s', '--connect-timeout', '5', '--max-time', '10',
-            'https://api.open-meteo.com/v1/forecast?latitude=27.95&longitude=-82.46&current=weather_code,temperature_2m,is_day&temperature_unit=fahrenheit'
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            current = data.get('current', {})
-            code = current.get('weather_code', 0)
-            space_weather_cache['temp'] = int(current.get('temperature_2m', 72))
-            space_weather_cache['last_update'] = now
-            
-            # Space weather conditions
-            if code in [95, 96, 99]:
-                space_weather_cache['condition'] = 'meteor_storm'
-            elif code in [51, 53, 55, 56, 57, 61, 63, 65, 80, 81, 82]:
-                space_weather_cache['condition'] = 'solar_rain'
-            elif code in [45, 48, 3]:
-                space_weather_cache['condition'] = 'nebula'
-            else:
-                space_weather_cache['condition'] = 'clear_space'
-            
-            print(f"Space weather: {space_weather_cache['condition']}, Earth: {space_weather_cache['temp']}°F", flush=True)
-    except Exception as e:
-        print(f"Space weather error: {e}", flush=True)
-    
-    return space_weather_cache
+        with open(path) as f:
+            tuned = json.load(f)['params']
+        AI_TUNING.update({k: float(v) for k, v in tuned.items() if k in AI_TUNING})
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log.warning("AI tuning not loaded: %s", e, event='ai_tuning_error')
+        return False
+    log.info("AI tuning: %s", ", ".join(f"{k} {v:g}" for k, v in AI_TUNING.items()), event='ai_tuning',
+             params=dict(AI_TUNING))
+    return True
+
+# Baked sprites - set by create_game(), None means draw procedurally
+sprite_atlas = None
+DOG_ROTATIONS = 72
+SNACK_ROTATIONS = 24
+
+# Translucent overlays (beams, glass, atmosphere), rendered once on first use
+effects = EffectLayer()
+
+# Treat type <-> pool/snapshot code, and what each is worth
+TREAT_TYPES = ['satellite', 'cosmic_bone', 'alien_snack']
+TREAT_VALUES = {'satellite': 1, 'cosmic_bone': 3, 'alien_snack': 10}
 
+# Name tags are rendered once per name, not every frame
+_name_tags = {}
+
+def name_tag(text, size, color, bg_color, pad_x, pad_y):
+    """Cached (background, text) surfaces for a floating name tag"""
+    key = (text, size, color, bg_color)
+    if key not in _name_tags:
+        font = pygame.font.SysFont('arial', size, bold=True)
+        surf = font.render(text, True, color)
+        bg = pygame.Surface((surf.get_width() + pad_x, surf.get_height() + pad_y))
+        bg.fill(bg_color)
+        bg.set_alpha(180)
+        _name_tags[key] = (bg, surf)
+    return _name_tags[key]
 
 class SpaceDog:
     """Harley or Shanti in space with jetpack!"""
@@ -80,6 +106,7 @@ class SpaceDog:
         self.anim_frame = 0
         self.anim_timer = 0
         self.has_acorn = False
+        self.target = None  # set by the world's treat assignment
         
         if name == 'harley':
             self.width, self.height = 38, 30
@@ -87,7 +114,6 @@ class SpaceDog:
             self.ear_color = (220, 190, 150)
             self.suit_color = (255, 100, 100)  # Red space suit
             self.secondary = (240, 230, 210)
-            self.speed = 0.15
             self.ear_type = 'floppy'
         else:
             self.width, self.height = 54, 42
@@ -95,42 +121,51 @@ class SpaceDog:
             self.ear_color = (110, 75, 40)
             self.suit_color = (100, 100, 255)  # Blue space suit
             self.secondary = (165, 115, 65)
-            self.speed = 0.12
             self.ear_type = 'perky'
         
         self.trail = []  # Jetpack trail
+        self.apply_tuning()
+    
+    def apply_tuning(self):
+        """Current AI_TUNING - at birth, and again over whatever a checkpoint brought back"""
+        self.speed = AI_TUNING['harley_speed' if self.name == 'harley' else 'shanti_speed']
+        self.turn_rate = AI_TUNING['turn_rate']
+        self.coast_distance = AI_TUNING['coast_distance']
+        self.drift_chance = AI_TUNING['drift_chance']
+        self.damping = AI_TUNING['damping']
     
-    def space_ai_update(self, treats, other_dog):
-        """Zero-G AI - float and use jetpack to navigate"""
-        # Find nearest treat
-        nearest = None
-        nearest_dist = 9999
-        for t in treats:
-            if not t.collected:
-                tdx, tdy = t.x - self.x, t.y - self.y
-                td = math.sqrt(tdx*tdx + tdy*tdy)
-                if td < nearest_dist and td < 500:
-                    nearest_dist, nearest = td, t
-        
-        if nearest:
-            # Point toward treat
-            dx = nearest.x - self.x
-            dy = nearest.y - self.y
+    def space_ai_update(self, field):
+        """Zero-G AI - fly at the assigned treat, or ride the shared steering field if there is none"""
+        thrust = True
+        if self.target and not self.target.collected:
+            # Point toward our treat
+            dx = self.target.x - self.x
+            dy = self.target.y - self.y
             target_angle = math.atan2(dy, dx)
-            
+            # Coast the last stretch
+            thrust = dx * dx + dy * dy > self.coast_distance * self.coast_distance
+        else:
+            # Uphill to treats, away from the other dogs and Bestie
+            gx, gy = field.sample(self.x, self.y, DOG_SOURCE)
+            if gx * gx + gy * gy > STEER_MIN_PULL * STEER_MIN_PULL:
+                target_angle = math.atan2(gy, gx)
+            else:
+                target_angle = None
+        
+        if target_angle is not None:
             # Smooth rotation
             angle_diff = target_angle - self.angle
             while angle_diff > math.pi: angle_diff -= 2*math.pi
             while angle_diff < -math.pi: angle_diff += 2*math.pi
-            self.angle += angle_diff * 0.05
+            self.angle += angle_diff * self.turn_rate
             
-            # Jetpack thrust toward target
-            if nearest_dist > 100:
+            # Jetpack thrust
+            if thrust:
                 self.vx += math.cos(self.angle) * self.speed
                 self.vy += math.sin(self.angle) * self.speed
         
         # Random drifting behavior
-        if random.random() < 0.02:
+        if random.random() < self.drift_chance:
             self.spin = random.uniform(-0.05, 0.05)
             self.vx += random.uniform(-0.5, 0.5)
             self.vy += random.uniform(-0.5, 0.5)
@@ -141,8 +176,8 @@ class SpaceDog:
         if self.y < -50: self.y = SCREEN_HEIGHT + 50
         if self.y > SCREEN_HEIGHT + 50: self.y = -50
     
-    def update(self, treats, other_dog):
-        self.space_ai_update(treats, other_dog)
+    def update(self, field):
+        self.space_ai_update(field)
         
         # Zero-G physics - no gravity!
         self.x += self.vx
@@ -150,11 +185,26 @@ class SpaceDog:
         self.angle += self.spin
         
         # Dampen velocity (space friction)
-        self.vx *= 0.98
-        self.vy *= 0.98
+        self.vx *= self.damping
+        self.vy *= self.damping
         self.spin *= 0.95
         
-        # Jetpack trail
+        self.update_trail()
+        
+        self.anim_timer += 1
+        if self.anim_timer > 8:
+            self.anim_timer = 0
+            self.anim_frame = (self.anim_frame + 1) % 4
+    
+    def collect(self, treat):
+        treat.collect(400)
+        treat.collector = self.name
+        self.score += treat.value
+        # Spin celebration!
+        self.spin = random.uniform(-0.3, 0.3)
+    
+    def update_trail(self):
+        """Jetpack trail - pure eye candy, so the display process keeps it in split mode"""
         if abs(self.vx) > 0.5 or abs(self.vy) > 0.5:
             self.trail.append({
                 'x': self.x, 
@@ -163,27 +213,9 @@ class SpaceDog:
                 'color': self.suit_color
             })
         
-        # Update trail
         for t in self.trail:
             t['life'] -= 1
         self.trail = [t for t in self.trail if t['life'] > 0]
-        
-        self.anim_timer += 1
-        if self.anim_timer > 8:
-            self.anim_timer = 0
-            self.anim_frame = (self.anim_frame + 1) % 4
-        
-        # Collect treats
-        for t in treats:
-            if not t.collected:
-                dx, dy = self.x - t.x, self.y - t.y
-                if math.sqrt(dx*dx + dy*dy) < 50:
-                    t.collected = True
-                    t.respawn_timer = 400
-                    t.collector = self.name
-                    self.score += t.value
-                    # Spin celebration!
-                    self.spin = random.uniform(-0.3, 0.3)
     
     def draw(self, screen):
         # Draw jetpack trail
@@ -195,10 +227,39 @@ class SpaceDog:
         
         # Space dog with rotation
         sx, sy = int(self.x), int(self.y)
+        sprite = 'dog_' + self.name
+        if sprite_atlas:
+            sprite_atlas.blit(screen, sprite, sprite_atlas.angle_frame(sprite, self.angle), sx, sy)
+        else:
+            self.draw_body(screen, sx, sy, self.angle)
         
-        # Calculate rotated points for body
+        # Jetpack flames
         cos_a = math.cos(self.angle)
         sin_a = math.sin(self.angle)
+        flame_x = sx - 25 * cos_a
+        flame_y = sy - 25 * sin_a
+        flame_size = random.randint(8, 16)
+        flame_color = random.choice([(255, 150, 50), (255, 200, 100), (255, 100, 50)])
+        pygame.draw.ellipse(screen, flame_color, 
+                           (int(flame_x - flame_size//2), int(flame_y - flame_size//2), 
+                            flame_size, flame_size + 8))
+        
+        # Name tag above dog
+        try:
+            name_bg, name_surf = name_tag(self.name.upper(), 24, (255, 255, 255), (0, 0, 0), 10, 6)
+            # Position name tag above dog
+            name_x = int(sx) - name_surf.get_width() // 2
+            name_y = int(sy) - 55
+            screen.blit(name_bg, (name_x - 5, name_y - 3))
+            screen.blit(name_surf, (name_x, name_y))
+        except:
+            pass
+    
+    def draw_body(self, screen, sx, sy, angle):
+        """Suit, helmet, face and ears - everything that only depends on the angle"""
+        # Calculate rotated points for body
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
         
         # Space suit body (larger than regular dog)
         suit_points = []
@@ -241,107 +302,79 @@ class SpaceDog:
                                (ear_tip_x, ear_tip_y),
                                (helmet_x - 10*cos_a - 5*sin_a, helmet_y - 10*sin_a + 5*cos_a)])
         
-        # Jetpack flames
-        flame_x = sx - 25 * cos_a
-        flame_y = sy - 25 * sin_a
-        flame_size = random.randint(8, 16)
-        flame_color = random.choice([(255, 150, 50), (255, 200, 100), (255, 100, 50)])
-        pygame.draw.ellipse(screen, flame_color, 
-                           (int(flame_x - flame_size//2), int(flame_y - flame_size//2), 
-                            flame_size, flame_size + 8))
-        
         # Space suit details
         pygame.draw.rect(screen, (100, 100, 100), 
                         (int(sx - 8), int(sy - 8), 16, 16))  # Chest plate
         pygame.draw.circle(screen, (255, 200, 50), (int(sx), int(sy)), 5)  # Mission patch
-        
-        # Name tag above dog
-        name_text = self.name.upper()
-        try:
-            name_font = pygame.font.SysFont('arial', 24, bold=True)
-            name_surf = name_font.render(name_text, True, (255, 255, 255))
-            name_bg = pygame.Surface((name_surf.get_width() + 10, name_surf.get_height() + 6))
-            name_bg.fill((0, 0, 0))
-            name_bg.set_alpha(180)
-            # Position name tag above dog
-            name_x = int(sx) - name_surf.get_width() // 2
-            name_y = int(sy) - 55
-            screen.blit(name_bg, (name_x - 5, name_y - 3))
-            screen.blit(name_surf, (name_x, name_y))
-        except:
-            pass
+
+
+def _pool_field(name, cast=float):
+    """Attribute backed by one slot of the treat pool's arrays"""
+    def get(self):
+        return cast(getattr(self.pool, name)[self.index])
+    def set(self, value):
+        getattr(self.pool, name)[self.index] = value
+    return property(get, set)
 
 
 class SpaceTreat:
-    """Floating space treats!"""
-    def __init__(self, x, y, treat_type='satellite'):
-        self.x, self.y = x, y
-        self.vx = random.uniform(-0.5, 0.5)
-        self.vy = random.uniform(-0.3, 0.3)
-        self.collected = False
-        self.respawn_timer = 0
-        self.type = treat_type
-        self.value = 1
-        self.rotation = 0
-        self.rot_speed = random.uniform(-0.02, 0.02)
-        
-        if treat_type == 'satellite':
-            self.value = 1
-            self.color = (200, 200, 220)
-        elif treat_type == 'cosmic_bone':
-            self.value = 3
-            self.color = (255, 220, 150)
-        elif treat_type == 'alien_snack':
-            self.value = 10
-            self.color = (150, 255, 150)
-        
-        self.bob = random.random() * 6.28
+    """Floating space treats! A view onto one slot of the world's TreatPool"""
+    x = _pool_field('x')
+    y = _pool_field('y')
+    bob = _pool_field('bob')
+    collected = _pool_field('collected', bool)
+    value = _pool_field('value', int)
     
-    def update(self):
-        if self.collected:
-            self.respawn_timer -= 1
-            if self.respawn_timer <= 0:
-                self.collected = False
-                self.x = random.randint(100, SCREEN_WIDTH - 100)
-                self.y = random.randint(100, SCREEN_HEIGHT - 100)
-                self.vx = random.uniform(-0.5, 0.5)
-                self.vy = random.uniform(-0.3, 0.3)
-            return
-        
-        # Float in space
-        self.x += self.vx
-        self.y += self.vy
-        self.rotation += self.rot_speed
-        self.bob += 0.05
-        
-        # Wrap around
-        if self.x < 0: self.x = SCREEN_WIDTH
-        if self.x > SCREEN_WIDTH: self.x = 0
-        if self.y < 0: self.y = SCREEN_HEIGHT
-        if self.y > SCREEN_HEIGHT: self.y = 0
+    def __init__(self, pool, x, y, treat_type='satellite', scheduler=None):
+        self.pool = pool
+        self.index = pool.add(x, y, TREAT_TYPES.index(treat_type), TREAT_VALUES[treat_type])
+        self.scheduler = scheduler
     
-    def draw(self, screen):
-        if self.collected:
-            return
-        
-        y_off = math.sin(self.bob) * 8
-        sx, sy = int(self.x), int(self.y + y_off)
-        
-        if self.type == 'satellite':
+    @property
+    def type(self):
+        return TREAT_TYPES[self.pool.kind[self.index]]
+    
+    def collect(self, respawn_ticks):
+        """Eaten (or stolen) - sleeps in the scheduler until it respawns"""
+        self.collected = True
+        self.scheduler.schedule(respawn_ticks, self.respawn, name=f"{self.type} respawn")
+    
+    def respawn(self):
+        self.pool.respawn(self.index)
+    
+    @staticmethod
+    def draw_all(screen, pool):
+        """Every uneaten treat on this screen, bobbing"""
+        w, h = screen.get_size()
+        idx = pool.visible(0, 0, w, h)
+        xs = pool.x[idx].astype(int).tolist()
+        ys = (pool.y[idx] + np.sin(pool.bob[idx]) * 8).astype(int).tolist()
+        kinds = pool.kind[idx].tolist()
+        if sprite_atlas:
+            sprite_atlas.blits(screen, [('treat_' + TREAT_TYPES[k], 0, sx, sy) for k, sx, sy in zip(kinds, xs, ys)])
+        else:
+            for k, sx, sy in zip(kinds, xs, ys):
+                SpaceTreat.draw_sprite(screen, TREAT_TYPES[k], sx, sy)
+    
+    @staticmethod
+    def draw_sprite(screen, treat_type, sx, sy):
+        if treat_type == 'satellite':
+            color = (200, 200, 220)
             # Satellite dish
-            pygame.draw.circle(screen, self.color, (sx, sy), 12)
+            pygame.draw.circle(screen, color, (sx, sy), 12)
             pygame.draw.circle(screen, (100, 100, 120), (sx, sy), 8)
             pygame.draw.line(screen, (150, 150, 170), (sx, sy), (sx, sy + 20), 3)
             # Solar panels
             pygame.draw.rect(screen, (80, 80, 150), (sx - 20, sy + 18, 40, 8))
         
-        elif self.type == 'cosmic_bone':
+        elif treat_type == 'cosmic_bone':
+            color = (255, 220, 150)
             # Glowing bone
-            pygame.draw.ellipse(screen, self.color, (sx - 12, sy - 4, 24, 10))
-            pygame.draw.circle(screen, self.color, (sx - 10, sy - 3), 5)
-            pygame.draw.circle(screen, self.color, (sx + 10, sy - 3), 5)
-            pygame.draw.circle(screen, self.color, (sx - 10, sy + 3), 5)
-            pygame.draw.circle(screen, self.color, (sx + 10, sy + 3), 5)
+            pygame.draw.ellipse(screen, color, (sx - 12, sy - 4, 24, 10))
+            pygame.draw.circle(screen, color, (sx - 10, sy - 3), 5)
+            pygame.draw.circle(screen, color, (sx + 10, sy - 3), 5)
+            pygame.draw.circle(screen, color, (sx - 10, sy + 3), 5)
+            pygame.draw.circle(screen, color, (sx + 10, sy + 3), 5)
             # Glow
             pygame.draw.circle(screen, (255, 255, 200, 128), (sx, sy - 15), 6)
         
@@ -353,57 +386,16 @@ class SpaceTreat:
             pygame.draw.circle(screen, (100, 255, 100), (sx + 8, sy + 8), 3)
 
 
-class Asteroid:
-    """Floating space rocks"""
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(-100, SCREEN_HEIGHT // 2)
-        self.size = random.randint(30, 80)
-        self.vx = random.uniform(-0.3, 0.3)
-        self.vy = random.uniform(0.1, 0.5)
-        self.rotation = random.random() * 6.28
-        self.rot_speed = random.uniform(-0.01, 0.01)
-        self.color = (120, 110, 100)
-        self.points = []
-        # Generate irregular asteroid shape
-        for i in range(8):
-            angle = i * math.pi / 4
-            r = self.size * random.uniform(0.7, 1.3)
-            self.points.append((math.cos(angle) * r, math.sin(angle) * r))
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.rotation += self.rot_speed
-        
-        if self.y > SCREEN_HEIGHT + 100:
-            self.y = -100
-            self.x = random.randint(0, SCREEN_WIDTH)
-    
-    def draw(self, screen):
-        # Rotate points
-        cos_r = math.cos(self.rotation)
-        sin_r = math.sin(self.rotation)
-        rotated_points = []
-        for px, py in self.points:
-            rx = px * cos_r - py * sin_r + self.x
-            ry = px * sin_r + py * cos_r + self.y
-            rotated_points.append((rx, ry))
-        
-        pygame.draw.polygon(screen, self.color, rotated_points)
-        pygame.draw.polygon(screen, (80, 70, 60), rotated_points, 2)
-        # Craters
-        pygame.draw.circle(screen, (90, 80, 70), (int(self.x - 5), int(self.y - 5)), 8)
-
-
 class UFO:
     """Flying saucer - drops space snacks!"""
-    def __init__(self):
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
         self.reset()
     
     def reset(self):
         self.active = False
         self.spawn_timer = random.randint(1200, 2400)  # 20-40 seconds
+        self.scheduler.schedule(self.spawn_timer, self.spawn, name='ufo spawn')
         self.x = -100
         self.y = random.randint(50, 200)
         self.vx = random.uniform(2, 4)
@@ -422,9 +414,6 @@ class UFO:
     
     def update(self):
         if not self.active:
-            self.spawn_timer -= 1
-            if self.spawn_timer <= 0:
-                self.spawn()
             return None
         
         self.x += self.vx
@@ -450,46 +439,67 @@ class UFO:
         
         sx, sy = int(self.x), int(self.y)
         
+        if sprite_atlas:
+            sprite_atlas.blit(screen, 'ufo', 0, sx, sy)
+        else:
+            UFO.draw_saucer(screen, sx, sy)
+        
+        # Glass dome
+        effects.draw(screen, effects.ellipse('ufo_dome', (100, 200, 255, 150), (-15, -25, 30, 20)), sx, sy)
+        
+        # Tractor beam, pulsing
+        if self.beam_active:
+            beam = effects.polygon('ufo_beam', (200, 255, 200, 255),
+                                   ((-20, 10), (20, 10), (40, 80), (-40, 80)))
+            effects.draw(screen, beam, sx, sy, int(128 + 127 * math.sin(pygame.time.get_ticks() * 0.01)))
+    
+    @staticmethod
+    def draw_saucer(screen, sx, sy):
         # UFO body (saucer)
         pygame.draw.ellipse(screen, (200, 200, 220), (sx - 35, sy - 10, 70, 25))
         pygame.draw.ellipse(screen, (150, 150, 170), (sx - 20, sy - 20, 40, 20))
         
-        # Dome
-        pygame.draw.ellipse(screen, (100, 200, 255, 150), (sx - 15, sy - 25, 30, 20))
+        # (the glass dome is an effect overlay - see UFO.draw)
         
         # Lights
         for i in range(5):
             lx = sx - 30 + i * 15
             color = (255, 100, 100) if i % 2 == 0 else (100, 255, 100)
             pygame.draw.circle(screen, color, (lx, sy), 4)
-        
-        # Tractor beam
-        if self.beam_active:
-            beam_alpha = int(128 + 127 * math.sin(pygame.time.get_ticks() * 0.01))
-            pygame.draw.polygon(screen, (200, 255, 200, beam_alpha), [
-                (sx - 20, sy + 10),
-                (sx + 20, sy + 10),
-                (sx + 40, sy + 80),
-                (sx - 40, sy + 80)
-            ])
 
 
 class SpaceSnack:
     """Alien snack dropped by UFO"""
-    def __init__(self, x, y):
+    def __init__(self, x, y, scheduler=None):
         self.x, self.y = x, y
         self.vx = random.uniform(-1, 1)
         self.vy = 2
         self.active = True
-        self.lifetime = 500
         self.rotation = 0
+        # Snapshot mirrors have no scheduler and just carry the number
+        self.expiry = scheduler.schedule(500, self.expire, name='snack expires') if scheduler else None
+        self.scheduler = scheduler
+        self._lifetime = 500
+    
+    @property
+    def lifetime(self):
+        """Ticks left before the snack fizzles out"""
+        if self.expiry:
+            return self.expiry.due - self.scheduler.now
+        return self._lifetime
+    
+    @lifetime.setter
+    def lifetime(self, value):
+        self._lifetime = value
+    
+    def expire(self):
+        self.active = False
     
     def update(self):
         self.x += self.vx
         self.y += self.vy
         self.rotation += 0.05
-        self.lifetime -= 1
-        if self.lifetime <= 0 or self.y > SCREEN_HEIGHT:
+        if self.y > SCREEN_HEIGHT:
             self.active = False
     
     def draw(self, screen):
@@ -498,13 +508,23 @@ class SpaceSnack:
         
         sx, sy = int(self.x), int(self.y)
         
-        # Spinning alien snack
-        cos_r = math.cos(self.rotation)
-        sin_r = math.sin(self.rotation)
+        # Spinning alien snack - three-fold symmetric, so a third of a turn covers it
+        if sprite_atlas:
+            turn = 2 * math.pi / 3
+            frame = int(round((self.rotation % turn) / turn * SNACK_ROTATIONS)) % SNACK_ROTATIONS
+            sprite_atlas.blit(screen, 'space_snack', frame, sx, sy)
+        else:
+            SpaceSnack.draw_star(screen, sx, sy, self.rotation)
         
+        # Value indicator
+        if self.lifetime > 100:
+            pygame.draw.circle(screen, (255, 255, 100), (sx, sy - 25), 5)
+    
+    @staticmethod
+    def draw_star(screen, sx, sy, rotation):
         points = []
         for i in range(6):
-            angle = i * math.pi / 3 + self.rotation
+            angle = i * math.pi / 3 + rotation
             r = 15 if i % 2 == 0 else 8
             px = sx + math.cos(angle) * r
             py = sy + math.sin(angle) * r
@@ -512,21 +532,19 @@ class SpaceSnack:
         
         pygame.draw.polygon(screen, (255, 100, 200), points)
         pygame.draw.polygon(screen, (200, 50, 150), points, 2)
-        
-        # Value indicator
-        if self.lifetime > 100:
-            pygame.draw.circle(screen, (255, 255, 100), (sx, sy - 25), 5)
 
 
 class SpaceSquirrel:
     """Nutter the Squirrel in a space pod - faster than dogs!"""
-    def __init__(self):
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
         self.reset()
         self.name = "Nutter"
     
     def reset(self):
         self.active = False
         self.spawn_timer = random.randint(1200, 2400)  # 20-40 seconds
+        self.scheduler.schedule(self.spawn_timer, self.spawn, name='squirrel spawn')
         self.x = -60
         self.y = random.randint(100, SCREEN_HEIGHT - 200)
         self.vx = random.uniform(4, 6)
@@ -550,9 +568,6 @@ class SpaceSquirrel:
     
     def update(self, dogs):
         if not self.active:
-            self.spawn_timer -= 1
-            if self.spawn_timer <= 0:
-                self.spawn()
             return None
         
         # Space pod movement
@@ -584,13 +599,33 @@ class SpaceSquirrel:
         
         sx, sy = int(self.x), int(self.y)
         
+        if sprite_atlas:
+            frame = (0 if self.has_acorn else 2) + (0 if self.direction == 1 else 1)
+            sprite_atlas.blit(screen, 'squirrel_pod', frame, sx, sy)
+        else:
+            SpaceSquirrel.draw_pod(screen, sx, sy, self.has_acorn, self.direction)
+        
+        # Glass dome - now in front of the squirrel, so thinner than the old 180
+        effects.draw(screen, effects.ellipse('pod_glass', (200, 230, 255, 90), (-20, -20, 40, 35)), sx, sy)
+        
+        # Name tag above pod
+        try:
+            name_bg, name_surf = name_tag(self.name, 20, (255, 220, 150), (60, 40, 20), 8, 4)
+            name_x = sx - name_surf.get_width() // 2
+            name_y = sy - 45
+            screen.blit(name_bg, (name_x - 4, name_y - 2))
+            screen.blit(name_surf, (name_x, name_y))
+        except:
+            pass
+    
+    @staticmethod
+    def draw_pod(screen, sx, sy, has_acorn, direction):
         # Space pod (glass bubble with squirrel inside)
         # Pod body
         pygame.draw.ellipse(screen, (150, 150, 170), (sx - 25, sy - 15, 50, 30))
         pygame.draw.ellipse(screen, (100, 100, 120), (sx - 25, sy - 15, 50, 30), 2)
         
-        # Glass dome
-        pygame.draw.ellipse(screen, (200, 230, 255, 180), (sx - 20, sy - 20, 40, 35))
+        # Glass dome rim (the glass itself is an effect overlay - see SpaceSquirrel.draw)
         pygame.draw.ellipse(screen, (150, 200, 255), (sx - 20, sy - 20, 40, 35), 2)
         
         # Squirrel inside
@@ -605,40 +640,28 @@ class SpaceSquirrel:
         pygame.draw.ellipse(screen, (200, 140, 80), (sx - 18, sy - 15, 15, 25))
         
         # Acorn in pod (if still has it)
-        if self.has_acorn:
+        if has_acorn:
             acorn_x = sx + 15
             pygame.draw.ellipse(screen, (160, 120, 80), (acorn_x - 4, sy - 3, 8, 10))
             pygame.draw.arc(screen, (100, 80, 60), (acorn_x - 5, sy - 6, 10, 6), 0, 3.14, 2)
         
         # Pod thrusters (small flames)
-        flame_dir = -1 if self.direction == 1 else 1
+        flame_dir = -1 if direction == 1 else 1
         flame_x = sx + 25 * flame_dir
         pygame.draw.ellipse(screen, (255, 150, 50), 
                            (flame_x - 3, sy - 4, 8, 8))
-        
-        # Name tag above pod
-        try:
-            name_font = pygame.font.SysFont('arial', 20, bold=True)
-            name_surf = name_font.render(self.name, True, (255, 220, 150))
-            name_bg = pygame.Surface((name_surf.get_width() + 8, name_surf.get_height() + 4))
-            name_bg.fill((60, 40, 20))
-            name_bg.set_alpha(180)
-            name_x = sx - name_surf.get_width() // 2
-            name_y = sy - 45
-            screen.blit(name_bg, (name_x - 4, name_y - 2))
-            screen.blit(name_surf, (name_x, name_y))
-        except:
-            pass
 
 
 class Bestie:
     """Bestie - The antagonist in a spaceship stealing treats!"""
-    def __init__(self):
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
         self.reset()
     
     def reset(self):
         self.active = False
         self.spawn_timer = random.randint(1800, 3000)  # 30-50 seconds
+        self.scheduler.schedule(self.spawn_timer, self.spawn, name='bestie spawn')
         self.x = SCREEN_WIDTH + 100
         self.y = random.randint(80, SCREEN_HEIGHT // 2)
         self.vx = -2.5  # Moves left
@@ -655,14 +678,16 @@ class Bestie:
         self.steal_cooldown = 0
     
     def update(self, treats, dogs):
+        """Returns the treat she stole this tick, if any"""
         if not self.active:
-            self.spawn_timer -= 1
-            if self.spawn_timer <= 0:
-                self.spawn()
-            return
+            return None
+        stolen = None
         
-        # Move across screen
+        # Move across screen, drifting up or down toward the treat she has her eye on
         self.x += self.vx
+        target = self.target_treat
+        if target and not target.collected:
+            self.y += max(-1.5, min(1.5, (target.y - self.y) * 0.02))
         
         # Find nearest uncollected treat to steal
         if self.steal_cooldown <= 0:
@@ -678,8 +703,8 @@ class Bestie:
             
             if nearest and nearest_dist < 80:
                 # STEAL THE TREAT!
-                nearest.collected = True
-                nearest.respawn_timer = 600  # Longer respawn
+                stolen = nearest
+                nearest.collect(600)  # Longer respawn
                 self.stolen_treats += 1
                 self.steal_cooldown = 120  # 2 seconds before next steal
                 
@@ -699,6 +724,8 @@ class Bestie:
         # Off screen check
         if self.x < -150:
             self.reset()
+        
+        return stolen
     
     def draw(self, screen):
         if not self.active:
@@ -706,6 +733,21 @@ class Bestie:
         
         sx, sy = int(self.x), int(self.y)
         
+        if sprite_atlas:
+            sprite_atlas.blit(screen, 'bestie_ship', 0, sx, sy)
+        else:
+            Bestie.draw_ship(screen, sx, sy)
+        
+        # "I WANT TO SPEAK TO THE MANAGER" energy beam (when stealing)
+        if self.steal_cooldown > 100:
+            beam = effects.polygon('bestie_beam', (255, 150, 150, 100),
+                                   ((-10, 15), (10, 15), (30, 70), (-30, 70)))
+            effects.draw(screen, beam, sx, sy)
+            # Angry text effect
+            pygame.draw.circle(screen, (255, 50, 50), (sx, sy + 40), 5)
+    
+    @staticmethod
+    def draw_ship(screen, sx, sy):
         # Beastie's ship (stereotypical "Karen" cruiser - entitled looking)
         # Main hull
         pygame.draw.ellipse(screen, (220, 220, 240), (sx - 40, sy - 20, 80, 40))
@@ -749,18 +791,6 @@ class Bestie:
         
         # Engine glow
         pygame.draw.ellipse(screen, (255, 100, 100), (sx - 45, sy - 8, 15, 16))
-        
-        # "I WANT TO SPEAK TO THE MANAGER" energy beam (when stealing)
-        if self.steal_cooldown > 100:
-            beam_y = sy + 30
-            pygame.draw.polygon(screen, (255, 150, 150, 100), [
-                (sx - 10, sy + 15),
-                (sx + 10, sy + 15),
-                (sx + 30, beam_y + 40),
-                (sx - 30, beam_y + 40)
-            ])
-            # Angry text effect
-            pygame.draw.circle(screen, (255, 50, 50), (sx, sy + 40), 5)
 
 
 class StarField:
@@ -815,16 +845,16 @@ class Earth:
         self.y = SCREEN_HEIGHT - 150
         self.radius = 120
         self.rotation = 0
+        self.atmosphere = [((100, 150, 255, 100 - i*30), self.radius + 5 + i*3, 2) for i in range(3)]
     
     def draw(self, screen):
-        # Planet
-        pygame.draw.circle(screen, (50, 100, 200), (self.x, self.y), self.radius)
-        pygame.draw.circle(screen, (40, 150, 80), (self.x - 20, self.y - 10), self.radius - 10)
+        if sprite_atlas:
+            sprite_atlas.blit(screen, 'earth', 0, self.x, self.y)
+        else:
+            Earth.draw_planet(screen, self.x, self.y, self.radius)
         
         # Atmosphere glow
-        for i in range(3):
-            pygame.draw.circle(screen, (100, 150, 255, 100 - i*30), 
-                             (self.x, self.y), self.radius + 5 + i*3, 2)
+        effects.draw(screen, effects.rings('earth_atmosphere', self.atmosphere), self.x, self.y)
         
         # Clouds
         cloud_offset = pygame.time.get_ticks() * 0.0001
@@ -832,6 +862,12 @@ class Earth:
             cx = self.x - 50 + i * 30 + int(cloud_offset * 20) % 60
             cy = self.y - 40 + i * 15
             pygame.draw.ellipse(screen, (200, 220, 255), (cx - 20, cy - 8, 40, 16))
+    
+    @staticmethod
+    def draw_planet(screen, x, y, radius):
+        # Planet
+        pygame.draw.circle(screen, (50, 100, 200), (x, y), radius)
+        pygame.draw.circle(screen, (40, 150, 80), (x - 20, y - 10), radius - 10)
 
 
 class SpaceStationDoghouse:
@@ -841,8 +877,13 @@ class SpaceStationDoghouse:
         self.y = 150
     
     def draw(self, screen):
-        x, y = self.x, self.y
-        
+        if sprite_atlas:
+            sprite_atlas.blit(screen, 'station', 0, self.x, self.y)
+        else:
+            SpaceStationDoghouse.draw_station(screen, self.x, self.y)
+    
+    @staticmethod
+    def draw_station(screen, x, y):
         # Main station body (doghouse shape)
         pygame.draw.rect(screen, (180, 180, 200), (x - 60, y - 40, 120, 80))
         pygame.draw.polygon(screen, (150, 150, 170), [
@@ -872,40 +913,53 @@ class SpaceStationDoghouse:
             pass
 
 
-class SpaceGame:
-    def __init__(self):
-        print("Initializing TREAT QUEST: SPACE EDITION...", flush=True)
-        
-        modes = [
-            (pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE, "Fullscreen HW"),
-            (pygame.FULLSCREEN | pygame.DOUBLEBUF, "Fullscreen DB"),
-            (pygame.FULLSCREEN, "Fullscreen"),
-            (0, "Windowed")
-        ]
-        
-        self.screen = None
-        for flags, name in modes:
-            try:
-                self.screen = pygame.display.set_mode((0, 0), flags)
-                print(f"Display mode: {name}", flush=True)
-                break
-            except Exception as e:
-                print(f"{name} failed: {e}", flush=True)
-        
-        if self.screen is None:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        
-        pygame.display.set_caption("🚀 TREAT QUEST: SPACE EDITION 🐕‍🦺")
-        self.clock = pygame.time.Clock()
-        
-        try:
-            self.font = pygame.font.Font(None, 80)
-            self.font_med = pygame.font.Font(None, 56)
-            self.font_small = pygame.font.Font(None, 40)
-        except:
-            self.font = pygame.font.SysFont('arial', 60)
-            self.font_med = pygame.font.SysFont('arial', 40)
-            self.font_small = pygame.font.SysFont('arial', 30)
+def sprite_recipes():
+    """Every baked sprite: name -> (w, h, anchor_x, anchor_y, frames, draw)"""
+    harley = SpaceDog('harley', 0, 0)
+    shanti = SpaceDog('shanti', 0, 0)
+    dog_step = 2 * math.pi / DOG_ROTATIONS
+    snack_step = 2 * math.pi / 3 / SNACK_ROTATIONS
+    return {
+        'dog_harley': (120, 120, 60, 60, DOG_ROTATIONS,
+                       lambda s, x, y, f: harley.draw_body(s, x, y, f * dog_step)),
+        'dog_shanti': (120, 120, 60, 60, DOG_ROTATIONS,
+                       lambda s, x, y, f: shanti.draw_body(s, x, y, f * dog_step)),
+        'treat_satellite': (64, 64, 32, 32, 1,
+                            lambda s, x, y, f: SpaceTreat.draw_sprite(s, 'satellite', x, y)),
+        'treat_cosmic_bone': (64, 64, 32, 32, 1,
+                              lambda s, x, y, f: SpaceTreat.draw_sprite(s, 'cosmic_bone', x, y)),
+        'treat_alien_snack': (64, 64, 32, 32, 1,
+                              lambda s, x, y, f: SpaceTreat.draw_sprite(s, 'alien_snack', x, y)),
+        'space_snack': (40, 40, 20, 20, SNACK_ROTATIONS,
+                        lambda s, x, y, f: SpaceSnack.draw_star(s, x, y, f * snack_step)),
+        'ufo': (80, 80, 40, 40, 1, lambda s, x, y, f: UFO.draw_saucer(s, x, y)),
+        # Frames: acorn + right, acorn + left, empty + right, empty + left
+        'squirrel_pod': (72, 72, 36, 36, 4,
+                         lambda s, x, y, f: SpaceSquirrel.draw_pod(s, x, y, f < 2, 1 if f % 2 == 0 else -1)),
+        'bestie_ship': (104, 80, 52, 40, 1, lambda s, x, y, f: Bestie.draw_ship(s, x, y)),
+        'station': (248, 152, 124, 96, 1, lambda s, x, y, f: SpaceStationDoghouse.draw_station(s, x, y)),
+        'earth': (272, 272, 136, 136, 1, lambda s, x, y, f: Earth.draw_planet(s, x, y, 120)),
+    }
+
+
+# The cosmic acorn bobs on the sim clock, so hit tests and drawing agree
+ACORN_BOB = 0.01 * 1000 / FPS
+
+
+def scalar_attrs(obj):
+    """An object's plain-value attributes (numbers, strings, flags) - what a checkpoint keeps"""
+    return {k: v for k, v in vars(obj).items() if v is None or isinstance(v, (bool, int, float, str))}
+
+
+class SpaceWorld:
+    """Everything that moves by itself - dogs, treats, asteroids and visitors; no drawing"""
+    def __init__(self, scale=1, asteroids=6):
+        # scale > 1: a world several screens wide, with treats and rocks to match
+        self.width, self.height = SCREEN_WIDTH, SCREEN_HEIGHT
+        self.scale = scale
+        self.ticks = 0
+        # Spawns, respawns and lifetimes wait here instead of counting down every frame
+        self.scheduler = Scheduler()
         
         # Space dogs!
         self.dogs = [
@@ -913,65 +967,146 @@ class SpaceGame:
             SpaceDog('shanti', 2 * SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2)
         ]
         
-        # Space treats
+        # Space treats - positions and drift live in the pool, SpaceTreat is a handle
+        self.treat_pool = TreatPool(SCREEN_WIDTH, SCREEN_HEIGHT, 10 * scale)
         self.treats = []
-        for _ in range(5):
-            self.treats.append(SpaceTreat(random.randint(200, SCREEN_WIDTH - 200),
-                                         random.randint(200, SCREEN_HEIGHT - 200), 'satellite'))
-        for _ in range(3):
-            self.treats.append(SpaceTreat(random.randint(200, SCREEN_WIDTH - 200),
-                                         random.randint(200, SCREEN_HEIGHT - 200), 'cosmic_bone'))
-        for _ in range(2):
-            self.treats.append(SpaceTreat(random.randint(200, SCREEN_WIDTH - 200),
-                                         random.randint(200, SCREEN_HEIGHT - 200), 'alien_snack'))
-        
-        # Space environment
-        self.starfield = StarField(300)
-        self.asteroids = [Asteroid() for _ in range(6)]
-        self.earth = Earth()
-        self.space_station = SpaceStationDoghouse()
-        self.ufo = UFO()
+        for _ in range(5 * scale):
+            self.treats.append(SpaceTreat(self.treat_pool, random.randint(200, SCREEN_WIDTH - 200),
+                                         random.randint(200, SCREEN_HEIGHT - 200), 'satellite', self.scheduler))
+        for _ in range(3 * scale):
+            self.treats.append(SpaceTreat(self.treat_pool, random.randint(200, SCREEN_WIDTH - 200),
+                                         random.randint(200, SCREEN_HEIGHT - 200), 'cosmic_bone', self.scheduler))
+        for _ in range(2 * scale):
+            self.treats.append(SpaceTreat(self.treat_pool, random.randint(200, SCREEN_WIDTH - 200),
+                                         random.randint(200, SCREEN_HEIGHT - 200), 'alien_snack', self.scheduler))
+        
+        self.asteroid_pool = AsteroidPool(SCREEN_WIDTH, SCREEN_HEIGHT, asteroids * scale)
+        self.ufo = UFO(self.scheduler)
         self.space_snack = None
         
         # Space Squirrel in pod!
-        self.space_squirrel = SpaceSquirrel()
+        self.space_squirrel = SpaceSquirrel(self.scheduler)
         self.cosmic_acorn = None
         
         # BESTIE - The antagonist!
-        self.bestie = Bestie()
-        
-        get_tampa_weather()
+        self.bestie = Bestie(self.scheduler)
         
-        print("Space game initialized! 🚀", flush=True)
-    
-    def draw(self):
-        # Deep space background
-        self.screen.fill((10, 15, 35))
+        self.chase_range = AI_TUNING['chase_range']
         
-        # Starfield and nebula
-        self.starfield.draw(self.screen)
+        # One field for every dog, rebuilt only when treats, dogs or Bestie move a cell
+        self.steering = SteeringField(SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Lifetime stats event log - set by the game, None records nothing
+        self.stats = None
         
-        # Earth in background
-        self.earth.draw(self.screen)
+        # Saved every few seconds once use_checkpoints() is called
+        self.checkpoints = None
+        self.checkpoint_every = 0
         
-        # Asteroids (background)
-        for asteroid in self.asteroids:
-            asteroid.update()
-            asteroid.draw(self.screen)
+        # Who goes for which treat - re-solved only when a treat is taken or comes back
+        self.assigner = TargetAssigner()
+    
+    def attach(self):
+        # Run once in the sim process - module globals there start at the defaults
+        global SCREEN_WIDTH, SCREEN_HEIGHT
+        SCREEN_WIDTH, SCREEN_HEIGHT = self.width, self.height
+        self.watch_signal()
+    
+    def watch_signal(self):
+        """kill -USR1 <pid> logs everything the world is waiting on"""
+        try:
+            signal.signal(signal.SIGUSR1, lambda signum, frame: log.info("%s", self.scheduler.dump(FPS), event='schedule_dump'))
+        except (AttributeError, ValueError):
+            pass  # no SIGUSR1 here, or not the main thread
+    
+    def resync_schedule(self):
+        """Rebuild the timers for state that came from a snapshot rather than our own steps"""
+        self.scheduler = Scheduler(self.ticks)
+        for actor in (self.ufo, self.space_squirrel, self.bestie):
+            actor.scheduler = self.scheduler
+            if not actor.active:
+                actor.reset()
+        for treat in self.treats:
+            treat.scheduler = self.scheduler
+            if treat.collected:
+                treat.collect(400)
+        if self.space_snack:
+            snack = self.space_snack
+            snack.scheduler = self.scheduler
+            snack.expiry = self.scheduler.schedule(snack.lifetime, snack.expire, name='snack expires')
+        if self.cosmic_acorn:
+            self.drop_acorn(self.cosmic_acorn['x'], self.cosmic_acorn['y'], self.cosmic_acorn['expires'] - self.ticks)
+    
+    def drop_acorn(self, x, y, lifetime=400):
+        acorn = {'x': x, 'y': y, 'active': True, 'expires': self.ticks + lifetime}
+        acorn['expiry'] = self.scheduler.schedule(lifetime, self.expire_acorn, acorn, name='acorn expires')
+        self.cosmic_acorn = acorn
+    
+    def expire_acorn(self, acorn):
+        if self.cosmic_acorn is acorn:
+            self.cosmic_acorn = None
+    
+    def assign_targets(self):
+        chasers = self.dogs + ([self.bestie] if self.bestie.active else [])
+        available = np.flatnonzero(~self.treat_pool.collected[:self.treat_pool.count]).tolist()
+        targets = self.assigner.update(chasers, self.treats, available, self.chase_cost)
+        for chaser, treat in zip(chasers, targets):
+            if chaser is self.bestie:
+                chaser.target_treat = treat
+            else:
+                chaser.target = treat
+    
+    def collect_treats(self):
+        """Every dog against every uneaten treat in one distance matrix, 50px to eat"""
+        pool, n = self.treat_pool, self.treat_pool.count
+        offset = pool.state[:n, None, :2] - np.array([(dog.x, dog.y) for dog in self.dogs])
+        hits = ((offset * offset).sum(axis=2) < 50 * 50) & ~pool.collected[:n, None]
+        if hits.any():
+            # Dogs in order, same as before - the first to reach a treat gets it
+            for d, i in zip(*np.nonzero(hits.T)):
+                treat = self.treats[i]
+                if not treat.collected:
+                    self.dogs[d].collect(treat)
+                    self.record('treat', self.dogs[d].name, treat.type, treat.value)
+    
+    def chase_cost(self, chaser, treat):
+        """Distance, if it's worth going for - None rules the pair out"""
+        dx, dy = treat.x - chaser.x, treat.y - chaser.y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if chaser is self.bestie:
+            # She only swoops on treats ahead of her (she flies left)
+            return dist if dist < 400 and dx < 40 else None
+        return dist if dist < self.chase_range else None
+    
+    def acorn_bob(self):
+        return math.sin(self.ticks * ACORN_BOB) * 8
+    
+    def record(self, kind, who, what='', points=0):
+        if self.stats:
+            self.stats.record(kind, who, what, points)
+    
+    def step(self):
+        self.ticks += 1
+        if self.stats:
+            actors = (('ufo', self.ufo), ('squirrel', self.space_squirrel), ('bestie', self.bestie))
+            waiting = [(name, actor) for name, actor in actors if not actor.active]
+            self.scheduler.advance()
+            for name, actor in waiting:
+                if actor.active:
+                    self.record('spawn', name)
+        else:
+            self.scheduler.advance()
         
-        # Space station
-        self.space_station.draw(self.screen)
+        # Asteroids
+        self.asteroid_pool.update()
         
         # UFO
         dropped_snack = self.ufo.update()
         if dropped_snack and self.space_snack is None:
-            self.space_snack = SpaceSnack(dropped_snack['x'], dropped_snack['y'])
-        self.ufo.draw(self.screen)
+            self.space_snack = SpaceSnack(dropped_snack['x'], dropped_snack['y'], self.scheduler)
         
         # Space snack from UFO
         if self.space_snack:
             self.space_snack.update()
-            self.space_snack.draw(self.screen)
             if not self.space_snack.active:
                 self.space_snack = None
             else:
@@ -981,6 +1116,8 @@ class SpaceGame:
                     dy = self.space_snack.y - dog.y
                     if math.sqrt(dx*dx + dy*dy) < 50:
                         dog.score += 15  # Big UFO snack bonus!
+                        self.record('snack', dog.name, 'alien_snack', 15)
+                        self.space_snack.expiry.cancel()
                         self.space_snack = None
                         dog.spin = 0.5  # Victory spin!
                         break
@@ -988,19 +1125,12 @@ class SpaceGame:
         # Space Squirrel!
         dropped_acorn = self.space_squirrel.update(self.dogs)
         if dropped_acorn and self.cosmic_acorn is None:
-            self.cosmic_acorn = {'x': dropped_acorn['x'], 'y': dropped_acorn['y'], 
-                                'active': True, 'lifetime': 400}
-        self.space_squirrel.draw(self.screen)
+            self.drop_acorn(dropped_acorn['x'], dropped_acorn['y'])
         
         # Cosmic acorn from squirrel
         if self.cosmic_acorn:
-            self.cosmic_acorn['lifetime'] -= 1
             ca = self.cosmic_acorn
-            # Draw floating acorn
-            y_off = math.sin(pygame.time.get_ticks() * 0.01) * 8
-            pygame.draw.ellipse(self.screen, (200, 170, 100), 
-                               (int(ca['x'] - 10), int(ca['y'] + y_off - 6), 20, 12))
-            pygame.draw.circle(self.screen, (255, 200, 50), (int(ca['x']), int(ca['y'] + y_off - 15)), 5)
+            y_off = self.acorn_bob()
             
             # Check dog collection
             for dog in self.dogs:
@@ -1008,27 +1138,431 @@ class SpaceGame:
                 dy = ca['y'] + y_off - dog.y
                 if math.sqrt(dx*dx + dy*dy) < 50:
                     dog.score += 8  # Cosmic acorn bonus!
+                    self.record('acorn', dog.name, 'cosmic_acorn', 8)
+                    ca['expiry'].cancel()
                     self.cosmic_acorn = None
                     dog.spin = 0.3
                     break
-            
-            if self.cosmic_acorn and ca['lifetime'] <= 0:
-                self.cosmic_acorn = None
+        
+        # Everyone picks a different treat
+        self.assign_targets()
         
         # BEASTIE - The treat thief!
-        self.bestie.update(self.treats, self.dogs)
-        self.bestie.draw(self.screen)
+        stolen = self.bestie.update(self.treats, self.dogs)
+        if stolen:
+            self.record('theft', 'bestie', stolen.type, stolen.value)
         
-        # Treats
-        for treat in self.treats:
-            treat.update()
-            treat.draw(self.screen)
+        # Treats (collected ones are asleep in the scheduler)
+        self.treat_pool.update()
         
         # Space dogs
+        self.steering.update(space_sources(self.treat_pool, self.dogs, self.bestie))
         for dog in self.dogs:
-            dog.update(self.treats, self.dogs[1 - self.dogs.index(dog)])
+            dog.update(self.steering)
+        self.collect_treats()
+        
+        if self.checkpoints and self.ticks % self.checkpoint_every == 0:
+            self.checkpoints.submit(self.checkpoint())
+    
+    def use_checkpoints(self, store, seconds):
+        """Carry on from the store's latest checkpoint if it fits this world, then save every few seconds"""
+        self.checkpoints = store
+        self.checkpoint_every = max(1, int(seconds * FPS))
+        sections = store.load()
+        if sections is None:
+            return False
+        started = datetime.now()
+        try:
+            restored = self.restore(sections)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            # Whatever did load stays; the timers are rebuilt to match it
+            log.warning("Checkpoint only partly restored: %s", e, event='checkpoint_partial')
+            self.resync_schedule()
+            return False
+        if restored:
+            ms = (datetime.now() - started).total_seconds() * 1000
+            log.info("Resumed from checkpoint at tick %d in %.1fms - %s", self.ticks, ms,
+                     ", ".join(f"{d.name} {d.score}" for d in self.dogs), event='checkpoint_resumed',
+                     tick=self.ticks, ms=round(ms, 2))
+        return restored
+    
+    def checkpoint(self):
+        """Everything needed to carry on from this tick, as sections for checkpoint.py"""
+        tp, n = self.treat_pool, self.treat_pool.count
+        ap = self.asteroid_pool
+        snack, acorn = self.space_snack, self.cosmic_acorn
+        return {
+            'world': {'ticks': self.ticks, 'size': [self.width, self.height], 'scale': self.scale,
+                      'treats': n, 'asteroids': ap.count},
+            'dogs': [scalar_attrs(dog) for dog in self.dogs],
+            'actors': {
+                'ufo': scalar_attrs(self.ufo),
+                'squirrel': scalar_attrs(self.space_squirrel),
+                'bestie': scalar_attrs(self.bestie),
+                'snack': scalar_attrs(snack) if snack else None,
+                'acorn': {k: v for k, v in acorn.items() if k != 'expiry'} if acorn else None,
+            },
+            'timers': self.timer_records(),
+            'rng': {'python': random.getstate(), 'asteroids': ap.rng.bit_generator.state},
+            # Pools as float columns - the shapes hardly ever change, so are rarely rewritten
+            'treats': np.column_stack([tp.state[:n], tp.rates[:n], tp.collected[:n], tp.kind[:n], tp.value[:n]]),
+            'asteroid_motion': np.column_stack([ap.x, ap.y, ap.rotation]),
+            'asteroid_shapes': np.column_stack([ap.size, ap.vx, ap.vy, ap.rot_speed,
+                                                ap.points.reshape(ap.count, -1)]),
+        }
+    
+    def timer_owners(self):
+        """Names for everything that can own a timer, both ways round"""
+        owners = {'world': self, 'ufo': self.ufo, 'squirrel': self.space_squirrel, 'bestie': self.bestie}
+        if self.space_snack:
+            owners['snack'] = self.space_snack
+        for i, treat in enumerate(self.treats):
+            owners[f"treat {i}"] = treat
+        return owners
+    
+    def timer_records(self):
+        """Pending timers as [ticks from now, owner, method, name, args]"""
+        names = {id(obj): name for name, obj in self.timer_owners().items()}
+        records = []
+        for timer in self.scheduler.pending():
+            owner = names.get(id(getattr(timer.callback, '__self__', None)))
+            args = list(timer.args)
+            if timer.callback == self.expire_acorn:
+                if args[0] is not self.cosmic_acorn:
+                    continue  # an acorn that's already gone - the call would do nothing
+                args = ['acorn']
+            if owner is None:
+                log.warning("Checkpoint skips timer '%s' (no owner it can name)", timer.name,
+                            event='checkpoint_timer_skipped', timer=timer.name)
+                continue
+            records.append([timer.due - self.ticks, owner, timer.callback.__name__, timer.name, args])
+        return records
+    
+    def restore(self, sections):
+        """Load a checkpoint - False, with nothing touched, if it was saved by a differently sized world"""
+        head = sections['world']
+        tp, ap = self.treat_pool, self.asteroid_pool
+        if (head['size'] != [self.width, self.height] or head['scale'] != self.scale
+                or head['treats'] != tp.count or head['asteroids'] != ap.count):
+            log.info("Checkpoint is for a different world (%s), starting fresh", head, event='checkpoint_mismatch')
+            return False
+        
+        self.ticks = head['ticks']
+        for dog, saved in zip(self.dogs, sections['dogs']):
+            vars(dog).update(saved)
+            dog.apply_tuning()
+        actors = sections['actors']
+        vars(self.ufo).update(actors['ufo'])
+        vars(self.space_squirrel).update(actors['squirrel'])
+        vars(self.bestie).update(actors['bestie'])
+        self.space_snack = None
+        if actors['snack']:
+            self.space_snack = SpaceSnack(0, 0)
+            vars(self.space_snack).update(actors['snack'])
+        self.cosmic_acorn = actors['acorn']
+        
+        n = tp.count
+        treats = sections['treats']
+        tp.state[:n] = treats[:, 0:4]
+        tp.rates[:n] = treats[:, 4:8]
+        tp.collected[:n] = treats[:, 8] != 0
+        tp.kind[:n] = treats[:, 9]
+        tp.value[:n] = treats[:, 10]
+        motion, shapes = sections['asteroid_motion'], sections['asteroid_shapes']
+        ap.x[:], ap.y[:], ap.rotation[:] = motion.T
+        ap.size[:], ap.vx[:], ap.vy[:], ap.rot_speed[:] = shapes[:, :4].T
+        ap.points[:] = shapes[:, 4:].reshape(ap.points.shape)
+        
+        rng = sections['rng']
+        version, state, gauss = rng['python']
+        random.setstate((version, tuple(state), gauss))
+        ap.rng.bit_generator.state = rng['asteroids']
+        
+        # Timers come back exactly as they were, on a clock set to the saved tick
+        self.scheduler = Scheduler(self.ticks)
+        owners = self.timer_owners()
+        for obj in owners.values():
+            obj.scheduler = self.scheduler
+        for delay, owner, method, name, args in sections['timers']:
+            if args == ['acorn']:
+                args = [self.cosmic_acorn]
+            timer = self.scheduler.schedule(delay, getattr(owners[owner], method), *args, name=name)
+            if owner == 'snack':
+                self.space_snack.expiry = timer
+            elif method == 'expire_acorn':
+                self.cosmic_acorn['expiry'] = timer
+        self.assigner = TargetAssigner()
+        return True
+    
+    # Snapshot layout (all floats): ticks, then per dog x y vx vy angle score,
+    # per treat x y bob collected type, per asteroid x y rotation + 8 outline points,
+    # ufo, snack, squirrel, acorn, bestie - enough to draw, or to carry on stepping
+    TREAT_SLOTS = 5
+    ASTEROID_SLOTS = 3 + 2 * ASTEROID_SIDES
+    
+    def state_size(self):
+        return (1 + 6 * len(self.dogs) + self.TREAT_SLOTS * self.treat_pool.count
+                + self.ASTEROID_SLOTS * self.asteroid_pool.count + 4 + 5 + 5 + 4 + 5)
+    
+    def state_fields(self):
+        """Kind of every snapshot slot: 'x'/'y' positions, 's' other smooth values, 'd' discrete"""
+        fields = ['d']
+        fields += ['x', 'y', 's', 's', 's', 'd'] * len(self.dogs)
+        fields += ['x', 'y', 's', 'd', 'd'] * self.treat_pool.count
+        fields += (['x', 'y', 's'] + ['d'] * 2 * ASTEROID_SIDES) * self.asteroid_pool.count
+        fields += ['d', 'x', 'y', 'd']             # ufo
+        fields += ['d', 'x', 'y', 's', 'd']        # snack
+        fields += ['d', 'x', 'y', 'd', 'd']        # squirrel
+        fields += ['d', 'x', 'y', 'd']             # acorn
+        fields += ['d', 'x', 'y', 'd', 'd']        # bestie
+        return fields
+    
+    def pool_blocks(self, state):
+        """Views of the treat and asteroid sections of a snapshot, one row per object"""
+        start = 1 + 6 * len(self.dogs)
+        treats = self.treat_pool.count
+        rocks = self.asteroid_pool.count
+        mid = start + self.TREAT_SLOTS * treats
+        end = mid + self.ASTEROID_SLOTS * rocks
+        return (state[start:mid].reshape(treats, self.TREAT_SLOTS),
+                state[mid:end].reshape(rocks, self.ASTEROID_SLOTS), end)
+    
+    def pack_state(self, out):
+        values = [self.ticks]
+        for dog in self.dogs:
+            values += [dog.x, dog.y, dog.vx, dog.vy, dog.angle, dog.score]
+        out[:len(values)] = values
+        
+        # Pools go in column by column
+        treat_rows, rock_rows, end = self.pool_blocks(out)
+        tp, n = self.treat_pool, self.treat_pool.count
+        treat_rows[:, 0] = tp.x[:n]
+        treat_rows[:, 1] = tp.y[:n]
+        treat_rows[:, 2] = tp.bob[:n]
+        treat_rows[:, 3] = tp.collected[:n]
+        treat_rows[:, 4] = tp.kind[:n]
+        ap = self.asteroid_pool
+        rock_rows[:, 0] = ap.x
+        rock_rows[:, 1] = ap.y
+        rock_rows[:, 2] = ap.rotation
+        rock_rows[:, 3:] = ap.points.reshape(ap.count, -1)
+        
+        ufo = self.ufo
+        values = [ufo.active, ufo.x, ufo.y, ufo.beam_active]
+        snack = self.space_snack
+        if snack:
+            values += [1, snack.x, snack.y, snack.rotation, snack.lifetime]
+        else:
+            values += [0, 0, 0, 0, 0]
+        sq = self.space_squirrel
+        values += [sq.active, sq.x, sq.y, sq.has_acorn, sq.direction]
+        ca = self.cosmic_acorn
+        values += [1, ca['x'], ca['y'], ca['expires'] - self.ticks] if ca else [0, 0, 0, 0]
+        b = self.bestie
+        values += [b.active, b.x, b.y, b.steal_cooldown, b.stolen_treats]
+        out[end:] = values
+    
+    def unpack_state(self, state):
+        head = state[:1 + 6 * len(self.dogs)].tolist()
+        self.ticks = int(head[0])
+        for i, dog in enumerate(self.dogs):
+            dog.x, dog.y, dog.vx, dog.vy, dog.angle, score = head[1 + 6 * i:7 + 6 * i]
+            dog.score = int(score)
+        
+        treat_rows, rock_rows, end = self.pool_blocks(state)
+        tp, n = self.treat_pool, self.treat_pool.count
+        tp.x[:n] = treat_rows[:, 0]
+        tp.y[:n] = treat_rows[:, 1]
+        tp.bob[:n] = treat_rows[:, 2]
+        tp.collected[:n] = treat_rows[:, 3] != 0
+        tp.kind[:n] = treat_rows[:, 4]
+        ap = self.asteroid_pool
+        ap.x[:] = rock_rows[:, 0]
+        ap.y[:] = rock_rows[:, 1]
+        ap.rotation[:] = rock_rows[:, 2]
+        ap.points[:] = rock_rows[:, 3:].reshape(ap.points.shape)
+        
+        it = iter(state[end:].tolist())
+        take = lambda: next(it)
+        ufo = self.ufo
+        ufo.active, ufo.x, ufo.y, ufo.beam_active = bool(take()), take(), take(), bool(take())
+        if take():
+            if self.space_snack is None:
+                self.space_snack = SpaceSnack(0, 0)
+            snack = self.space_snack
+            snack.x, snack.y, snack.rotation, snack.lifetime = take(), take(), take(), take()
+        else:
+            self.space_snack = None
+            for _ in range(4):
+                take()
+        sq = self.space_squirrel
+        sq.active, sq.x, sq.y = bool(take()), take(), take()
+        sq.has_acorn, sq.direction = bool(take()), int(take())
+        if take():
+            self.cosmic_acorn = {'x': take(), 'y': take(), 'active': True}
+            self.cosmic_acorn['expires'] = self.ticks + take()
+        else:
+            self.cosmic_acorn = None
+            take(), take(), take()
+        b = self.bestie
+        b.active, b.x, b.y = bool(take()), take(), take()
+        b.steal_cooldown, b.stolen_treats = int(take()), int(take())
+
+
+class SpaceGame:
+    def __init__(self, shared, world=None):
+        log.info("Initializing TREAT QUEST: SPACE EDITION...", event='init')
+        
+        # Display, clock and fonts are shared with the scene manager
+        self.shared = shared
+        self.screen = shared.screen
+        self.clock = shared.clock
+        
+        self.font = shared.font(80, 60)
+        self.font_med = shared.font(56, 40)
+        self.font_small = shared.font(40, 30)
+        
+        # Simulation state - stepped here, or mirrored from the sim process
+        self.world = world or SpaceWorld(asteroids=shared.config['asteroids'])
+        if world is None and shared.config['stats']:
+            self.world.stats = StatsStore()
+            self.world.stats.start()
+        self.leaderboard_panel = None
+        self.leaderboard_generation = None
+        
+        # Where dogs roam and treats get eaten - kill -USR2 <pid> toggles the overlay
+        self.heatmaps = None
+        self.show_heatmap = shared.config['heatmap']
+        if world is None and shared.config['analytics']:
+            self.heatmaps = Heatmaps(SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.heatmaps.load()
+            atexit.register(self.heatmaps.export)
+            try:
+                signal.signal(signal.SIGUSR2, lambda signum, frame: self.toggle_heatmap())
+            except (AttributeError, ValueError):
+                pass
+        if world is None and shared.config['checkpoint_seconds']:
+            # Before the sim process starts, so it inherits the resumed world
+            self.world.use_checkpoints(CheckpointStore('space'), shared.config['checkpoint_seconds'])
+            atexit.register(self.save_checkpoint)
+        self.sim = None
+        if world is None and shared.config['sim_process']:
+            try:
+                from simproc import SimProcess
+                self.sim = SimProcess(self.world)
+            except Exception as e:
+                log.warning("Simulation process unavailable, stepping in-process: %s", e, event='sim_process_error')
+        if world is None and self.sim is None:
+            self.world.watch_signal()
+        
+        # Space environment (render-only)
+        self.starfield = StarField(300)
+        self.earth = Earth()
+        self.precipitation = Precipitation(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.space_station = SpaceStationDoghouse()
+        
+        # Weather arrives in the background - never hold up the first frame for curl
+        refresh_weather()
+        
+        log.info("Space game initialized! 🚀", event='ready')
+    
+    def save_checkpoint(self):
+        """Last save on the way out (deploys, restarts) - the sim process saves its own as it goes"""
+        if self.sim is None and self.world.checkpoints:
+            try:
+                self.world.checkpoints.save(self.world.checkpoint())
+            except OSError as e:
+                log.warning("Checkpoint not saved: %s", e, event='checkpoint_error')
+    
+    def update(self):
+        refresh_weather()
+        
+        # Solar rain / meteor storm from the Tampa weather
+        self.precipitation.set_condition(weather_cache['condition'])
+        self.precipitation.update()
+        
+        if self.sim is None:
+            self.world.step()
+            self.observe()
+            return
+        
+        if not self.sim.alive:
+            log.error("Simulation process died - stepping in-process", event='sim_process_died')
+            self.sim.close()
+            self.sim = None
+            self.world.resync_schedule()
+            self.world.watch_signal()
+            return
+        
+        # Trails are render-side, so they advance once per new sim tick
+        last_tick = self.world.ticks
+        if self.sim.read() and self.world.ticks != last_tick:
+            for dog in self.world.dogs:
+                dog.update_trail()
+            self.observe()
+    
+    def observe(self):
+        heatmaps = self.heatmaps
+        if heatmaps:
+            heatmaps.observe(self.world)
+            if heatmaps.ticks % EXPORT_TICKS == 0:
+                heatmaps.export()
+    
+    def toggle_heatmap(self):
+        self.show_heatmap = not self.show_heatmap
+        log.info("Heatmap overlay %s", 'on' if self.show_heatmap else 'off', event='heatmap', shown=self.show_heatmap)
+    
+    def draw(self):
+        # Deep space background
+        self.screen.fill((10, 15, 35))
+        
+        # Starfield and nebula
+        self.starfield.draw(self.screen)
+        
+        # Earth in background
+        self.earth.draw(self.screen)
+        
+        # Solar rain / meteor storm
+        self.precipitation.draw(self.screen)
+        
+        world = self.world
+        
+        # Asteroids (background) - only the ones on this screen
+        world.asteroid_pool.draw(self.screen)
+        
+        # Space station
+        self.space_station.draw(self.screen)
+        
+        # UFO and its snack
+        world.ufo.draw(self.screen)
+        if world.space_snack:
+            world.space_snack.draw(self.screen)
+        
+        # Space Squirrel
+        world.space_squirrel.draw(self.screen)
+        
+        # Cosmic acorn from squirrel
+        if world.cosmic_acorn:
+            ca = world.cosmic_acorn
+            # Draw floating acorn
+            y_off = world.acorn_bob()
+            pygame.draw.ellipse(self.screen, (200, 170, 100), 
+                               (int(ca['x'] - 10), int(ca['y'] + y_off - 6), 20, 12))
+            pygame.draw.circle(self.screen, (255, 200, 50), (int(ca['x']), int(ca['y'] + y_off - 15)), 5)
+        
+        # BEASTIE
+        world.bestie.draw(self.screen)
+        
+        # Treats
+        SpaceTreat.draw_all(self.screen, world.treat_pool)
+        
+        # Space dogs
+        for dog in world.dogs:
             dog.draw(self.screen)
         
+        if self.show_heatmap and self.heatmaps:
+            self.heatmaps.draw(self.screen)
+        
         # Title
         title = self.font.render("TREAT QUEST", True, (255, 200, 50))
         subtitle = self.font_med.render("SPACE EDITION", True, (150, 220, 255))
@@ -1040,46 +1574,77 @@ class SpaceGame:
         time_surf = self.font_small.render(f"Mission Time: {time_str}", True, (200, 220, 255))
         self.screen.blit(time_surf, (SCREEN_WIDTH - 300, 30))
         
-        wx = space_weather_cache
+        wx = weather_cache
         wx_surf = self.font_small.render(f"Earth: {wx['temp']}°F", True, (200, 220, 255))
         self.screen.blit(wx_surf, (SCREEN_WIDTH - 280, 70))
         
         # Scores
-        harley_surf = self.font_small.render(f"HARLEY: {self.dogs[0].score}", True, (255, 150, 150))
-        shanti_surf = self.font_small.render(f"SHANTI: {self.dogs[1].score}", True, (150, 150, 255))
+        harley_surf = self.font_small.render(f"HARLEY: {world.dogs[0].score}", True, (255, 150, 150))
+        shanti_surf = self.font_small.render(f"SHANTI: {world.dogs[1].score}", True, (150, 150, 255))
         self.screen.blit(harley_surf, (30, 30))
         self.screen.blit(shanti_surf, (30, 70))
         
         # Bestie status (if active)
-        if self.bestie.active:
-            bestie_surf = self.font_small.render(f"BESTIE: {self.bestie.stolen_treats} stolen!", True, (255, 100, 100))
+        if world.bestie.active:
+            bestie_surf = self.font_small.render(f"BESTIE: {world.bestie.stolen_treats} stolen!", True, (255, 100, 100))
             self.screen.blit(bestie_surf, (30, 110))
         
         # Zero-G indicator
         zero_g = self.font_small.render("ZERO-G ENVIRONMENT", True, (255, 200, 100))
         self.screen.blit(zero_g, (SCREEN_WIDTH//2 - zero_g.get_width()//2, SCREEN_HEIGHT - 50))
         
-        pygame.display.flip()
+        # All-time leaderboard
+        panel = self.leaderboard()
+        if panel:
+            self.screen.blit(panel, (30, SCREEN_HEIGHT - panel.get_height() - 30))
+    
+    def leaderboard(self):
+        """All-time panel, re-rendered only when the stats thread has new totals"""
+        stats = self.world.stats
+        if stats is None or not stats.leaderboard:
+            return None
+        if stats.generation != self.leaderboard_generation:
+            self.leaderboard_generation = stats.generation
+            lines = [("ALL-TIME", (255, 200, 50))]
+            for who, points, count in stats.leaderboard:
+                if who == 'bestie':
+                    lines.append((f"BESTIE: {count} stolen", (255, 100, 100)))
+                else:
+                    lines.append((f"{who.upper()}: {points}", (255, 150, 150) if who == 'harley' else (150, 150, 255)))
+            texts = [self.font_small.render(text, True, color) for text, color in lines]
+            # See-through backing, solid text
+            panel = pygame.Surface((max(t.get_width() for t in texts) + 20, 36 * len(texts) + 10), pygame.SRCALPHA)
+            panel.fill((0, 0, 0, 160))
+            for i, text in enumerate(texts):
+                panel.blit(text, (10, 5 + 36 * i))
+            self.leaderboard_panel = panel
+        return self.leaderboard_panel
     
     def run(self):
-        running = True
-        print("Starting TREAT QUEST: SPACE EDITION! 🚀🐕‍🦺", flush=True)
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-            
-            self.draw()
-            self.clock.tick(FPS)
-        
-        pygame.quit()
-        sys.exit()
+        log.info("Starting TREAT QUEST: SPACE EDITION! 🚀🐕‍🦺", event='start')
+        run_scene(self, FPS)
+
+
+def create_game(config=None, shared=None, world=None):
+    """Build the Space Edition - opens the display unless a scene manager shares one"""
+    global SCREEN_WIDTH, SCREEN_HEIGHT, sprite_atlas
+    if shared is None:
+        shared = SharedResources("🚀 TREAT QUEST: SPACE EDITION 🐕‍🦺", config)
+    SCREEN_WIDTH, SCREEN_HEIGHT = shared.screen.get_size()
+    log.info("Space Screen: %dx%d", SCREEN_WIDTH, SCREEN_HEIGHT, event='screen', width=SCREEN_WIDTH, height=SCREEN_HEIGHT)
+    load_ai_tuning()
+    
+    # Warm starts load one baked texture instead of drawing every sprite
+    if shared.config['atlas']:
+        shared.font(40)  # the station's HOME label is baked in
+        sprite_atlas = load_atlas('space', sprite_recipes(), [__file__])
+        shared.profile.mark('sprite atlas')
+    
+    game = SpaceGame(shared, world)
+    shared.profile.mark('space game')
+    return game
 
 
 if __name__ == "__main__":
-    print("🚀 TREAT QUEST: SPACE EDITION v5.0 🐕‍🦺", flush=True)
-    SpaceGame().run()
+    log.info("🚀 TREAT QUEST: SPACE EDITION v5.0 🐕‍🦺", event='launch')
+    create_game().run()
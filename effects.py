@@ -0,0 +1,66 @@
+"""
+Treat Quest effect layer
+Translucent shapes (beams, glass, glow) rendered once into per-pixel-alpha surfaces
+and reused every frame - pygame.draw ignores the alpha of a colour on the opaque
+display, and building SRCALPHA surfaces each frame would allocate constantly
+"""
+
+import pygame
+
+
+class EffectLayer:
+    """Cache of translucent shapes, each drawn once relative to its owner's anchor"""
+    def __init__(self):
+        # name -> (surface, offset_x, offset_y, current surface alpha)
+        self.effects = {}
+
+    def shape(self, name, bounds, draw):
+        """Register a shape: bounds (left, top, w, h) around the anchor, draw(surface, ax, ay)
+
+        Rendered on first use - the display has to be open to convert the surface.
+        """
+        if name not in self.effects:
+            left, top, w, h = bounds
+            surface = pygame.Surface((w, h), pygame.SRCALPHA)
+            # Drawing an RGBA colour onto an SRCALPHA surface stores the alpha as-is
+            draw(surface, -left, -top)
+            if pygame.display.get_surface():
+                surface = surface.convert_alpha()
+            self.effects[name] = [surface, left, top, 255]
+        return self.effects[name]
+
+    def polygon(self, name, color, points):
+        if name in self.effects:
+            return self.effects[name]
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        left, top = min(xs), min(ys)
+        bounds = (left, top, max(xs) - left + 1, max(ys) - top + 1)
+        return self.shape(name, bounds, lambda s, ax, ay: pygame.draw.polygon(
+            s, color, [(x + ax, y + ay) for x, y in points]))
+
+    def ellipse(self, name, color, rect, width=0):
+        if name in self.effects:
+            return self.effects[name]
+        return self.shape(name, rect, lambda s, ax, ay: pygame.draw.ellipse(
+            s, color, (rect[0] + ax, rect[1] + ay, rect[2], rect[3]), width))
+
+    def rings(self, name, rings):
+        """Concentric outlines: (color, radius, width) each, centred on the anchor"""
+        if name in self.effects:
+            return self.effects[name]
+        reach = max(radius for _, radius, _ in rings) + 1
+        def draw(s, ax, ay):
+            for color, radius, width in rings:
+                pygame.draw.circle(s, color, (ax, ay), radius, width)
+        return self.shape(name, (-reach, -reach, 2 * reach, 2 * reach), draw)
+
+    def draw(self, screen, effect, x, y, alpha=255):
+        """Blit a registered shape at its owner's position, optionally faded as a whole"""
+        if alpha <= 0:
+            return
+        if effect[3] != alpha:
+            # Surface alpha multiplies the per-pixel alpha - no new surface per step
+            effect[0].set_alpha(alpha)
+            effect[3] = alpha
+        screen.blit(effect[0], (int(x) + effect[1], int(y) + effect[2]))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Treat Quest AI evolution
+Runs seeded headless Space Edition worlds in a process pool (one per core),
+scores each set of dog AI knobs on treats per minute, how much of the screen the
+dogs cover and how varied their flying looks, and evolves the knobs with a
+(mu + lambda) search. The winner goes to ai_tuning.json, which the live game
+loads at startup - only if it beats the current tuning on the same seeds.
+
+    python3 evolve.py                                   # 10 generations of 16
+    python3 evolve.py --generations 3 --population 8 --minutes 2 --dry-run
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import dog_park
+from analytics import Heatmaps
+
+# Search space - (low, high) per AI_TUNING knob
+BOUNDS = {
+    'harley_speed': (0.05, 0.30),
+    'shanti_speed': (0.05, 0.30),
+    'turn_rate': (0.01, 0.20),
+    'coast_distance': (20, 200),
+    'chase_range': (150, 1200),
+    'drift_chance': (0.0, 0.08),
+    'damping': (0.90, 0.995),
+}
+MUTATION = 0.1              # gaussian sigma as a fraction of each knob's range
+
+# Fitness = sum of weight * metric; treats/minute is scaled so ~1 is a good run
+WEIGHTS = {'treats_per_minute': 1.0, 'coverage': 1.0, 'variety': 0.5, 'clumping': -1.0}
+TREAT_SCALE = 20.0
+SAMPLE_TICKS = 10           # coverage and variety are sampled, not taken every tick
+COVERAGE_CELL = 96          # px - coarse on purpose, it's "did they go everywhere"
+HEADING_BINS = 16
+CLUMP_DISTANCE = 150        # px - dogs this close look like one blob
+
+
+class Tally:
+    """Stands in for the stats store - counts the events the world records"""
+    def __init__(self):
+        self.counts = {}
+
+    def record(self, kind, who, what='', points=0):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+
+def entropy(counts):
+    """Shannon entropy of a histogram, 0..1 of the most it could be"""
+    total = sum(counts)
+    if total <= 0 or len(counts) < 2:
+        return 0.0
+    h = -sum(c / total * math.log(c / total) for c in counts if c > 0)
+    return h / math.log(len(counts))
+
+
+def simulate(params, seed, minutes):
+    """One headless world with these knobs - metrics dict (runs in a worker)"""
+    dog_park.AI_TUNING.update(params)
+    random.seed(seed)
+    world = dog_park.SpaceWorld()
+    world.stats = Tally()
+    coverage = Heatmaps(world.width, world.height, COVERAGE_CELL)
+    headings = [0] * HEADING_BINS
+    clumped = samples = 0
+
+    ticks = int(minutes * 60 * dog_park.FPS)
+    for tick in range(ticks):
+        world.step()
+        if tick % SAMPLE_TICKS:
+            continue
+        samples += 1
+        for dog in world.dogs:
+            coverage.add('dogs', dog.x, dog.y)
+            if dog.vx or dog.vy:
+                heading = math.atan2(dog.vy, dog.vx) % (2 * math.pi)
+                headings[int(heading / (2 * math.pi) * HEADING_BINS) % HEADING_BINS] += 1
+        a, b = world.dogs
+        if math.hypot(a.x - b.x, a.y - b.y) < CLUMP_DISTANCE:
+            clumped += 1
+
+    eaten = sum(world.stats.counts.get(kind, 0) for kind in ('treat', 'snack', 'acorn'))
+    return {
+        'treats_per_minute': eaten / minutes,
+        'coverage': entropy(coverage.maps['dogs'].tolist()),
+        'variety': entropy(headings),
+        'clumping': clumped / max(samples, 1),
+        'ticks': ticks,
+    }
+
+
+def fitness(metrics):
+    scaled = dict(metrics, treats_per_minute=metrics['treats_per_minute'] / TREAT_SCALE)
+    return sum(weight * scaled[name] for name, weight in WEIGHTS.items())
+
+
+def mean_metrics(runs):
+    return {name: sum(run[name] for run in runs) / len(runs) for name in runs[0]}
+
+
+def mutate(params, rng):
+    child = {}
+    for name, (low, high) in BOUNDS.items():
+        value = params[name] + rng.gauss(0, (high - low) * MUTATION)
+        child[name] = min(max(value, low), high)
+    return child
+
+
+def evaluate(pool, candidates, seeds, minutes):
+    """[(fitness, metrics)] per candidate, every candidate on the same seeds"""
+    futures = [[pool.submit(simulate, params, seed, minutes) for seed in seeds] for params in candidates]
+    results = []
+    for runs in futures:
+        metrics = mean_metrics([f.result() for f in runs])
+        results.append((fitness(metrics), metrics))
+    return results
+
+
+def describe(params):
+    return ', '.join(f"{name} {value:.3g}" for name, value in params.items())
+
+
+def write_tuning(path, params, metrics, baseline):
+    data = {
+        'params': params,
+        'metrics': metrics,
+        'fitness': fitness(metrics),
+        'baseline': {'metrics': baseline, 'fitness': fitness(baseline)},
+        'evolved_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolve the Space Edition dog AI in headless simulations")
+    parser.add_argument('--generations', type=int, default=10)
+    parser.add_argument('--population', type=int, default=16, help="candidates per generation")
+    parser.add_argument('--seeds', type=int, default=4, help="worlds per candidate per generation")
+    parser.add_argument('--minutes', type=float, default=5, help="simulated minutes per world")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=None, help="make the search itself repeatable")
+    parser.add_argument('--output', default=dog_park.AI_TUNING_PATH)
+    parser.add_argument('--dry-run', action='store_true', help="report the winner, don't write it")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    dog_park.load_ai_tuning(args.output)
+    baseline = {name: float(dog_park.AI_TUNING[name]) for name in BOUNDS}
+    parents = [baseline]
+    survivors = max(2, args.population // 4)
+    simulated = 0
+    started = time.monotonic()
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        print(f"Evolving over {args.workers} workers: {args.generations} generations of {args.population}, "
+              f"{args.seeds} x {args.minutes:g} min worlds each", flush=True)
+        for generation in range(args.generations):
+            # Fresh seeds every generation so nobody wins on one lucky world
+            seeds = [rng.getrandbits(32) for _ in range(args.seeds)]
+            children = [mutate(rng.choice(parents), rng) for _ in range(args.population - len(parents))]
+            candidates = [baseline] + [p for p in parents if p is not baseline] + children
+            results = evaluate(pool, candidates, seeds, args.minutes)
+            simulated += len(candidates) * len(seeds) * args.minutes
+
+            ranked = sorted(zip(results, range(len(candidates))), key=lambda r: r[0][0], reverse=True)
+            parents = [candidates[i] for _, i in ranked[:survivors]]
+            (best_fitness, best_metrics), best = ranked[0][0], candidates[ranked[0][1]]
+            base_fitness, base_metrics = results[0]
+            elapsed = (time.monotonic() - started) / 60
+            print(f"Generation {generation + 1}: best {best_fitness:.3f} (baseline {base_fitness:.3f}) - "
+                  f"{best_metrics['treats_per_minute']:.1f} treats/min, coverage {best_metrics['coverage']:.2f}, "
+                  f"variety {best_metrics['variety']:.2f}, clumping {best_metrics['clumping']:.2f} - "
+                  f"{simulated / 60 / elapsed:.1f} sim hours per minute", flush=True)
+
+    print(f"Winner: {describe(best)}", flush=True)
+    if best is baseline or best_fitness <= base_fitness:
+        print("Current tuning is still the best - nothing written", flush=True)
+    elif args.dry_run:
+        print(f"Dry run - not writing {args.output}", flush=True)
+    else:
+        write_tuning(args.output, best, best_metrics, base_metrics)
+        print(f"Wrote {args.output} - restart the game to use it", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Treat Quest logging
+The game never writes to journald itself: log calls drop a record into an
+in-memory queue and return, and a background thread formats the queue as one
+JSON object per line (event, frame number, any timing fields) and writes it in
+batches. Repeats of the same event can be rate-limited - a dead network logs
+one weather error every few minutes with a count of what was held back, not one
+per retry.
+
+    log = gamelog.get('weather')
+    log.info("Space weather: %s", condition, event='weather', condition=condition)
+    log.warning("Space weather error: %s", e, event='weather_error', every=300)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+# Rate limit for warnings and errors with an event name and no every= of their own
+DEFAULT_EVERY = 60.0
+MAX_PENDING = 10000       # records queued before new ones are dropped (a stuck journal)
+ROOT = 'treatquest'
+
+# Frame number the loop is on - stamped on every record (run_scene bumps it)
+frame = 0
+
+# Keyword arguments the logging module handles itself
+_LOGGING_KWARGS = ('exc_info', 'stack_info', 'stacklevel', 'extra')
+
+_writer = None
+_setup_lock = threading.Lock()
+
+
+def next_frame():
+    global frame
+    frame += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {'t': round(record.created, 3), 'level': record.levelname.lower(), 'logger': record.name,
+                'pid': record.process, 'frame': getattr(record, 'frame', None)}
+        fields = getattr(record, 'fields', None)
+        if fields:
+            data.update(fields)
+        data['msg'] = record.getMessage()
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """For a terminal - the message, then the structured fields"""
+    def format(self, record):
+        fields = getattr(record, 'fields', None) or {}
+        extra = ' '.join(f"{k}={v}" for k, v in fields.items() if k != 'event')
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.getMessage()}"
+        if extra:
+            line += f"  [{extra}]"
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class LogWriter:
+    """The one thread that touches the output stream - a whole batch per write"""
+    def __init__(self, stream, formatter):
+        self.stream = stream
+        self.formatter = formatter
+        self.queue = queue.SimpleQueue()
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self.run, name='log-writer', daemon=True)
+        self.thread.start()
+
+    def put(self, record):
+        if self.queue.qsize() >= MAX_PENDING:
+            self.dropped += 1
+            return
+        self.queue.put(record)
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            done = []
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    done.append(item)
+                    continue
+                try:
+                    lines.append(self.formatter.format(item))
+                except Exception:
+                    lines.append(f"unformattable log record from {item.name}: {item.msg!r}")
+            if self.dropped:
+                lines.append(f"{self.dropped} log records dropped - output too slow")
+                self.dropped = 0
+            if lines:
+                try:
+                    self.stream.write('\n'.join(lines) + '\n')
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
+            for event in done:
+                event.set()
+
+    def flush(self, timeout=1.0):
+        """Wait until everything queued so far is written"""
+        if not self.thread.is_alive():
+            return False
+        marker = threading.Event()
+        self.queue.put(marker)
+        return marker.wait(timeout)
+
+
+class QueueHandler(logging.Handler):
+    """Hands records to the writer thread - the calling thread never formats or writes"""
+    def emit(self, record):
+        writer = _writer
+        if writer is None or writer.pid != os.getpid():
+            # A forked child - its copy of the writer thread doesn't exist
+            writer = setup(force=True)
+        writer.put(record)
+
+
+class GameLogger(logging.LoggerAdapter):
+    """Logger whose calls take structured fields as keywords (event=, ms=, every=, ...)"""
+    def __init__(self, logger):
+        super().__init__(logger, {})
+        self.last = {}        # event -> when it was last let through
+        self.held = {}        # event -> records held back since
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in _LOGGING_KWARGS}
+        every = fields.pop('every', None)
+        event = fields.get('event')
+        if every is None and event and level >= logging.WARNING:
+            every = DEFAULT_EVERY
+        if every and event:
+            now = time.monotonic()
+            if now - self.last.get(event, -every) < every:
+                self.held[event] = self.held.get(event, 0) + 1
+                return
+            self.last[event] = now
+            if self.held.get(event):
+                fields['suppressed'] = self.held.pop(event)
+        kwargs['extra'] = {'fields': fields, 'frame': frame}
+        self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg, *args, **kwargs):
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg, *args, **kwargs):
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+    def exception(self, msg, *args, **kwargs):
+        kwargs.setdefault('exc_info', True)
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+
+def setup(force=False):
+    """Route treatquest.* to the writer thread - JSON unless stdout is a terminal (TREATQUEST_LOG=json/text)"""
+    global _writer
+    with _setup_lock:
+        if _writer is not None and _writer.pid == os.getpid() and not force:
+            return _writer
+        style = os.environ.get('TREATQUEST_LOG') or ('text' if sys.stdout.isatty() else 'json')
+        formatter = TextFormatter() if style == 'text' else JsonFormatter()
+        _writer = LogWriter(sys.stdout, formatter)
+        root = logging.getLogger(ROOT)
+        if not any(isinstance(h, QueueHandler) for h in root.handlers):
+            root.addHandler(QueueHandler())
+        root.setLevel(logging.DEBUG if os.environ.get('TREATQUEST_DEBUG') == '1' else logging.INFO)
+        root.propagate = False
+        atexit.register(flush)
+        return _writer
+
+
+def get(name):
+    setup()
+    return GameLogger(logging.getLogger(f"{ROOT}.{name}"))
+
+
+def flush(timeout=1.0):
+    """Block until queued records are written - before exiting on purpose"""
+    return _writer.flush(timeout) if _writer else True
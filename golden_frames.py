@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Treat Quest golden frames
+Renders every edition headless (SDL dummy driver) with a fixed seed, a fixed
+clock and fixed weather, captures frames at chosen ticks and compares them with
+stored golden PNGs: a change only counts where it covers whole 3x3 blocks of
+pixels, so anti-aliasing and resampling shimmer along edges passes but a
+recoloured suit or a missing ear doesn't. Every drawn frame is timed too: a
+faster draw path only counts if its frames still match.
+
+    python3 golden_frames.py --update       # record goldens (on the Pi, after a known-good deploy)
+    python3 golden_frames.py                # check every case, JSON report + diff images
+    python3 golden_frames.py space park     # just these cases
+
+The committed goldens in golden/ were recorded headless without fontconfig
+(pygame's bundled font) and with no ai_tuning.json; tests/test_golden_frames.py
+checks them. They depend on the fonts and on ai_tuning.json (the dogs fly
+differently after evolve.py), so re-record them when either changes.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(ROOT, 'golden')
+OUT_DIR = os.path.join(tempfile.gettempdir(), 'treatquest-golden')
+
+# name -> (scene, config overrides, weather condition, golden to compare with)
+# The procedural Space Edition has to match the baked-atlas frames
+CASES = {
+    'space': ('space', {}, 'clear_space', 'space'),
+    'space-procedural': ('space', {'atlas': False}, 'clear_space', 'space'),
+    'space-storm': ('space', {}, 'meteor_storm', 'space-storm'),
+    'park': ('park', {}, 'sunny', 'park'),
+    'platformer': ('platformer', {}, 'sunny', 'platformer'),
+}
+CAPTURE_TICKS = (1, 120, 600)
+SIZE = (1920, 1080)
+SEED = 2026
+# Local wall clock every run sees: late afternoon, so the colour grade is exercised
+FIXED_TIME = (2026, 3, 1, 17, 30, 0)
+TIMEZONE = 'America/New_York'
+
+# A pixel differs if any channel moved more than this, and a frame fails if more
+# than TOLERANCE differing pixels are the centre of a fully differing 3x3 block
+PIXEL_THRESHOLD = 24
+TOLERANCE = 16
+
+
+class FixedClock:
+    """Stands in for pygame.time.get_ticks and datetime.now - advanced one sim tick at a time"""
+    def __init__(self, epoch, fps=60):
+        self.epoch = epoch
+        self.fps = fps
+        self.tick = 0
+
+    def get_ticks(self):
+        return self.tick * 1000 // self.fps
+
+    def now(self):
+        return self.epoch + self.tick / self.fps
+
+
+def render_case(name, ticks, size, out_dir):
+    """Worker: run one case in this (fresh) process and save its frames - returns the timing record"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['TZ'] = TIMEZONE
+    time.tzset()
+
+    import importlib
+    import random
+    from datetime import datetime
+
+    import pygame
+    from grading import ColorGrade
+    from scenes import SCENES, SharedResources
+    from weather import weather_cache
+
+    scene, overrides, condition, _ = CASES[name]
+    clock = FixedClock(time.mktime(FIXED_TIME + (0, 0, -1)))
+    pygame.time.get_ticks = clock.get_ticks
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.now(), tz)
+
+    # Fresh weather that nobody will try to refetch during the run
+    weather_cache.update({'condition': condition, 'temp': 72, 'last_update': time.monotonic()})
+
+    config = {'video_driver': 'dummy', 'size': size, 'grading': True, 'stats': False, 'analytics': False,
+              'checkpoint_seconds': 0, 'sim_process': False}
+    config.update(overrides)
+    random.seed(SEED)
+    shared = SharedResources(f"Golden: {name}", config)
+    module = importlib.import_module(SCENES[scene])
+    if hasattr(module, 'datetime'):
+        module.datetime = FixedDatetime
+    game = module.create_game(shared.config, shared)
+    grade = ColorGrade()
+
+    draw_ms = []
+    frames = {}
+    for tick in range(1, max(ticks) + 1):
+        clock.tick = tick
+        game.update()
+        start = time.perf_counter()
+        game.draw()
+        grade.apply(shared.screen, condition, clock.now())
+        draw_ms.append((time.perf_counter() - start) * 1000)
+        if tick in ticks:
+            path = os.path.join(out_dir, f"{name}-{tick:05d}.png")
+            pygame.image.save(shared.screen, path)
+            frames[tick] = draw_ms[-1]
+    pygame.quit()
+
+    record = {'case': name, 'size': list(size), 'frames': frames, 'draw_ms': timing(draw_ms)}
+    with open(os.path.join(out_dir, f"{name}.json"), 'w') as f:
+        json.dump(record, f)
+    return record
+
+
+def timing(samples):
+    ms = np.array(samples)
+    return {'frames': len(ms), 'mean': round(float(ms.mean()), 3), 'p50': round(float(np.percentile(ms, 50)), 3),
+            'p95': round(float(np.percentile(ms, 95)), 3), 'max': round(float(ms.max()), 3)}
+
+
+def load_pixels(path):
+    import pygame
+    return pygame.surfarray.array3d(pygame.image.load(path)).astype(np.float32)
+
+
+def erode(mask):
+    """Pixels whose whole 3x3 neighbourhood is set - one-pixel edge shimmer drops out"""
+    padded = np.pad(mask, 1)
+    w, h = mask.shape
+    solid = mask.copy()
+    for dx in range(3):
+        for dy in range(3):
+            solid &= padded[dx:dx + w, dy:dy + h]
+    return solid
+
+
+def perceptual_diff(golden, frame):
+    """(pixels that differ, mean channel delta, mask of the differing pixels, mask of solid changes)"""
+    delta = np.abs(golden - frame).max(axis=2)
+    changed = delta > PIXEL_THRESHOLD
+    return int(changed.sum()), float(delta.mean()), changed, erode(changed)
+
+
+def save_diff(golden, changed, solid, path):
+    """The golden dimmed to grey, differing pixels dark red and solid changes bright red"""
+    import pygame
+    grey = (golden.mean(axis=2) * 0.4).astype(np.uint8)
+    image = np.repeat(grey[:, :, None], 3, axis=2)
+    image[changed] = (120, 0, 0)
+    image[solid] = (255, 0, 0)
+    pygame.image.save(pygame.surfarray.make_surface(image), path)
+
+
+def run_worker(name, ticks, size, out_dir):
+    """Render a case in a child process - editions keep state in module globals"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', name, '--out', out_dir,
+           '--ticks', ','.join(str(t) for t in ticks), '--size', f"{size[0]}x{size[1]}"]
+    result = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} failed to render:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+    with open(os.path.join(out_dir, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def load_manifest(golden_dir):
+    try:
+        with open(os.path.join(golden_dir, 'manifest.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def update_goldens(names, ticks, size, out_dir, golden_dir):
+    os.makedirs(golden_dir, exist_ok=True)
+    manifest = load_manifest(golden_dir)
+    for name in names:
+        golden = CASES[name][3]
+        if golden != name:
+            continue  # compared against another case's goldens
+        record = run_worker(name, ticks, size, out_dir)
+        for tick in ticks:
+            os.replace(os.path.join(out_dir, f"{name}-{tick:05d}.png"),
+                       os.path.join(golden_dir, f"{name}-{tick:05d}.png"))
+        manifest[name] = dict(record, recorded_at=time.strftime('%Y-%m-%dT%H:%M:%S%z'))
+        print(f"{name}: recorded {len(ticks)} goldens, draw {record['draw_ms']['mean']:.2f}ms mean", flush=True)
+    with open(os.path.join(golden_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+
+def check(names, ticks, size, out_dir, golden_dir, tolerance):
+    """Render and compare every case - (all passed, report dict)"""
+    manifest = load_manifest(golden_dir)
+    report = {'size': list(size), 'ticks': list(ticks), 'tolerance': tolerance,
+              'pixel_threshold': PIXEL_THRESHOLD, 'cases': {}}
+    passed = True
+    for name in names:
+        golden = CASES[name][3]
+        record = run_worker(name, ticks, size, out_dir)
+        frames = []
+        for tick in ticks:
+            frame_path = os.path.join(out_dir, f"{name}-{tick:05d}.png")
+            golden_path = os.path.join(golden_dir, f"{golden}-{tick:05d}.png")
+            entry = {'tick': tick, 'draw_ms': round(record['frames'][str(tick)], 3), 'frame': frame_path}
+            if not os.path.exists(golden_path):
+                entry['status'] = 'missing golden'
+            else:
+                want, got = load_pixels(golden_path), load_pixels(frame_path)
+                if want.shape != got.shape:
+                    entry['status'] = 'size mismatch'
+                else:
+                    differing, mean_delta, changed, solid = perceptual_diff(want, got)
+                    entry.update(differing=differing, solid=int(solid.sum()), mean_delta=round(mean_delta, 3))
+                    entry['status'] = 'ok' if entry['solid'] <= tolerance else 'changed'
+                    if entry['status'] != 'ok':
+                        entry['diff'] = os.path.join(out_dir, f"{name}-{tick:05d}-diff.png")
+                        save_diff(want, changed, solid, entry['diff'])
+            passed = passed and entry['status'] == 'ok'
+            frames.append(entry)
+
+        case = {'golden': golden, 'frames': frames, 'draw_ms': record['draw_ms'],
+                'passed': all(f['status'] == 'ok' for f in frames)}
+        before = manifest.get(golden, {}).get('draw_ms')
+        if before:
+            case['speedup'] = round(before['mean'] / record['draw_ms']['mean'], 3)
+        report['cases'][name] = case
+
+        worst = max((f.get('solid', -1) for f in frames), default=0)
+        speedup = f", {case['speedup']:.2f}x golden speed" if 'speedup' in case else ''
+        print(f"{name:18s} {'PASS' if case['passed'] else 'FAIL'}  worst frame {worst if worst >= 0 else 'n/a'} px changed, "
+              f"draw {record['draw_ms']['mean']:.2f}ms mean / {record['draw_ms']['p95']:.2f}ms p95{speedup}", flush=True)
+    return passed, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-frame render regression check for every edition")
+    parser.add_argument('cases', nargs='*', help=f"cases to run (default all: {', '.join(CASES)})")
+    parser.add_argument('--update', action='store_true', help="record new goldens instead of checking")
+    parser.add_argument('--ticks', default=','.join(str(t) for t in CAPTURE_TICKS), help="ticks to capture")
+    parser.add_argument('--size', default=f"{SIZE[0]}x{SIZE[1]}")
+    parser.add_argument('--tolerance', type=int, default=TOLERANCE, help="solid changed pixels allowed per frame")
+    parser.add_argument('--golden', default=GOLDEN_DIR)
+    parser.add_argument('--out', default=OUT_DIR, help="captured frames, diffs and report.json")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    ticks = sorted(int(t) for t in args.ticks.split(','))
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    os.makedirs(args.out, exist_ok=True)
+    if args.worker:
+        render_case(args.worker, ticks, size, args.out)
+        return
+
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case {', '.join(unknown)} (choose from {', '.join(CASES)})")
+    if args.update:
+        update_goldens(names, ticks, size, args.out, args.golden)
+        return
+
+    passed, report = check(names, ticks, size, args.out, args.golden, args.tolerance)
+    report_path = os.path.join(args.out, 'report.json')
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"{'All frames match' if passed else 'Frames changed'} - report in {report_path}", flush=True)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
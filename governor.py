@@ -0,0 +1,71 @@
+"""
+Treat Quest frame-rate governor
+Full speed while someone might be watching, a trickle of frames during quiet
+hours or after a long spell without input - the simulation keeps real time
+either way, because it is stepped at a fixed rate however often we render
+"""
+
+import time
+
+import gamelog
+
+log = gamelog.get('governor')
+
+# Never run more than this many sim steps for one rendered frame (after a stall)
+MAX_CATCHUP_SECONDS = 0.5
+
+
+def in_quiet_hours(quiet_hours, now=None):
+    """quiet_hours: (start_hour, end_hour) local time, may wrap past midnight; None = never"""
+    if not quiet_hours:
+        return False
+    start, end = quiet_hours
+    t = time.localtime(now)
+    hour = t.tm_hour + t.tm_min / 60
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class FrameGovernor:
+    """Picks each frame's render rate and how many fixed sim steps are due"""
+    def __init__(self, config, fps=60):
+        self.fps = fps
+        self.quiet_hours = config['quiet_hours']
+        self.idle_fps = config['idle_fps']
+        self.idle_after = config['idle_after']
+        self.last_input = time.monotonic()
+        self.last_frame = None
+        self.backlog = 0.0
+        self.mode = 'full'
+
+    def poke(self):
+        """Someone pressed something - back to full rate right away"""
+        self.last_input = time.monotonic()
+
+    def rate(self):
+        """Render rate for the next frame"""
+        now = time.monotonic()
+        mode = 'full'
+        if in_quiet_hours(self.quiet_hours):
+            mode = 'quiet hours'
+        elif self.idle_after and now - self.last_input > self.idle_after:
+            mode = 'idle'
+        if mode != self.mode:
+            fps = self.fps if mode == 'full' else self.idle_fps
+            log.info("Frame rate: %s (%d FPS)", mode, fps, event='frame_rate', mode=mode, fps=fps)
+            self.mode = mode
+        return self.fps if mode == 'full' else self.idle_fps
+
+    def steps(self):
+        """Fixed 1/fps sim steps owed since the last frame - one per frame at full rate"""
+        now = time.monotonic()
+        if self.last_frame is None:
+            self.last_frame = now
+            return 1
+        self.backlog += min(now - self.last_frame, MAX_CATCHUP_SECONDS)
+        self.last_frame = now
+        # Clock jitter at full rate shouldn't turn into a skipped or doubled step
+        steps = max(1, int(self.backlog * self.fps + 0.25))
+        self.backlog = max(0.0, self.backlog - steps / self.fps)
+        return steps
@@ -0,0 +1,87 @@
+"""
+Treat Quest colour grading
+Sunrise, day, sunset and night moods from the wall clock and the weather - one
+full-frame multiply per frame, with the tint looked up per 5-minute bucket
+"""
+
+import time
+
+import pygame
+
+BUCKET_MINUTES = 5
+BUCKETS = 24 * 60 // BUCKET_MINUTES
+
+# (hour, multiplicative tint) - 255 leaves a channel alone
+TIME_KEYFRAMES = [
+    (0.0, (150, 160, 215)),     # night
+    (5.0, (160, 165, 215)),
+    (6.5, (255, 195, 165)),     # sunrise
+    (8.0, (255, 240, 225)),
+    (11.0, (255, 255, 255)),    # day
+    (15.5, (255, 255, 255)),
+    (17.0, (255, 245, 230)),
+    (18.5, (255, 185, 150)),    # sunset
+    (20.0, (185, 170, 215)),    # dusk
+    (22.0, (150, 160, 215)),
+    (24.0, (150, 160, 215)),
+]
+
+# Weather dims and cools on top of the time of day
+WEATHER_TINTS = {
+    'solar_rain': (215, 225, 240),
+    'meteor_storm': (190, 190, 220),
+    'nebula': (225, 220, 235),
+}
+
+
+def build_time_lut(keyframes=TIME_KEYFRAMES):
+    """Tint for every 5-minute bucket of the day, interpolated between keyframes"""
+    lut = []
+    for bucket in range(BUCKETS):
+        hour = bucket * BUCKET_MINUTES / 60
+        for (h0, c0), (h1, c1) in zip(keyframes, keyframes[1:]):
+            if h0 <= hour < h1:
+                t = (hour - h0) / (h1 - h0)
+                lut.append(tuple(int(round(a + (b - a) * t)) for a, b in zip(c0, c1)))
+                break
+    return lut
+
+
+TIME_LUT = build_time_lut()
+
+
+class ColorGrade:
+    """Post-process pass: multiplies the finished frame by the current mood
+
+    The tint lives in a cached screen-sized surface, refilled only when the bucket
+    or weather changes - a BLEND_MULT blit is SIMD in pygame, a BLEND_MULT fill isn't.
+    """
+    def __init__(self):
+        self.key = None
+        self.tint = (255, 255, 255)
+        self.surface = None
+        self.filled = None
+
+    def tint_for(self, now=None, condition=None):
+        """Tint for a wall-clock time (epoch seconds, local time) and weather condition"""
+        t = time.localtime(now)
+        bucket = (t.tm_hour * 60 + t.tm_min) // BUCKET_MINUTES
+        key = (bucket, condition)
+        if key != self.key:
+            self.key = key
+            weather = WEATHER_TINTS.get(condition, (255, 255, 255))
+            self.tint = tuple(a * b // 255 for a, b in zip(TIME_LUT[bucket], weather))
+        return self.tint
+
+    def apply(self, screen, condition=None, now=None):
+        tint = self.tint_for(now, condition)
+        # Midday in clear weather costs nothing
+        if tint == (255, 255, 255):
+            return
+        if self.surface is None or self.surface.get_size() != screen.get_size():
+            self.surface = pygame.Surface(screen.get_size()).convert(screen)
+            self.filled = None
+        if self.filled != tint:
+            self.surface.fill(tint)
+            self.filled = tint
+        screen.blit(self.surface, (0, 0), special_flags=pygame.BLEND_MULT)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Treat Quest live view
+What the TV is showing, as an MJPEG stream over HTTP - check on the box from a
+phone instead of walking over or setting up VNC. Frames go through the same
+kind of shared-memory ring as capture.py to an encoder process that also runs
+the web server. With nobody connected the game copies nothing; with viewers it
+copies a few frames a second, and the encoder shrinks the picture and then the
+frame rate if encoding takes too long.
+
+    http://<pi>:8090/           page with the stream
+    http://<pi>:8090/stream     multipart MJPEG
+    http://<pi>:8090/frame.jpg  one fresh frame
+    http://<pi>:8090/status     JSON: viewers, size, rate, encode time
+"""
+
+import atexit
+import io
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import gamelog
+from capture import DROPPED, WANTED, FrameRing, to_rgb
+
+log = gamelog.get('liveview')
+
+SLOTS = 2
+WIDTHS = (960, 640, 480, 320)   # picture sizes the encoder steps down (and back up) through
+MAX_INTERVAL_MS = 2000          # slowest it will go before giving up on smoothness
+BUDGET_SHARE = 0.25             # encoding may take this share of the frame interval
+RECOVER_FRAMES = 20             # this many cheap frames in a row before stepping back up
+FRAME_WAIT_SECONDS = 5.0
+BOUNDARY = 'treatquestframe'
+
+PAGE = """<!doctype html>
+<html><head><title>Treat Quest live</title>
+<style>body{margin:0;background:#0a0f23;color:#c8dcff;font-family:sans-serif;text-align:center}
+img{max-width:100%;height:auto}</style></head>
+<body><img src="/stream" alt="Treat Quest live view"></body></html>
+"""
+
+
+class Hub:
+    """Encoder-side state shared by the HTTP threads: the newest JPEG and who is watching"""
+    def __init__(self, ring, fps, width):
+        self.ring = ring
+        self.base_interval = int(1000 / fps)
+        self.interval = self.base_interval
+        self.width_index = next((i for i, w in enumerate(WIDTHS) if w <= width), len(WIDTHS) - 1)
+        self.min_index = self.width_index
+        self.changed = threading.Condition()
+        self.jpeg = None
+        self.seq = 0
+        self.viewers = 0
+        self.sent = 0
+        self.encode_ms = 0.0
+        self.cheap = 0
+
+    def join(self):
+        with self.changed:
+            self.viewers += 1
+            self.ring.header[WANTED] = self.interval
+
+    def leave(self):
+        with self.changed:
+            self.viewers -= 1
+            if not self.viewers:
+                # The game stops copying frames on its next one
+                self.ring.header[WANTED] = 0
+
+    def wait_newer(self, seq):
+        """The newest (seq, jpeg) after seq - None if nothing new arrives in time"""
+        deadline = time.monotonic() + FRAME_WAIT_SECONDS
+        with self.changed:
+            while self.seq <= seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.changed.wait(remaining)
+            return self.seq, self.jpeg
+
+    def publish(self, jpeg, cost):
+        with self.changed:
+            self.jpeg = jpeg
+            self.seq += 1
+            self.encode_ms = cost * 1000
+            self.adapt(cost)
+            self.changed.notify_all()
+
+    def adapt(self, cost):
+        """Smaller picture, then fewer frames, while encoding is over budget - and back when it isn't"""
+        budget = self.interval / 1000 * BUDGET_SHARE
+        if cost > budget:
+            self.cheap = 0
+            if self.width_index < len(WIDTHS) - 1:
+                self.width_index += 1
+            else:
+                self.interval = min(int(self.interval * 1.5), MAX_INTERVAL_MS)
+        elif cost < budget * 0.4:
+            self.cheap += 1
+            if self.cheap >= RECOVER_FRAMES:
+                self.cheap = 0
+                if self.interval > self.base_interval:
+                    self.interval = max(int(self.interval / 1.5), self.base_interval)
+                elif self.width_index > self.min_index:
+                    self.width_index -= 1
+        if self.viewers:
+            self.ring.header[WANTED] = self.interval
+
+    def status(self):
+        return {'viewers': self.viewers, 'width': WIDTHS[self.width_index], 'interval_ms': self.interval,
+                'fps': round(1000 / self.interval, 1), 'encode_ms': round(self.encode_ms, 1),
+                'frames': self.seq, 'sent': self.sent, 'dropped': int(self.ring.header[DROPPED])}
+
+
+class LiveViewHandler(BaseHTTPRequestHandler):
+    server_version = 'TreatQuestLive/1.0'
+
+    def log_message(self, format, *args):
+        pass  # one line per frame request would flood the journal
+
+    def do_GET(self):
+        hub = self.server.hub
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self.reply(200, 'text/html; charset=utf-8', PAGE.encode())
+        elif path == '/status':
+            self.reply(200, 'application/json', json.dumps(hub.status()).encode())
+        elif path == '/frame.jpg':
+            hub.join()
+            try:
+                frame = hub.wait_newer(hub.seq)
+            finally:
+                hub.leave()
+            if frame is None:
+                self.reply(503, 'text/plain', b'No frame from the game\n')
+            else:
+                self.reply(200, 'image/jpeg', frame[1])
+        elif path == '/stream':
+            self.stream(hub)
+        else:
+            self.reply(404, 'text/plain', b'Not found\n')
+
+    def reply(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, hub):
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        hub.join()
+        seq = hub.seq
+        try:
+            while True:
+                # A slow viewer just gets the newest frame next - never a backlog
+                frame = hub.wait_newer(seq)
+                if frame is None:
+                    continue
+                seq, jpeg = frame
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg + b"\r\n")
+                self.wfile.flush()
+                with hub.changed:
+                    hub.sent += 1
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            hub.leave()
+
+
+def encode(ring, slot, geometry, width):
+    """Raw slot -> JPEG bytes at (about) width px wide - the caller releases the slot"""
+    import pygame
+    step = max(1, geometry[0] // width)
+    rgb = to_rgb(ring.frames[slot], geometry, step)
+    height, got = rgb.shape[:2]
+    surface = pygame.image.frombuffer(rgb.tobytes(), (got, height), 'RGB')
+    if got != width:
+        surface = pygame.transform.smoothscale(surface, (width, height * width // got))
+    out = io.BytesIO()
+    pygame.image.save(surface, out, 'frame.jpg')
+    return out.getvalue()
+
+
+def liveview_server(ring_name, frame_bytes, geometry, settings, parent_pid, ready=None):
+    """Child process: web server threads plus the encoder loop - sends the bound port to ready, if given"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        os.nice(10)  # the game comes first
+    except OSError:
+        pass
+    ring = FrameRing(frame_bytes, SLOTS, ring_name)
+    hub = Hub(ring, settings['fps'], min(settings['width'], geometry[0]))
+    try:
+        server = ThreadingHTTPServer((settings['bind'], settings['port']), LiveViewHandler)
+    except OSError as e:
+        log.warning("Live view unavailable on port %d: %s", settings['port'], e, event='liveview_unavailable')
+        ring.close()
+        if ready:
+            ready.send(None)
+        return
+    server.daemon_threads = True
+    server.hub = hub
+    threading.Thread(target=server.serve_forever, name='liveview-http', daemon=True).start()
+    port = server.server_address[1]
+    log.info("Live view on http://%s:%d/", settings['bind'], port, event='liveview_started', port=port)
+    if ready:
+        ready.send(port)
+
+    while not ring.stopped and os.getppid() == parent_pid:
+        item = ring.take()
+        if item is None:
+            time.sleep(0.02)
+            continue
+        start = time.perf_counter()
+        try:
+            jpeg = encode(ring, item[0], geometry, WIDTHS[hub.width_index])
+        except Exception as e:
+            log.warning("Live view frame failed: %s", e, event='liveview_error')
+            continue
+        finally:
+            ring.release(item[0])
+        hub.publish(jpeg, time.perf_counter() - start)
+    server.shutdown()
+    ring.close()
+
+
+class LiveView:
+    """Render-side half - frame(screen) once per finished frame; a no-op unless someone is watching"""
+    def __init__(self, config, screen):
+        if screen.get_bytesize() != 4:
+            raise ValueError(f"needs a 32-bit display, not {screen.get_bitsize()}-bit")
+        width, height = screen.get_size()
+        geometry = (width, height, screen.get_pitch(), screen.get_shifts())
+        settings = {'bind': config['liveview_bind'], 'port': config['liveview_port'],
+                    'fps': config['liveview_fps'], 'width': config['liveview_width']}
+        frame_bytes = screen.get_pitch() * height
+        self.ring = FrameRing(frame_bytes, SLOTS)
+        self.next_frame = 0.0
+        # spawn, not fork - the server must not inherit our X11 connection
+        context = multiprocessing.get_context('spawn')
+        self.process = context.Process(target=liveview_server, name='treatquest-liveview', daemon=True,
+                                       args=(self.ring.name, frame_bytes, geometry, settings, os.getpid()))
+        self.process.start()
+        atexit.register(self.close)
+
+    def frame(self, screen):
+        interval = self.ring.header[WANTED] if self.ring else 0
+        if not interval:
+            return
+        now = time.monotonic()
+        if now < self.next_frame:
+            return
+        self.next_frame = now + interval / 1000
+        self.ring.put(screen, 0)
+
+    def close(self):
+        if self.ring is None:
+            return
+        self.ring.stop()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
+        self.ring = None
@@ -7,12 +7,11 @@ Fullscreen PyGame for Raspberry Pi
 
 import pygame
 import random
-import sys
 import math
 from enum import Enum
 
-# Initialize PyGame
-pygame.init()
+from collisions import CollisionWorld
+from scenes import SharedResources, run_scene
 
 # Constants
 SCREEN_WIDTH = 1920
@@ -221,7 +220,7 @@ class Dog:
             particle_y = head_y + head_size - random.randint(5, 15)
             pygame.draw.circle(screen, (200, 200, 255, 128), (particle_x, particle_y), 2)
     
-    def update(self, platforms, treats):
+    def update(self):
         # Physics
         self.vy += 0.6  # Gravity
         
@@ -229,33 +228,23 @@ class Dog:
         self.y += self.vy
         
         self.grounded = False
-        
-        # Platform collision
-        for plat in platforms:
-            if (self.x + self.width//2 > plat.x and 
-                self.x - self.width//2 < plat.x + plat.width and
-                self.y + self.height//2 > plat.y and
-                self.y - self.height//2 < plat.y + plat.height):
-                
-                # Landing on top
-                if self.vy > 0 and self.y - self.height//2 < plat.y:
-                    self.y = plat.y - self.height//2
-                    self.vy = 0
-                    self.grounded = True
-                # Hitting bottom
-                elif self.vy < 0 and self.y + self.height//2 > plat.y + plat.height:
-                    self.y = plat.y + plat.height + self.height//2
-                    self.vy = 0
-        
-        # Treat collection
-        treats_collected = []
-        for treat in treats:
-            dx = self.x - treat.x
-            dy = self.y - treat.y
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist < 40:
-                treats_collected.append(treat)
-        
+    
+    def resolve_platform(self, plat):
+        """Push out of an overlapping platform - called by the collision stage"""
+        # Landing on top
+        if self.vy > 0 and self.y - self.height//2 < plat.y:
+            self.y = plat.y - self.height//2
+            self.vy = 0
+            self.grounded = True
+            return 'top'
+        # Hitting bottom
+        elif self.vy < 0 and self.y + self.height//2 > plat.y + plat.height:
+            self.y = plat.y + plat.height + self.height//2
+            self.vy = 0
+            return 'bottom'
+        return None
+    
+    def settle(self):
         # Floor limit
         if self.y > SCREEN_HEIGHT - 100:
             self.y = SCREEN_HEIGHT - 100
@@ -267,8 +256,6 @@ class Dog:
             self.vx *= 0.85
         else:
             self.vx *= 0.98
-        
-        return treats_collected
 
 class Platform:
     def __init__(self, x, y, width, height, platform_type='grass'):
@@ -378,14 +365,14 @@ class Cloud:
         pygame.draw.ellipse(screen, color, (screen_x - self.width//4, y - 10, self.width//2, 35))
 
 class Game:
-    def __init__(self):
-        # Fullscreen mode
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.clock = pygame.time.Clock()
-        pygame.display.set_caption("Treat Quest: A Dog Adventure")
+    def __init__(self, shared):
+        # Display, clock and fonts are shared with the scene manager
+        self.shared = shared
+        self.screen = shared.screen
+        self.clock = shared.clock
         
-        self.font = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 36)
+        self.font = shared.font(48)
+        self.font_small = shared.font(36)
         
         # Game world
         self.world_width = 4000
@@ -405,6 +392,13 @@ class Game:
         self.treats = self.generate_treats()
         self.score = 0
         
+        # Collision stage - platforms and treats never move, so they are bucketed once
+        self.collisions = CollisionWorld(pickup_radius=40)
+        for plat in self.platforms:
+            self.collisions.add_platform(plat)
+        for treat in self.treats:
+            self.collisions.add_pickup(treat)
+        
         # Particles
         self.particles = []
         
@@ -504,24 +498,25 @@ class Game:
                 ])
     
     def update(self):
+        self.handle_input()
         dog = self.dogs[self.active_dog]
         
-        # Treat collection
-        for treat in self.treats:
-            if not treat.collected:
-                dx = dog.x - treat.x
-                dy = dog.y - treat.y
-                dist = math.sqrt(dx*dx + dy*dy)
-                if dist < 40:
-                    treat.collected = True
-                    self.score += 10
-                    # Particles
-                    for _ in range(8):
-                        self.particles.append(Particle(treat.x, treat.y, (255, 215, 0)))
-        
-        # Update dogs
+        # Update dogs, then a single collision pass for all of them
+        for d in self.dogs:
+            d.update()
+        events = self.collisions.step(self.dogs)
         for d in self.dogs:
-            collected = d.update(self.platforms, self.treats)
+            d.settle()
+        
+        # Feed collision events to scoring and particles
+        for event in events:
+            if event.kind == 'treat' and event.a is dog and not event.b.collected:
+                treat = event.b
+                treat.collected = True
+                self.score += 10
+                # Particles
+                for _ in range(8):
+                    self.particles.append(Particle(treat.x, treat.y, (255, 215, 0)))
         
         # Camera follow
         target_x = dog.x - SCREEN_WIDTH // 2
@@ -593,8 +588,6 @@ class Game:
         
         # UI
         self.draw_ui()
-        
-        pygame.display.flip()
     
     def handle_input(self):
         keys = pygame.key.get_pressed()
@@ -630,25 +623,16 @@ class Game:
                 dog.sniffing = False
     
     def run(self):
-        running = True
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-            
-            self.handle_input()
-            self.update()
-            self.draw()
-            
-            self.clock.tick(FPS)
-        
-        pygame.quit()
-        sys.exit()
+        run_scene(self, FPS)
+
+def create_game(config=None, shared=None):
+    """Build the platformer - opens the display unless a scene manager shares one"""
+    if shared is None:
+        shared = SharedResources("Treat Quest: A Dog Adventure", config)
+    game = Game(shared)
+    shared.profile.mark('platformer')
+    return game
 
 if __name__ == "__main__":
-    game = Game()
+    game = create_game()
     game.run()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Treat Quest multi-screen
+One simulation server owns a Space Edition world several screens wide and streams
+binary state over TCP; each TV runs a thin client that renders its own slice
+
+    python3 multiscreen.py server --screens 3
+    python3 multiscreen.py client --host 10.0.0.5 --screen 1
+    python3 multiscreen.py demo --screens 3     # everything on localhost, dummy SDL
+"""
+
+import argparse
+import json
+import os
+import selectors
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+import gamelog
+
+log = gamelog.get('multiscreen')
+
+PORT = 7777
+SIM_HZ = 60
+SEND_EVERY = 2              # ticks per network update (30Hz)
+KEYFRAME_TICKS = 600        # full state every 10s, and to every new client
+MAX_BACKLOG = 256 * 1024    # bytes queued for one client before we drop it
+INTERP_TICKS = 4            # render this far behind the newest snapshot
+SNAP_DISTANCE = 200         # bigger jumps than this are wraps/respawns, not motion
+RECONNECT_SECONDS = 2
+
+# Wire format: every message is a 4-byte length then a type byte and the sim tick
+HELLO, KEYFRAME, DELTA = b'H', b'K', b'D'
+LENGTH = struct.Struct('!I')
+HEADER = struct.Struct('!cI')
+
+
+def encode(kind, tick, payload=b''):
+    body = HEADER.pack(kind, tick) + payload
+    return LENGTH.pack(len(body)) + body
+
+
+def encode_delta(prev, state):
+    """Changed slots only: count, uint32 indices, float32 values - big pools go past 65535 slots"""
+    changed = np.flatnonzero(prev != state).astype('>u4')
+    return struct.pack('!I', len(changed)) + changed.tobytes() + state[changed].astype('>f4').tobytes()
+
+
+def apply_delta(state, payload):
+    count = struct.unpack_from('!I', payload)[0]
+    index = np.frombuffer(payload, dtype='>u4', count=count, offset=4)
+    values = np.frombuffer(payload, dtype='>f4', count=count, offset=4 + 4 * count)
+    state[index] = values
+
+
+def make_world(width, height, screens):
+    """A Space Edition world sized to every screen side by side"""
+    import dog_park
+    dog_park.SCREEN_WIDTH, dog_park.SCREEN_HEIGHT = width * screens, height
+    dog_park.load_ai_tuning()
+    return dog_park.SpaceWorld(scale=screens)
+
+
+class WorldServer:
+    """Steps the shared world at a fixed rate and broadcasts it to every client"""
+    def __init__(self, screens=3, size=(1920, 1080), port=PORT, host='0.0.0.0'):
+        self.screens = screens
+        self.size = size
+        self.world = make_world(size[0], size[1], screens)
+        self.world.watch_signal()
+        self.state = np.zeros(self.world.state_size(), dtype=np.float32)
+        self.sent = self.state.copy()
+
+        self.hello = json.dumps({
+            'screens': screens, 'width': size[0], 'height': size[1],
+            'slots': int(self.state.size), 'hz': SIM_HZ,
+        }).encode()
+
+        self.selector = selectors.DefaultSelector()
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((host, port))
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.clients = {}  # socket -> {'out': bytearray, 'fresh': bool, 'addr': ...}
+        log.info("World server: %d screens of %dx%d, port %d", screens, size[0], size[1], port, event='server_started')
+
+    def accept(self):
+        conn, addr = self.listener.accept()
+        conn.setblocking(False)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.clients[conn] = {'out': bytearray(encode(HELLO, 0, self.hello)), 'fresh': True, 'addr': addr}
+        self.selector.register(conn, selectors.EVENT_READ)
+        log.info("Screen client connected from %s:%d", addr[0], addr[1], event='client_connected')
+
+    def drop(self, conn, reason):
+        client = self.clients.pop(conn)
+        self.selector.unregister(conn)
+        conn.close()
+        log.info("Screen client %s:%d dropped: %s", client['addr'][0], client['addr'][1], reason,
+                 event='client_dropped')
+
+    def broadcast(self, tick):
+        self.world.pack_state(self.state)
+        keyframe = encode(KEYFRAME, tick, self.state.astype('>f4').tobytes())
+        if tick % KEYFRAME_TICKS == 0:
+            delta = keyframe
+        else:
+            delta = encode(DELTA, tick, encode_delta(self.sent, self.state))
+        self.sent[:] = self.state
+
+        for conn, client in list(self.clients.items()):
+            client['out'] += keyframe if client['fresh'] else delta
+            client['fresh'] = False
+            if len(client['out']) > MAX_BACKLOG:
+                # It reconnects and gets a keyframe - cheaper than buffering forever
+                self.drop(conn, "too far behind")
+
+    def flush(self):
+        for conn, client in list(self.clients.items()):
+            if not client['out']:
+                continue
+            try:
+                sent = conn.send(client['out'])
+                del client['out'][:sent]
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                self.drop(conn, e)
+
+    def poll(self, timeout):
+        for key, _ in self.selector.select(timeout):
+            if key.fileobj is self.listener:
+                self.accept()
+                continue
+            # Clients never talk back - readable means closed
+            try:
+                if not key.fileobj.recv(4096):
+                    self.drop(key.fileobj, "closed")
+            except OSError as e:
+                self.drop(key.fileobj, e)
+
+    def run(self, seconds=None):
+        step = 1.0 / SIM_HZ
+        started = next_tick = time.perf_counter()
+        tick = 0
+        while seconds is None or time.perf_counter() - started < seconds:
+            self.world.step()
+            tick = self.world.ticks
+            if tick % SEND_EVERY == 0:
+                self.broadcast(tick)
+            self.flush()
+
+            next_tick += step
+            delay = next_tick - time.perf_counter()
+            if delay < -0.25:
+                next_tick = time.perf_counter()
+            self.poll(max(0.0, delay))
+        log.info("World server stopped after %d ticks", tick, event='server_stopped', ticks=tick)
+
+
+class WorldFeed:
+    """Background receiver: keeps the last few decoded snapshots, reconnecting as needed"""
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.info = None
+        self.snapshots = []     # (tick, float32 state), oldest first
+        self.lock = threading.Lock()
+        self.connected = threading.Event()
+        self.bytes = 0
+        self.messages = 0
+        self.generation = 0     # bumps on every (re)connect - ticks restart with the server
+        threading.Thread(target=self.run, name='world-feed', daemon=True).start()
+
+    def recv_exact(self, conn, n):
+        data = bytearray()
+        while len(data) < n:
+            chunk = conn.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("server closed the connection")
+            data += chunk
+        return data
+
+    def run(self):
+        while True:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=5) as conn:
+                    conn.settimeout(None)
+                    self.receive(conn)
+            except OSError as e:
+                if self.connected.is_set():
+                    log.warning("World feed lost: %s", e, event='feed_lost')
+            self.connected.clear()
+            time.sleep(RECONNECT_SECONDS)
+
+    def receive(self, conn):
+        state = None
+        while True:
+            body = self.recv_exact(conn, LENGTH.unpack(self.recv_exact(conn, LENGTH.size))[0])
+            self.bytes += LENGTH.size + len(body)
+            self.messages += 1
+            kind, tick = HEADER.unpack_from(body)
+            payload = memoryview(body)[HEADER.size:]
+
+            if kind == HELLO:
+                self.info = json.loads(bytes(payload))
+                with self.lock:
+                    self.snapshots = []
+                    self.generation += 1
+                self.connected.set()
+                log.info("World feed: %d screens of %dx%d", self.info['screens'], self.info['width'],
+                         self.info['height'], event='feed_info')
+                continue
+            if kind == KEYFRAME:
+                state = np.frombuffer(payload, dtype='>f4').astype(np.float32)
+            elif kind == DELTA and state is not None:
+                state = state.copy()
+                apply_delta(state, payload)
+            else:
+                continue
+            state[0] = tick  # float32 can't hold days of ticks exactly
+
+            with self.lock:
+                self.snapshots.append((tick, state))
+                del self.snapshots[:-8]
+
+    def recent(self):
+        with self.lock:
+            return self.generation, list(self.snapshots)
+
+
+class ScreenClient:
+    """Renders one screen-wide slice of the server's world, interpolating between updates"""
+    def __init__(self, shared, host='127.0.0.1', port=PORT, screen_index=0, seconds=None, screenshot=None):
+        self.shared = shared
+        self.screen = shared.screen
+        self.clock = shared.clock
+        self.screen_index = screen_index
+        self.deadline = time.monotonic() + seconds if seconds else None
+        self.screenshot = screenshot
+        self.frames = 0
+
+        self.feed = WorldFeed(host, port)
+        log.info("Waiting for world server %s:%d...", host, port, event='waiting_for_server')
+        from scenes import poll_quit
+        while not self.feed.connected.wait(0.5):
+            # SDL turns SIGTERM into a quit event, so keep pumping while we wait
+            if poll_quit() or (self.deadline and time.monotonic() > self.deadline):
+                raise SystemExit(f"No world server at {host}:{port}")
+        info = self.feed.info
+        if self.screen.get_size() != (info['width'], info['height']):
+            log.warning("Screen is %s, server slices are %dx%d", self.screen.get_size(), info['width'],
+                        info['height'], event='slice_mismatch')
+
+        import dog_park
+        # The wall's geometry, as the server built it - create_game then sizes the globals to our slice
+        world = make_world(info['width'], info['height'], info['screens'])
+        if world.state_size() != info['slots']:
+            raise SystemExit(f"World has {world.state_size()} state slots, server sends {info['slots']} - "
+                             "server and screens run different versions")
+        self.game = dog_park.create_game(shared.config, shared, world)
+        self.world = self.game.world
+        fields = np.array(self.world.state_fields())
+        self.is_x = fields == 'x'
+        self.smooth = np.isin(fields, ['x', 'y', 's'])
+        self.offset = screen_index * info['width']
+
+        # Server tick -> local clock, from the earliest arrival we've seen
+        self.tick_origin = None
+        self.generation = None
+
+    def render_state(self):
+        """State at (newest tick - INTERP_TICKS), lerped between the two snapshots around it"""
+        generation, snapshots = self.feed.recent()
+        if not snapshots:
+            return None
+        now = time.monotonic()
+        newest_tick = snapshots[-1][0]
+        origin = now - newest_tick / SIM_HZ
+        if generation != self.generation or origin < self.tick_origin:
+            self.generation = generation
+            self.tick_origin = origin
+        # Drift slowly toward later origins so a one-off early packet doesn't stick forever
+        self.tick_origin += 0.001 * (origin - self.tick_origin)
+        render_tick = (now - self.tick_origin) * SIM_HZ - INTERP_TICKS
+
+        older, newer = snapshots[0], snapshots[-1]
+        for a, b in zip(snapshots, snapshots[1:]):
+            if a[0] <= render_tick <= b[0]:
+                older, newer = a, b
+                break
+        else:
+            if render_tick >= newer[0]:
+                older = newer
+
+        if older is newer:
+            state = newer[1].astype(np.float64)
+        else:
+            t = (render_tick - older[0]) / (newer[0] - older[0])
+            a, b = older[1].astype(np.float64), newer[1].astype(np.float64)
+            state = b if t >= 0.5 else a.copy()
+            lerp = self.smooth & (np.abs(b - a) < SNAP_DISTANCE)
+            state[lerp] = a[lerp] + (b[lerp] - a[lerp]) * t
+        state[self.is_x] -= self.offset
+        return state
+
+    def update(self):
+        game = self.game
+        game.precipitation.set_condition(game.shared.weather['condition'])
+        game.precipitation.update()
+
+        state = self.render_state()
+        if state is not None:
+            self.world.unpack_state(state)
+            for dog in self.world.dogs:
+                dog.update_trail()
+
+        self.frames += 1
+        if self.deadline and time.monotonic() > self.deadline:
+            self.deadline = None
+            self.report()
+            import pygame
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def draw(self):
+        self.game.screen = self.screen
+        self.game.draw()
+
+    def report(self):
+        log.info("Screen %d: %d frames, %d messages, %.0fKB, dogs at %s", self.screen_index, self.frames,
+                 self.feed.messages, self.feed.bytes / 1024,
+                 ', '.join(f"{d.name} {d.x + self.offset:.0f}" for d in self.world.dogs), event='client_summary')
+        if self.screenshot:
+            import pygame
+            pygame.image.save(self.screen, self.screenshot)
+
+
+def run_client(args):
+    from scenes import SharedResources, run_scene
+    config = {'video_driver': args.driver}
+    if args.size:
+        config['size'] = parse_size(args.size)
+    shared = SharedResources(f"TREAT QUEST - screen {args.screen}", config)
+    run_scene(ScreenClient(shared, args.host, args.port, args.screen, args.seconds, args.screenshot))
+
+
+def run_demo(args):
+    """Server plus one client per screen on localhost, all headless"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    size = args.size or '960x540'
+    seconds = str(args.seconds or 10)
+    server = subprocess.Popen([sys.executable, os.path.join(here, 'multiscreen.py'), 'server',
+                               '--screens', str(args.screens), '--size', size,
+                               '--port', str(args.port), '--seconds', str(float(seconds) + 5)], env=env)
+    time.sleep(1.0)
+    clients = []
+    for i in range(args.screens):
+        cmd = [sys.executable, os.path.join(here, 'multiscreen.py'), 'client', '--screen', str(i),
+               '--port', str(args.port), '--size', size, '--driver', 'dummy', '--seconds', seconds]
+        if args.screenshot:
+            cmd += ['--screenshot', args.screenshot.replace('.png', f'-{i}.png')]
+        clients.append(subprocess.Popen(cmd, env=env))
+    # A server that dies early takes the clients with it
+    while any(c.poll() is None for c in clients):
+        if server.poll() is not None:
+            for c in clients:
+                c.terminate()
+        time.sleep(0.2)
+    codes = [c.wait() for c in clients]
+    server.terminate()
+    server.wait()
+    log.info("Demo finished, client exit codes %s", codes, event='demo_finished')
+
+
+def parse_size(spec):
+    return tuple(int(v) for v in spec.lower().split('x'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="One Treat Quest universe across several screens")
+    parser.add_argument('mode', choices=['server', 'client', 'demo'])
+    parser.add_argument('--screens', type=int, default=3, help="screens side by side (server/demo)")
+    parser.add_argument('--screen', type=int, default=0, help="which slice this client shows, 0 = leftmost")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--size', help="WxH of one screen (server slice / client window)")
+    parser.add_argument('--driver', help="SDL video driver for clients (default x11)")
+    parser.add_argument('--seconds', type=float, help="stop after this long")
+    parser.add_argument('--screenshot', help="client: save the last frame here on exit")
+    args = parser.parse_args()
+
+    if args.mode == 'server':
+        WorldServer(args.screens, parse_size(args.size or '1920x1080'), args.port).run(args.seconds)
+    elif args.mode == 'client':
+        run_client(args)
+    else:
+        run_demo(args)
@@ -0,0 +1,14 @@
+"""
+Treat Quest paths
+Where the game keeps things between runs - on its own so anything can import it
+without pulling in the subsystem that owns the files
+"""
+
+import os
+
+# Checkpoints, stats, heatmaps, captures - what should survive a reboot
+STATE_DIR = os.environ.get('TREATQUEST_STATE',
+                           os.path.join(os.path.expanduser('~'), '.local', 'state', 'treatquest'))
+# Baked sprite atlases - safe to delete, rebuilt on the next start
+CACHE_DIR = os.environ.get('TREATQUEST_CACHE',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'treatquest'))
@@ -0,0 +1,137 @@
+"""
+Treat Quest object pools
+Floating treats and asteroids kept as NumPy struct-of-arrays - integration,
+wraparound and respawn are whole-array operations, drawing touches only what's on screen
+"""
+
+import math
+import random
+
+import numpy as np
+import pygame
+
+ASTEROID_SIDES = 8
+ASTEROID_COLOR = (120, 110, 100)
+ASTEROID_EDGE = (80, 70, 60)
+CRATER_COLOR = (90, 80, 70)
+
+
+class TreatPool:
+    """Every floating treat: position, drift, spin, bob and whether it has been eaten
+
+    Position, rotation and bob sit side by side in one (capacity, 4) array with their
+    rates alongside, so a tick is a single multiply-add; x, y etc. are column views.
+    """
+    def __init__(self, width, height, capacity=16):
+        self.width = width
+        self.height = height
+        self.extent = np.array([width, height], dtype=float)
+        self.count = 0
+        self.state = np.zeros((capacity, 4))   # x, y, rotation, bob
+        self.rates = np.zeros((capacity, 4))   # vx, vy, rot_speed, bob speed
+        self.collected = np.zeros(capacity, dtype=bool)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.value = np.zeros(capacity, dtype=np.int32)
+        self.bind()
+
+    ARRAYS = ('state', 'rates', 'collected', 'kind', 'value')
+
+    def bind(self):
+        self.x, self.y, self.rotation, self.bob = self.state.T
+        self.vx, self.vy, self.rot_speed, _ = self.rates.T
+
+    def add(self, x, y, kind, value):
+        """New treat drifting from (x, y) - returns its index"""
+        if self.count == len(self.collected):
+            for name in self.ARRAYS:
+                old = getattr(self, name)
+                grown = np.zeros((len(old) * 2,) + old.shape[1:], dtype=old.dtype)
+                grown[:len(old)] = old
+                setattr(self, name, grown)
+            self.bind()
+        i = self.count
+        self.count += 1
+        self.state[i] = x, y, 0, random.random() * 6.28
+        self.rates[i] = random.uniform(-0.5, 0.5), random.uniform(-0.3, 0.3), random.uniform(-0.02, 0.02), 0.05
+        self.collected[i] = False
+        self.kind[i] = kind
+        self.value[i] = value
+        return i
+
+    def respawn(self, i):
+        self.collected[i] = False
+        self.x[i] = random.randint(100, self.width - 100)
+        self.y[i] = random.randint(100, self.height - 100)
+        self.vx[i] = random.uniform(-0.5, 0.5)
+        self.vy[i] = random.uniform(-0.3, 0.3)
+
+    def update(self):
+        n = self.count
+        # Eaten treats hold still until they respawn
+        self.state[:n] += self.rates[:n] * ~self.collected[:n, None]
+
+        # Wrap around
+        xy = self.state[:n, :2]
+        np.copyto(xy, self.extent, where=xy < 0)
+        np.copyto(xy, 0.0, where=xy > self.extent)
+
+    def visible(self, left, top, right, bottom, margin=40):
+        """Indices of uneaten treats inside a rectangle"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        inside = ((~self.collected[:n]) & (x > left - margin) & (x < right + margin)
+                  & (y > top - margin) & (y < bottom + margin))
+        return np.flatnonzero(inside)
+
+
+class AsteroidPool:
+    """Slowly tumbling rocks that drift down and come back in at the top"""
+    def __init__(self, width, height, count):
+        self.width = width
+        self.height = height
+        self.count = count
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        rng = self.rng
+        self.x = rng.integers(0, width, count, endpoint=True).astype(float)
+        self.y = rng.integers(-100, height // 2, count, endpoint=True).astype(float)
+        self.size = rng.integers(30, 80, count, endpoint=True)
+        self.vx = rng.uniform(-0.3, 0.3, count)
+        self.vy = rng.uniform(0.1, 0.5, count)
+        self.rotation = rng.random(count) * 6.28
+        self.rot_speed = rng.uniform(-0.01, 0.01, count)
+        # Irregular outline: one radius per side, fixed for the rock's life
+        angles = np.arange(ASTEROID_SIDES) * (2 * math.pi / ASTEROID_SIDES)
+        radius = self.size[:, None] * rng.uniform(0.7, 1.3, (count, ASTEROID_SIDES))
+        self.points = np.stack([np.cos(angles) * radius, np.sin(angles) * radius], axis=2)
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.rotation += self.rot_speed
+
+        gone = self.y > self.height + 100
+        if gone.any():
+            self.y[gone] = -100
+            self.x[gone] = self.rng.integers(0, self.width, int(gone.sum()), endpoint=True)
+
+    def visible(self, left, top, right, bottom):
+        reach = self.size * 1.3
+        return np.flatnonzero((self.x + reach > left) & (self.x - reach < right)
+                              & (self.y + reach > top) & (self.y - reach < bottom))
+
+    def draw(self, screen):
+        """Rotate every on-screen outline in one go, then one polygon per rock"""
+        w, h = screen.get_size()
+        idx = self.visible(0, 0, w, h)
+        if not len(idx):
+            return
+        cos_r = np.cos(self.rotation[idx])[:, None]
+        sin_r = np.sin(self.rotation[idx])[:, None]
+        px, py = self.points[idx, :, 0], self.points[idx, :, 1]
+        outlines = np.stack([px * cos_r - py * sin_r + self.x[idx, None],
+                             px * sin_r + py * cos_r + self.y[idx, None]], axis=2).tolist()
+        craters = np.stack([self.x[idx] - 5, self.y[idx] - 5], axis=1).astype(int).tolist()
+        for outline, crater in zip(outlines, craters):
+            pygame.draw.polygon(screen, ASTEROID_COLOR, outline)
+            pygame.draw.polygon(screen, ASTEROID_EDGE, outline, 2)
+            pygame.draw.circle(screen, CRATER_COLOR, crater, 8)
@@ -0,0 +1,150 @@
+"""
+Treat Quest precipitation engine
+Rain, solar rain and meteor storms kept as NumPy arrays and drawn in one batch
+"""
+
+import random
+
+import numpy as np
+import pygame
+
+# Weather condition -> look of the streaks
+# count: drops at full intensity, speed/length: ranges in px per frame / px,
+# slant: horizontal px per vertical px, ramp: drops added or removed per frame
+PRECIP_STYLES = {
+    'raining': {
+        'count': 100, 'speed': (8, 15), 'length': (10, 20), 'slant': -0.15,
+        'color': (150, 160, 180), 'head': None, 'ramp': 100,
+    },
+    'solar_rain': {
+        'count': 600, 'speed': (5, 10), 'length': (8, 18), 'slant': 0.1,
+        'color': (255, 190, 90), 'head': (255, 240, 200), 'ramp': 10,
+    },
+    'meteor_storm': {
+        'count': 2500, 'speed': (6, 14), 'length': (6, 30), 'slant': 0.6,
+        'color': (200, 110, 60), 'head': (255, 255, 220), 'ramp': 25,
+    },
+}
+
+COLORKEY = (255, 0, 255)
+
+
+def make_streak_stamps(style):
+    """Pre-render one streak surface per integer length"""
+    lo, hi = style['length']
+    slant = style['slant']
+    stamps = []
+    offsets = []
+    for length in range(lo, hi + 1):
+        dx = int(round(slant * length))
+        w, h = abs(dx) + 3, length + 3
+        surf = pygame.Surface((w, h))
+        surf.fill(COLORKEY)
+        surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        # Tail starts at the top, head is the leading (bottom) end
+        tail = (1 if dx >= 0 else w - 2, 1)
+        head = (tail[0] + dx, 1 + length)
+        pygame.draw.line(surf, style['color'], tail, head, 1)
+        if style['head']:
+            pygame.draw.circle(surf, style['head'], head, 1)
+        stamps.append(surf)
+        # Blit offset from the drop position (its head) to the stamp's top-left
+        offsets.append((-head[0], -head[1]))
+    return stamps, offsets
+
+
+class Precipitation:
+    """Vectorized rain/meteor field driven by the weather condition"""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        self.condition = None
+        self.style = None
+        self.target = 0
+        self.active = 0
+        self.stamps = []
+        self.offsets = []
+        self.x = np.zeros(0, dtype=np.float32)
+        self.y = np.zeros(0, dtype=np.float32)
+        self.speed = np.zeros(0, dtype=np.float32)
+        self.length_idx = np.zeros(0, dtype=np.int32)
+
+    def set_condition(self, condition):
+        """Switch style when the weather snapshot changes - cheap when it doesn't"""
+        if condition == self.condition:
+            return
+        self.condition = condition
+        style = PRECIP_STYLES.get(condition)
+        if style is None:
+            # Let the current drops drain out
+            self.target = 0
+            return
+        self.style = style
+        self.stamps, self.offsets = make_streak_stamps(style)
+        self.offsets = np.array(self.offsets, dtype=np.int32)
+        n = style['count']
+        lo, hi = style['speed']
+        self.speed = self.rng.uniform(lo, hi, n).astype(np.float32)
+        self.length_idx = self.rng.integers(0, len(self.stamps), n, dtype=np.int32)
+        self.x = np.zeros(n, dtype=np.float32)
+        self.y = np.zeros(n, dtype=np.float32)
+        self._respawn(np.ones(n, dtype=bool), spread=True)
+        self.active = min(self.active, n)
+        self.target = n
+
+    def _respawn(self, mask, spread=False):
+        count = int(mask.sum())
+        if count == 0:
+            return
+        slant = self.style['slant']
+        # Slanted streaks enter from beyond the side they drift away from
+        drift = slant * self.height
+        lo = min(0.0, -drift)
+        hi = self.width + max(0.0, -drift)
+        self.x[mask] = self.rng.uniform(lo, hi, count)
+        if spread:
+            self.y[mask] = self.rng.uniform(-self.height, 0, count)
+        else:
+            self.y[mask] = self.rng.uniform(-50, -10, count)
+
+    def update(self):
+        if self.style is None:
+            return
+        # Ramp intensity toward the weather target
+        ramp = self.style['ramp']
+        if self.active < self.target:
+            self.active = min(self.target, self.active + ramp)
+        elif self.active > self.target:
+            self.active = max(self.target, self.active - ramp)
+        if self.active == 0:
+            return
+
+        n = self.active
+        speed = self.speed[:n]
+        self.y[:n] += speed
+        self.x[:n] += speed * self.style['slant']
+
+        # Only the side a streak drifts toward can be left behind
+        slant = self.style['slant']
+        gone = self.y[:n] > self.height
+        if slant > 0:
+            gone |= self.x[:n] > self.width + 40
+        elif slant < 0:
+            gone |= self.x[:n] < -40
+        if gone.any():
+            mask = np.zeros(len(self.x), dtype=bool)
+            mask[:n] = gone
+            self._respawn(mask)
+
+    def draw(self, screen):
+        if self.active == 0:
+            return
+        n = self.active
+        idx = self.length_idx[:n]
+        offs = self.offsets[idx]
+        xs = (self.x[:n].astype(np.int32) + offs[:, 0]).tolist()
+        ys = (self.y[:n].astype(np.int32) + offs[:, 1]).tolist()
+        stamps = self.stamps
+        screen.blits([(stamps[i], (x, y)) for i, x, y in zip(idx.tolist(), xs, ys)],
+                     doreturn=False)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Treat Quest scene manager
+Runs every edition as a scene in one long-lived pygame process and
+rotates (with a crossfade) between them - no service restart, no black screen
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import pygame
+
+import gamelog
+from capture import Capture
+from governor import FrameGovernor
+from grading import ColorGrade
+from liveview import LiveView
+from startup import StartupProfile, init_fonts, init_video, merge_config, show_splash
+from watchdog import Watchdog
+from weather import refresh_weather, weather_cache
+
+FPS = 60
+
+log = gamelog.get('scenes')
+
+# Archived editions are importable as scenes too
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive')
+if ARCHIVE_DIR not in sys.path:
+    sys.path.append(ARCHIVE_DIR)
+
+# Scene name -> module with a create_game(config, shared) factory
+SCENES = {
+    'space': 'dog_park',
+    'park': 'dog_park_v2',
+    'platformer': 'main',
+}
+
+DEFAULT_ROTATION = [('space', 1200), ('park', 600), ('platformer', 300)]
+
+DISPLAY_MODES = [
+    (pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE, "Fullscreen HW"),
+    (pygame.FULLSCREEN | pygame.DOUBLEBUF, "Fullscreen DB"),
+    (pygame.FULLSCREEN, "Fullscreen"),
+    (0, "Windowed")
+]
+
+
+def open_display(size=None, fallback_size=(1920, 1080)):
+    """Open the fullscreen display, falling back through safer modes"""
+    if size:
+        # Fixed-size window - tests, tools and offscreen runs
+        return pygame.display.set_mode(size)
+    
+    for flags, name in DISPLAY_MODES:
+        try:
+            screen = pygame.display.set_mode((0, 0), flags)
+            log.info("Display mode: %s", name, event='display_mode', mode=name)
+            return screen
+        except Exception as e:
+            log.warning("%s failed: %s", name, e, event='display_mode_failed', mode=name, every=0)
+
+    log.warning("Fallback to fixed size", event='display_fallback')
+    return pygame.display.set_mode(fallback_size)
+
+
+class SharedResources:
+    """Display, clock, fonts and weather - opened once and handed to every scene"""
+    def __init__(self, caption="Treat Quest", config=None, profile=None):
+        self.config = merge_config(config)
+        self.profile = profile or StartupProfile()
+        
+        # Display first, so the splash is on screen before anything slow happens
+        init_video(self.config)
+        self.screen = open_display(self.config['size'])
+        pygame.display.set_caption(caption)
+        self.profile.mark('display')
+        show_splash(self.screen)
+        self.profile.mark('splash')
+        
+        self.clock = pygame.time.Clock()
+        self.fonts = {}
+
+    @property
+    def weather(self):
+        # Module-level cache, so every scene shares one fetch
+        return refresh_weather()
+
+    def font(self, size, fallback_size=None):
+        """Default font at size, or arial if it can't load - cached per size"""
+        key = (size, fallback_size)
+        if key not in self.fonts:
+            init_fonts()
+            try:
+                self.fonts[key] = pygame.font.Font(None, size)
+            except:
+                self.fonts[key] = pygame.font.SysFont('arial', fallback_size or size)
+        return self.fonts[key]
+
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.FINGERDOWN)
+
+
+def poll_quit(governor=None):
+    """Drain the event queue - True if we were asked to quit"""
+    quit_requested = False
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            quit_requested = True
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                quit_requested = True
+        if governor and event.type in INPUT_EVENTS:
+            governor.poke()
+    return quit_requested
+
+
+def run_scene(scene, fps=FPS):
+    """Standard loop for anything with update() and draw() - one edition or the manager
+
+    update() is a fixed 1/fps step; when the governor lowers the render rate,
+    several steps run per drawn frame so the game still keeps real time.
+    """
+    clock = scene.clock
+    profile = scene.shared.profile
+    governor = FrameGovernor(scene.shared.config, fps)
+    # Time-of-day mood over the finished frame, whichever edition drew it
+    grade = ColorGrade() if scene.shared.config['grading'] else None
+    config = scene.shared.config
+    watchdog = Watchdog(config['stall_seconds'], config['stall_exit']) if config['stall_seconds'] else None
+    # Screenshots and timelapse frames - a raw copy here, encoding in a worker process
+    capture = None
+    if config['capture']:
+        try:
+            capture = Capture(config, scene.shared.screen)
+        except (OSError, ValueError) as e:
+            log.warning("Frame capture unavailable: %s", e, event='capture_unavailable')
+    # MJPEG over HTTP for remote checks - nothing is copied while nobody watches
+    liveview = None
+    if config['liveview_port']:
+        try:
+            liveview = LiveView(config, scene.shared.screen)
+        except (OSError, ValueError) as e:
+            log.warning("Live view unavailable: %s", e, event='liveview_unavailable')
+
+    while not poll_quit(governor):
+        gamelog.next_frame()
+        frame_start = time.perf_counter()
+        render_fps = governor.rate()
+        if watchdog:
+            watchdog.phase('update')
+        for _ in range(governor.steps()):
+            scene.update()
+        if watchdog:
+            watchdog.phase('draw')
+        scene.draw()
+        if grade:
+            grade.apply(scene.shared.screen, weather_cache['condition'])
+        if capture:
+            capture.frame(scene.shared.screen)
+        if liveview:
+            liveview.frame(scene.shared.screen)
+        if watchdog:
+            watchdog.phase('flip')
+        pygame.display.flip()
+        if not profile.reported:
+            profile.mark('first frame')
+            profile.report()
+
+        # Spare time in this frame goes to background warm-up work
+        if watchdog:
+            watchdog.phase('idle')
+        idle = getattr(scene, 'idle', None)
+        if idle:
+            spent_ms = (time.perf_counter() - frame_start) * 1000
+            idle(1000 / render_fps - spent_ms)
+
+        clock.tick(render_fps)
+        if watchdog:
+            watchdog.beat()
+
+    if watchdog:
+        watchdog.close()
+    if capture:
+        capture.close()
+    if liveview:
+        liveview.close()
+    pygame.quit()
+    sys.exit()
+
+
+class SceneManager:
+    """Rotates between editions on a schedule, crossfading on every switch"""
+    def __init__(self, shared, rotation=DEFAULT_ROTATION, fade_seconds=2.0):
+        self.shared = shared
+        self.screen = shared.screen
+        self.clock = shared.clock
+        self.rotation = rotation
+        self.fade_seconds = fade_seconds
+        self.scenes = {}
+
+        self.index = 0
+        self.current = self.load(rotation[0][0])
+        self.scene_started = time.monotonic()
+
+        # Crossfade state - the incoming scene renders into its own buffer
+        self.incoming = None
+        self.fade_started = 0
+        self.fade_buffer = pygame.Surface(self.screen.get_size()).convert()
+
+        # Everything else in the rotation is built and warmed during idle frame time
+        self.warm_queue = []
+        for name, _ in rotation:
+            if name not in self.scenes and name not in self.warm_queue:
+                self.warm_queue.append(name)
+
+    def load(self, name):
+        if name not in self.scenes:
+            start = time.perf_counter()
+            module = importlib.import_module(SCENES[name])
+            self.scenes[name] = module.create_game(self.shared.config, self.shared)
+            ms = (time.perf_counter() - start) * 1000
+            log.info("Scene '%s' loaded in %.0fms", name, ms, event='scene_loaded', scene=name, ms=round(ms, 1))
+        return self.scenes[name]
+
+    def warm(self, name):
+        """Build a scene and render one throwaway frame so its caches are filled"""
+        scene = self.load(name)
+        scene.screen = self.fade_buffer
+        scene.update()
+        scene.draw()
+        scene.screen = self.screen
+
+    def idle(self, budget_ms):
+        # A scene build can take a frame or two, so only start one with real slack
+        if self.warm_queue and budget_ms > 4:
+            self.warm(self.warm_queue.pop(0))
+
+    def start_fade(self):
+        self.index = (self.index + 1) % len(self.rotation)
+        name = self.rotation[self.index][0]
+        if name in self.warm_queue:
+            self.warm_queue.remove(name)
+            self.warm(name)
+        self.incoming = self.load(name)
+        if self.incoming is self.current:
+            self.incoming = None
+            self.scene_started = time.monotonic()
+            return
+        self.incoming.screen = self.fade_buffer
+        self.fade_started = time.monotonic()
+        log.info("Rotating to '%s'", name, event='scene_rotate', scene=name)
+
+    def update(self):
+        now = time.monotonic()
+
+        if self.incoming is None:
+            if now - self.scene_started > self.rotation[self.index][1]:
+                self.start_fade()
+        elif now - self.fade_started >= self.fade_seconds:
+            # Fade finished - incoming scene takes over the display
+            self.incoming.screen = self.screen
+            self.current = self.incoming
+            self.incoming = None
+            self.scene_started = now
+
+        self.current.update()
+        if self.incoming:
+            self.incoming.update()
+
+    def draw(self):
+        self.current.draw()
+        if self.incoming:
+            self.incoming.draw()
+            t = (time.monotonic() - self.fade_started) / self.fade_seconds
+            self.fade_buffer.set_alpha(int(255 * min(1.0, t)))
+            self.screen.blit(self.fade_buffer, (0, 0))
+            self.fade_buffer.set_alpha(None)
+
+
+def parse_rotation(spec):
+    """'space:1200,park:600' -> [('space', 1200.0), ('park', 600.0)]"""
+    rotation = []
+    for item in spec.split(','):
+        name, _, seconds = item.partition(':')
+        if name not in SCENES:
+            raise ValueError(f"Unknown scene '{name}' (choose from {', '.join(SCENES)})")
+        rotation.append((name, float(seconds or 600)))
+    return rotation
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rotate between Treat Quest editions")
+    parser.add_argument('--rotate', default=','.join(f"{n}:{s}" for n, s in DEFAULT_ROTATION),
+                        help="scene:seconds list, e.g. space:1200,park:600,platformer:300")
+    parser.add_argument('--fade', type=float, default=2.0, help="crossfade seconds")
+    parser.add_argument('--size', help="windowed WxH instead of native fullscreen")
+    parser.add_argument('--driver', help="SDL video driver (default x11)")
+    parser.add_argument('--sim-process', action='store_true',
+                        help="step the Space Edition simulation in its own process")
+    parser.add_argument('--no-grading', action='store_true',
+                        help="skip the time-of-day colour grading")
+    parser.add_argument('--capture', action='store_true',
+                        help="screenshots on request and a daily timelapse (capture.py)")
+    parser.add_argument('--liveview', type=int, metavar='PORT',
+                        help="serve an MJPEG live view of the display on this port")
+    args = parser.parse_args()
+
+    config = {'video_driver': args.driver}
+    if args.sim_process:
+        config['sim_process'] = True
+    if args.no_grading:
+        config['grading'] = False
+    if args.capture:
+        config['capture'] = True
+    if args.liveview:
+        config['liveview_port'] = args.liveview
+    if args.size:
+        config['size'] = tuple(int(v) for v in args.size.lower().split('x'))
+
+    log.info("🚀 TREAT QUEST: Scene Rotation 🐕‍🦺", event='launch')
+    shared = SharedResources("TREAT QUEST", config)
+    run_scene(SceneManager(shared, parse_rotation(args.rotate), args.fade))
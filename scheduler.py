@@ -0,0 +1,60 @@
+"""
+Treat Quest scheduler
+Future events on the simulation clock - dormant actors sleep in a heap instead of
+counting down every frame, and wake exactly on the tick they asked for
+"""
+
+import heapq
+import itertools
+
+
+class Timer:
+    """Handle for one scheduled call - cancel() it, or read when it's due"""
+    __slots__ = ('due', 'name', 'callback', 'args', 'cancelled')
+
+    def __init__(self, due, name, callback, args):
+        self.due = due
+        self.name = name
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Min-heap of timers keyed on sim tick; cancelled timers are dropped lazily when popped"""
+    def __init__(self, now=0):
+        self.now = now
+        self.heap = []
+        self.order = itertools.count()  # equal ticks fire in the order they were scheduled
+
+    def schedule(self, delay, callback, *args, name=None):
+        """Call callback(*args) delay ticks from now (at least one tick)"""
+        timer = Timer(self.now + max(1, int(delay)), name or callback.__name__, callback, args)
+        heapq.heappush(self.heap, (timer.due, next(self.order), timer))
+        return timer
+
+    def advance(self, ticks=1):
+        """Move the clock forward and fire everything that is due - O(1) when nothing is"""
+        self.now += ticks
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            timer = heapq.heappop(heap)[2]
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+
+    def pending(self):
+        """Live timers, soonest first"""
+        return [timer for _, _, timer in sorted(self.heap) if not timer.cancelled]
+
+    def dump(self, fps=60):
+        lines = [f"Schedule at tick {self.now}:"]
+        for timer in self.pending():
+            ticks = timer.due - self.now
+            lines.append(f"  in {ticks:6d} ticks ({ticks / fps:6.1f}s)  {timer.name}")
+        return '\n'.join(lines)
+
+    def __len__(self):
+        return len(self.heap)
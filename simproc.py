@@ -0,0 +1,148 @@
+"""
+Treat Quest simulation process
+Runs a world's step() in its own process at a steady rate and publishes a
+double-buffered snapshot through shared memory - the display process only renders
+"""
+
+import atexit
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import gamelog
+
+log = gamelog.get('simproc')
+
+SIM_HZ = 60
+
+# Header slots (int64): which buffer is newest, snapshots published, stop flag
+LATEST, PUBLISHED, STOP = range(3)
+HEADER_SLOTS = 4
+
+
+class SnapshotBuffer:
+    """Two float64 snapshot buffers plus a small header in one shared memory block
+
+    The writer fills the buffer readers are not pointed at without locking, then
+    points LATEST at it under the lock; readers copy the LATEST buffer under the
+    same lock. The lock is what orders the stores between processes - plain
+    numpy stores to shared memory can become visible out of order on ARM - and
+    the writer only ever waits for one reader's copy, at the swap.
+    """
+    def __init__(self, size, lock, name=None):
+        self.size = size
+        self.lock = lock
+        nbytes = HEADER_SLOTS * 8 + 2 * size * 8
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        self.buffers = np.ndarray((2, size), dtype=np.float64, buffer=self.shm.buf, offset=HEADER_SLOTS * 8)
+        if self.owner:
+            self.header[:] = 0
+            self.header[LATEST] = -1  # nothing published yet
+
+    def publish(self, state):
+        # Only this process changes LATEST, so the other buffer is ours to fill -
+        # a reader still copying it held the lock through the last swap
+        target = 1 - max(0, int(self.header[LATEST]))
+        self.buffers[target][:] = state
+        with self.lock:
+            self.header[LATEST] = target
+            self.header[PUBLISHED] += 1
+
+    def read(self, out):
+        """Copy the newest complete snapshot into out - False if none is published yet"""
+        with self.lock:
+            latest = int(self.header[LATEST])
+            if latest < 0:
+                return False
+            out[:] = self.buffers[latest]
+        return True
+
+    @property
+    def stopped(self):
+        return bool(self.header[STOP])
+
+    def stop(self):
+        self.header[STOP] = 1
+
+    def close(self):
+        # Views have to go before the mapping can be closed
+        del self.header, self.buffers
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def sim_loop(world, snapshot_name, lock, hz, parent_pid):
+    """Child process: step the world at a fixed rate and publish every tick"""
+    if hasattr(world, 'attach'):
+        world.attach()
+    snapshot = SnapshotBuffer(world.state_size(), lock, snapshot_name)
+    state = np.zeros(world.state_size())
+    step = 1.0 / hz
+    next_tick = time.perf_counter()
+
+    # Stop when asked, or when the display process is gone
+    while not snapshot.stopped and os.getppid() == parent_pid:
+        world.step()
+        world.pack_state(state)
+        snapshot.publish(state)
+
+        next_tick += step
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -0.25:
+            # Fell far behind (suspended, swapped) - don't try to catch up in a burst
+            next_tick = time.perf_counter()
+
+    snapshot.close()
+
+
+class SimProcess:
+    """Owns the shared snapshot and the child that steps the world
+
+    The world object needs step(), state_size(), pack_state(out) and
+    unpack_state(state), plus an optional attach() run once in the child.
+    """
+    def __init__(self, world, hz=SIM_HZ):
+        self.world = world
+        self.state = np.zeros(world.state_size())
+        # spawn, not fork - the child must not inherit our X11 connection
+        context = multiprocessing.get_context('spawn')
+        self.snapshot = SnapshotBuffer(world.state_size(), context.Lock())
+        self.process = context.Process(target=sim_loop, name='treatquest-sim', daemon=True,
+                                       args=(world, self.snapshot.name, self.snapshot.lock, hz, os.getpid()))
+        self.process.start()
+        # Stop the child and free the shared block however the display process exits
+        atexit.register(self.close)
+        log.info("Simulation process %d at %dHz", self.process.pid, hz, event='sim_process_started', hz=hz)
+
+    def read(self):
+        """Apply the newest snapshot to the local world - False until the child publishes"""
+        if not self.snapshot.read(self.state):
+            return False
+        self.world.unpack_state(self.state)
+        return True
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    def close(self):
+        if self.snapshot is None:
+            return
+        self.snapshot.stop()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.snapshot.close()
+        self.snapshot = None
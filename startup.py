@@ -0,0 +1,135 @@
+"""
+Treat Quest startup
+Measured, lazy startup: only the SDL subsystems we use, a splash as the first frame,
+and a timing breakdown from exec to first frame
+"""
+
+import os
+import time
+
+import pygame
+
+import gamelog
+
+log = gamelog.get('startup')
+
+FIRST_FRAME_TARGET = 1.0  # seconds after exec
+
+DEFAULT_CONFIG = {
+    'video_driver': None,   # None = keep SDL_VIDEODRIVER from the environment, else x11
+    'size': None,           # None = native fullscreen, else (w, h)
+    'atlas': True,          # baked sprite atlas (False = always draw procedurally)
+    'asteroids': 6,         # Space Edition rocks per screen - thousands for an asteroid field
+    'grading': True,        # time-of-day/weather colour grading over every frame
+    # Power saving: render at idle_fps during quiet hours (local, may wrap midnight)
+    # or idle_after seconds without input (None = ignore input)
+    'quiet_hours': (1, 6),
+    'idle_fps': 10,
+    'idle_after': None,
+    # Watchdog: a frame stuck this long dumps every stack (and exits if stall_exit) - 0 = off
+    'stall_seconds': 15,
+    'stall_exit': True,
+    # Space Edition saves its world this often and resumes it after a restart - 0 = off
+    'checkpoint_seconds': 10,
+    'stats': True,          # lifetime event log + all-time leaderboard (stats.py)
+    'analytics': True,      # dog/treat heatmaps, saved for offline tuning (analytics.py)
+    'heatmap': False,       # show the heatmap overlay from the start (kill -USR2 toggles it)
+    # Frame capture (capture.py): screenshots on request, plus a downscaled timelapse
+    # frame every capture_interval seconds (0 = screenshots only), kept capture_keep_days.
+    # Off by default - a worker process, three full frames of shared memory (~25MB at
+    # 1080p) and a steady trickle of SD-card writes
+    'capture': os.environ.get('TREATQUEST_CAPTURE') == '1',
+    'capture_interval': 120,
+    'capture_width': 480,
+    'capture_format': 'jpg',  # 'jpg'/'png' file per frame, or 'raw' rgb24 stream per day
+    'capture_keep_days': 3,
+    # Live view (liveview.py): MJPEG of the display over HTTP on this port - None = off
+    'liveview_port': int(os.environ['TREATQUEST_LIVEVIEW']) if os.environ.get('TREATQUEST_LIVEVIEW') else None,
+    'liveview_bind': '0.0.0.0',
+    'liveview_fps': 5,
+    'liveview_width': 960,
+    # Step the simulation in its own process (multi-core Pis)
+    'sim_process': os.environ.get('TREATQUEST_SIM_PROCESS') == '1',
+}
+
+
+def process_age():
+    """Seconds since this process was exec'd (Linux /proc), None elsewhere"""
+    try:
+        with open('/proc/self/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        start_ticks = int(fields[19])  # field 22 (starttime), counted after comm
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfile:
+    """Wall-clock phases from exec to the first game frame"""
+    def __init__(self):
+        age = process_age()
+        now = time.perf_counter()
+        self.t0 = now - (age or 0.0)
+        self.last = self.t0
+        self.phases = []
+        self.reported = False
+        # Interpreter start + imports happened before we could measure anything
+        self.mark('python+imports')
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def elapsed(self):
+        return time.perf_counter() - self.t0
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        parts = ', '.join(f"{name} {sec * 1000:.0f}ms" for name, sec in self.phases)
+        total = self.elapsed()
+        log.info("Startup: %s | first frame %.2fs after exec", parts, total, event='startup',
+                 phases={name: round(sec * 1000, 1) for name, sec in self.phases}, seconds=round(total, 3))
+        if total > FIRST_FRAME_TARGET:
+            slowest = max(self.phases, key=lambda p: p[1])
+            log.warning("Startup over %.1fs target - slowest phase: %s", FIRST_FRAME_TARGET, slowest[0],
+                        event='startup_slow', phase=slowest[0])
+
+
+def merge_config(config):
+    merged = dict(DEFAULT_CONFIG)
+    merged.update(config or {})
+    return merged
+
+
+def init_video(config):
+    """Bring up only the display subsystem - no audio, joystick or mixer"""
+    driver = config.get('video_driver')
+    if driver:
+        os.environ['SDL_VIDEODRIVER'] = driver
+    else:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'x11')
+    pygame.display.init()
+
+
+def init_fonts():
+    # Deferred until the first font is asked for
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def show_splash(screen):
+    """Cheap first frame - no fonts needed, just a golden bone on deep space"""
+    screen.fill((10, 15, 35))
+    w, h = screen.get_size()
+    cx, cy = w // 2, h // 2
+    gold = (255, 200, 50)
+    pygame.draw.ellipse(screen, gold, (cx - 56, cy - 20, 112, 40))
+    for dx in (-48, 48):
+        for dy in (-16, 16):
+            pygame.draw.circle(screen, gold, (cx + dx, cy + dy), 24)
+    pygame.display.flip()
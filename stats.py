@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Treat Quest lifetime stats
+Every treat, snack, acorn, theft and spawn goes into a local SQLite event log.
+Events are batched in memory and written by a background thread (WAL, one
+transaction per batch), which also keeps daily and all-time totals up to date
+so the leaderboard never scans raw events.
+
+    python3 stats.py            # all-time leaderboard, today and this week
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import gamelog
+from paths import STATE_DIR
+
+log = gamelog.get('stats')
+
+DB_PATH = os.path.join(STATE_DIR, 'stats.db')
+FLUSH_SECONDS = 2.0
+REFRESH_SECONDS = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    who TEXT NOT NULL,
+    what TEXT NOT NULL DEFAULT '',
+    points INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    who TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    what TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (day, who, kind, what)
+);
+CREATE TABLE IF NOT EXISTS totals (
+    who TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (who, kind)
+);
+"""
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path, timeout=5)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+def day_of(at):
+    return time.strftime('%Y-%m-%d', time.localtime(at))
+
+
+def read_leaderboard(db):
+    """[(who, points, count)] for the dogs by points, then Bestie's thefts, from the totals table"""
+    rows = db.execute("SELECT who, SUM(points), SUM(count) FROM totals WHERE kind != 'spawn' AND kind != 'theft' "
+                      "GROUP BY who ORDER BY SUM(points) DESC").fetchall()
+    thefts = db.execute("SELECT who, SUM(points), SUM(count) FROM totals WHERE kind = 'theft' GROUP BY who").fetchall()
+    return rows + thefts
+
+
+def summary(days=1, path=DB_PATH):
+    """Per (who, kind, what) count and points over the last `days` local days, from the daily table"""
+    first = day_of(time.time() - (days - 1) * 86400)
+    with connect(path) as db:
+        return db.execute("SELECT who, kind, what, SUM(count), SUM(points) FROM daily WHERE day >= ? "
+                          "GROUP BY who, kind, what ORDER BY who, kind, what", (first,)).fetchall()
+
+
+class StatsStore:
+    """Write-behind event log - record() just appends, a background thread does the SQL"""
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.pending = []
+        self.leaderboard = []   # refreshed by the thread, safe to read every frame
+        self.generation = 0     # bumps when the leaderboard changes
+        self.thread = None
+
+    def __getstate__(self):
+        # Goes to the sim process with the world - the writer thread stays behind
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.writer, name='stats', daemon=True)
+            self.thread.start()
+
+    def record(self, kind, who, what='', points=0):
+        self.pending.append((time.time(), kind, who, what or '', int(points)))
+        self.start()
+
+    def writer(self):
+        try:
+            db = connect(self.path)
+        except sqlite3.Error as e:
+            log.warning("Stats disabled: %s", e, event='stats_disabled')
+            return
+        refreshed = 0
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            try:
+                flushed = self.flush(db)
+                if flushed or time.monotonic() - refreshed > REFRESH_SECONDS:
+                    board = read_leaderboard(db)
+                    if board != self.leaderboard:
+                        self.leaderboard = board
+                        self.generation += 1
+                    refreshed = time.monotonic()
+            except sqlite3.Error as e:
+                log.warning("Stats write failed: %s", e, event='stats_error')
+
+    def flush(self, db):
+        """One transaction for the whole batch: raw events plus both aggregate tables"""
+        batch, self.pending = self.pending, []
+        if not batch:
+            return 0
+        with db:
+            db.executemany("INSERT INTO events (at, kind, who, what, points) VALUES (?, ?, ?, ?, ?)", batch)
+            db.executemany("INSERT INTO daily VALUES (?, ?, ?, ?, 1, ?) ON CONFLICT (day, who, kind, what) "
+                           "DO UPDATE SET count = count + 1, points = points + excluded.points",
+                           [(day_of(at), who, kind, what, points) for at, kind, who, what, points in batch])
+            db.executemany("INSERT INTO totals VALUES (?, ?, 1, ?) ON CONFLICT (who, kind) "
+                           "DO UPDATE SET count = count + 1, points = points + excluded.points",
+                           [(who, kind, points) for _, kind, who, _, points in batch])
+        return len(batch)
+
+
+if __name__ == "__main__":
+    with connect() as db:
+        board = read_leaderboard(db)
+    print("All-time leaderboard:")
+    for who, points, count in board:
+        print(f"  {who:10s} {points:8d} points  {count:6d} events")
+    for title, days in (("Today", 1), ("Last 7 days", 7)):
+        print(f"{title}:")
+        for who, kind, what, count, points in summary(days):
+            print(f"  {who:10s} {kind:7s} {what:12s} x{count:<5d} {points:6d} points")
@@ -0,0 +1,88 @@
+"""
+Treat Quest steering field
+One coarse attraction/repulsion grid per tick, shared by every dog: treats pull,
+dogs and Bestie push, and each dog just looks up the slope under its nose
+"""
+
+import math
+
+import numpy as np
+
+CELL = 40                # px per grid cell
+TREAT_REACH = 220        # px - Gaussian width of a treat's pull (about the old 500px scan)
+DOG_REACH = 160          # px - dogs spread out instead of chasing the same treat
+DOG_PUSH = 1.5
+BESTIE_REACH = 240       # px - nobody wants to be near Bestie
+BESTIE_PUSH = 6.0
+DOG_SOURCE = (-DOG_PUSH, DOG_REACH)
+
+
+class SteeringField:
+    """Potential on a coarse grid, rebuilt with NumPy only when its inputs move"""
+    def __init__(self, width, height, cell=CELL):
+        self.cell = cell
+        self.cols = width // cell + 1
+        self.rows = height // cell + 1
+        # Cell centres
+        self.xs = (np.arange(self.cols) + 0.5) * cell
+        self.ys = (np.arange(self.rows) + 0.5) * cell
+        self.grad_x = np.zeros((self.rows, self.cols))
+        self.grad_y = np.zeros((self.rows, self.cols))
+        self.key = None
+        self.builds = 0
+
+    def update(self, sources):
+        """sources: (x, y, weight, reach) - positive weight attracts, negative repels"""
+        # Sources quantized to the grid - drifting within a cell reuses the last field
+        cell = self.cell
+        key = tuple((int(x // cell), int(y // cell), weight, reach) for x, y, weight, reach in sources)
+        if key == self.key:
+            return
+        self.key = key
+        self.builds += 1
+        if not sources:
+            self.grad_x[:] = 0
+            self.grad_y[:] = 0
+            return
+
+        src = np.array(sources, dtype=float)
+        x, y, weight, reach = src[:, 0:1], src[:, 1:2], src[:, 2:3], src[:, 3:4]
+        # Gaussians are separable, so the potential is one (rows x n) @ (n x cols) product,
+        # and its slope is the same product with one factor differentiated
+        dx = self.xs - x
+        dy = self.ys - y
+        inv = 1.0 / (reach * reach)
+        along_x = weight * np.exp(-0.5 * dx * dx * inv)
+        along_y = np.exp(-0.5 * dy * dy * inv)
+        self.grad_x = along_y.T @ (along_x * dx * -inv)
+        self.grad_y = (along_y * dy * -inv).T @ along_x
+
+    def sample(self, x, y, own=None):
+        """Uphill direction at a point (gx, gy) - nearest cell, clamped to the grid
+
+        own: (weight, reach) of a source sitting at (x, y). Its slope is zero at the
+        point itself but not at the cell centre we read, so that part is taken back out.
+        """
+        col = min(max(int(x // self.cell), 0), self.cols - 1)
+        row = min(max(int(y // self.cell), 0), self.rows - 1)
+        gx, gy = float(self.grad_x[row, col]), float(self.grad_y[row, col])
+        if own:
+            weight, reach = own
+            dx, dy = (col + 0.5) * self.cell - x, (row + 0.5) * self.cell - y
+            falloff = weight * math.exp(-(dx * dx + dy * dy) / (2 * reach * reach)) / (reach * reach)
+            gx += falloff * dx
+            gy += falloff * dy
+        return gx, gy
+
+
+def space_sources(treat_pool, dogs, bestie):
+    """Field inputs for the Space Edition"""
+    n = treat_pool.count
+    live = ~treat_pool.collected[:n]
+    sources = [(x, y, value, TREAT_REACH) for x, y, value in zip(
+        treat_pool.x[:n][live].tolist(), treat_pool.y[:n][live].tolist(), treat_pool.value[:n][live].tolist())]
+    # Every dog is in the one shared field; each samples with own=DOG_SOURCE
+    sources += [(d.x, d.y, -DOG_PUSH, DOG_REACH) for d in dogs]
+    if bestie.active:
+        sources.append((bestie.x, bestie.y, -BESTIE_PUSH, BESTIE_REACH))
+    return sources
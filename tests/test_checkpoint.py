@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointStore
+
+
+def test_save_keeps_unrelated_files(tmp_path):
+    (tmp_path / 'space-heatmap.npz').write_bytes(b'not a checkpoint section')
+    (tmp_path / 'heatmap-space.npz').write_bytes(b'analytics')
+    store = CheckpointStore('space', str(tmp_path))
+    store.save({'scores': {'harley': 1}, 'grid': np.zeros(4)})
+    store.save({'scores': {'harley': 2}, 'grid': np.ones(4)})
+    assert (tmp_path / 'space-heatmap.npz').exists()
+    assert (tmp_path / 'heatmap-space.npz').exists()
+
+
+def test_save_prunes_replaced_sections(tmp_path):
+    store = CheckpointStore('space', str(tmp_path))
+    store.save({'scores': {'harley': 1}})
+    first = set(os.listdir(tmp_path))
+    store.save({'scores': {'harley': 2}})
+    sections = [f for f in os.listdir(tmp_path) if f.startswith('space-scores-')]
+    assert len(sections) == 1 and sections[0] not in first
+    assert store.load() == {'scores': {'harley': 2}}
@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import golden_frames
+
+
+def test_every_edition_matches_its_goldens(tmp_path):
+    passed, report = golden_frames.check(list(golden_frames.CASES), golden_frames.CAPTURE_TICKS, golden_frames.SIZE,
+                                         str(tmp_path), golden_frames.GOLDEN_DIR, golden_frames.TOLERANCE)
+    failed = {name: [(f['tick'], f['status'], f.get('solid'), f.get('diff')) for f in case['frames'] if f['status'] != 'ok']
+              for name, case in report['cases'].items() if not case['passed']}
+    assert passed, f"frames changed (re-record with golden_frames.py --update if intended): {failed}"
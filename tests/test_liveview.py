@@ -0,0 +1,77 @@
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import pygame
+
+from capture import WANTED, FrameRing
+from liveview import SLOTS, liveview_server
+
+SIZE = (320, 180)
+
+
+def feed_until(ring, surface, done, timeout=10.0):
+    """Play the game's part: put a frame whenever the server wants one, until done()"""
+    deadline = time.monotonic() + timeout
+    while not done():
+        assert time.monotonic() < deadline, "timed out"
+        if ring.header[WANTED]:
+            ring.put(surface, 0)
+        time.sleep(0.02)
+
+
+def test_liveview_over_localhost():
+    surface = pygame.Surface(SIZE, 0, 32)
+    surface.fill((200, 40, 40))
+    geometry = (SIZE[0], SIZE[1], surface.get_pitch(), surface.get_shifts())
+    frame_bytes = surface.get_pitch() * SIZE[1]
+    ring = FrameRing(frame_bytes, SLOTS)
+    settings = {'bind': '127.0.0.1', 'port': 0, 'fps': 10, 'width': 320}
+    context = multiprocessing.get_context('spawn')
+    ready, ready_child = context.Pipe()
+    server = context.Process(target=liveview_server, daemon=True,
+                             args=(ring.name, frame_bytes, geometry, settings, os.getpid(), ready_child))
+    server.start()
+    try:
+        assert ready.poll(30), "live view server didn't start"
+        port = ready.recv()
+        url = f"http://127.0.0.1:{port}"
+
+        with urllib.request.urlopen(f"{url}/status", timeout=5) as reply:
+            status = json.load(reply)
+        assert status['viewers'] == 0 and status['frames'] == 0
+        assert ring.header[WANTED] == 0
+
+        got = {}
+        def fetch():
+            with urllib.request.urlopen(f"{url}/frame.jpg", timeout=10) as reply:
+                got['type'], got['jpeg'] = reply.headers['Content-Type'], reply.read()
+        client = threading.Thread(target=fetch)
+        client.start()
+        feed_until(ring, surface, lambda: not client.is_alive())
+        assert got['type'] == 'image/jpeg' and got['jpeg'][:2] == b'\xff\xd8'
+        assert ring.header[WANTED] == 0
+
+        def watch():
+            with urllib.request.urlopen(f"{url}/stream", timeout=10) as stream:
+                got['part'] = stream.readline() + stream.readline()
+        client = threading.Thread(target=watch)
+        client.start()
+        feed_until(ring, surface, lambda: not client.is_alive())
+        assert got['part'].startswith(b'--treatquestframe') and b'image/jpeg' in got['part']
+        # The server notices the disconnect on its next write
+        feed_until(ring, surface, lambda: ring.header[WANTED] == 0)
+        with urllib.request.urlopen(f"{url}/status", timeout=5) as reply:
+            status = json.load(reply)
+        assert status['viewers'] == 0 and status['frames'] >= 2 and status['sent'] >= 1
+    finally:
+        ring.stop()
+        server.join(timeout=5)
+        ring.close()
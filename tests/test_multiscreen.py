@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import dog_park
+from multiscreen import KEYFRAME_TICKS, ScreenClient, WorldFeed, WorldServer, apply_delta, encode_delta
+
+SIZE = (1280, 720)
+SCREENS = 2
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_delta_round_trip_past_16_bit_indices():
+    before = np.zeros(100000, dtype=np.float32)
+    after = before.copy()
+    after[[3, 70000, 99999]] = (1.5, -2.0, 3.25)
+    state = before.copy()
+    apply_delta(state, encode_delta(before, after))
+    assert (state == after).all()
+
+
+def test_keyframe_then_deltas_reproduce_server_state():
+    server = WorldServer(SCREENS, SIZE, port=0, host='127.0.0.1')
+    port = server.listener.getsockname()[1]
+    feed = WorldFeed('127.0.0.1', port)
+    running = threading.Thread(target=server.run, args=(2.0,), daemon=True)
+    running.start()
+    running.join()
+    assert server.world.ticks < KEYFRAME_TICKS  # one keyframe, everything after it deltas
+
+    def caught_up():
+        _, snapshots = feed.recent()
+        # Slot 0 is the tick, which the feed writes in itself
+        return snapshots and (snapshots[-1][1][1:] == server.sent[1:]).all()
+    wait_for(caught_up)
+    assert feed.info == {'screens': SCREENS, 'width': SIZE[0], 'height': SIZE[1],
+                         'slots': int(server.state.size), 'hz': feed.info['hz']}
+    assert feed.messages > 3
+
+
+def test_screen_client_builds_the_wall_sized_world():
+    from scenes import SharedResources
+    server = WorldServer(SCREENS, SIZE, port=0, host='127.0.0.1')
+    port = server.listener.getsockname()[1]
+    threading.Thread(target=server.run, args=(3.0,), daemon=True).start()
+    # Whatever the module was last sized for must not leak into the client's world
+    dog_park.SCREEN_WIDTH, dog_park.SCREEN_HEIGHT = 1920, 1080
+    shared = SharedResources("multiscreen test", {'video_driver': 'dummy', 'size': SIZE, 'atlas': False,
+                                                  'stats': False, 'analytics': False, 'checkpoint_seconds': 0})
+    client = ScreenClient(shared, '127.0.0.1', port, screen_index=1, seconds=5)
+    assert (client.world.width, client.world.height) == (SIZE[0] * SCREENS, SIZE[1])
+    assert (dog_park.SCREEN_WIDTH, dog_park.SCREEN_HEIGHT) == SIZE
@@ -0,0 +1,43 @@
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simproc import SnapshotBuffer
+
+SIZE = 4096
+PUBLISHES = 20000
+
+
+def publish_counters(name, lock):
+    snapshot = SnapshotBuffer(SIZE, lock, name)
+    state = np.zeros(SIZE)
+    for i in range(1, PUBLISHES + 1):
+        state[:] = i
+        snapshot.publish(state)
+    snapshot.close()
+
+
+def test_reads_are_never_torn():
+    # Every snapshot is one counter value in every slot - a torn read mixes two
+    context = multiprocessing.get_context('spawn')
+    snapshot = SnapshotBuffer(SIZE, context.Lock())
+    child = context.Process(target=publish_counters, args=(snapshot.name, snapshot.lock))
+    child.start()
+    out = np.zeros(SIZE)
+    last = 0
+    try:
+        while child.is_alive():
+            if not snapshot.read(out):
+                continue
+            assert (out == out[0]).all(), f"torn snapshot: {np.unique(out)[:8]}"
+            assert out[0] >= last
+            last = out[0]
+        child.join()
+        assert child.exitcode == 0
+        assert snapshot.read(out) and out[0] == PUBLISHES
+    finally:
+        snapshot.close()
@@ -0,0 +1,116 @@
+import json
+import os
+import socketserver
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import weather
+from weather_daemon import SnapshotHandler, Upstream, WeatherDaemon
+
+LOCATION = (27.95, -82.46)
+ETAG = '"storm-1"'
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Open-Meteo stand-in: a thunderstorm, with an ETag it honours"""
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match'), self.client_address[1]))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'current': {'weather_code': 95, 'temperature_2m': 81.4}}).encode()
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+    server.daemon_threads = True
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def serve(daemon, path):
+    server = socketserver.ThreadingUnixStreamServer(path, SnapshotHandler)
+    server.daemon_threads = True
+    server.weather = daemon
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_one_fetch_per_interval_then_conditional(upstream, tmp_path):
+    daemon = WeatherDaemon(Upstream(f"http://127.0.0.1:{upstream.server_address[1]}"),
+                           str(tmp_path / 'cache.json'), interval=600)
+    path = str(tmp_path / 'weather.sock')
+    server = serve(daemon, path)
+    try:
+        replies = []
+        asks = [threading.Thread(target=lambda: replies.append(weather.ask_daemon(LOCATION, path)))
+                for _ in range(8)]
+        for ask in asks:
+            ask.start()
+        for ask in asks:
+            ask.join()
+        assert [r['condition'] for r in replies] == ['meteor_storm'] * 8
+        assert replies[0]['temp'] == 81
+        assert len(upstream.requests) == 1
+        assert upstream.requests[0][0].startswith('/v1/forecast?latitude=27.95&longitude=-82.46')
+        assert upstream.requests[0][1] is None
+
+        # Past the interval: a conditional request on the same connection, answered 304
+        daemon.locations['27.95,-82.46'].fetched_at -= 601
+        assert weather.ask_daemon(LOCATION, path)['condition'] == 'meteor_storm'
+        assert len(upstream.requests) == 2
+        assert upstream.requests[1][1] == ETAG
+        assert upstream.requests[1][2] == upstream.requests[0][2]
+        assert daemon.counts['fetched'] == 1 and daemon.counts['not_modified'] == 1
+        assert daemon.upstream.connects == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cache_survives_restart(upstream, tmp_path):
+    base = f"http://127.0.0.1:{upstream.server_address[1]}"
+    cache = str(tmp_path / 'cache.json')
+    WeatherDaemon(Upstream(base), cache).snapshot(LOCATION)
+    assert len(upstream.requests) == 1
+
+    restarted = WeatherDaemon(Upstream(base), cache)
+    snapshot = restarted.snapshot(LOCATION)
+    assert snapshot['condition'] == 'meteor_storm' and not snapshot['stale']
+    assert len(upstream.requests) == 1
+    assert restarted.locations['27.95,-82.46'].etag == ETAG
+
+
+def test_no_daemon_falls_back(tmp_path, monkeypatch):
+    assert weather.ask_daemon(LOCATION, str(tmp_path / 'missing.sock')) is None
+
+    monkeypatch.setattr(weather, 'DAEMON_SOCKET', str(tmp_path / 'missing.sock'))
+    monkeypatch.setattr(weather, 'fetch_direct', lambda location: {'condition': 'nebula', 'temp': 70})
+    for key, value in weather.weather_cache.items():
+        monkeypatch.setitem(weather.weather_cache, key, value)
+    monkeypatch.setitem(weather.weather_cache, 'last_update', None)
+    weather.get_tampa_weather(LOCATION)
+    assert weather.weather_cache['condition'] == 'nebula'
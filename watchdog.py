@@ -0,0 +1,116 @@
+"""
+Treat Quest watchdog
+The game loop beats once per frame. A background thread passes the beat on to
+systemd's watchdog while it is fresh, and on a stall dumps every thread's stack
+and the last frame's phase timings to the journal - then exits so systemd restarts us
+"""
+
+import faulthandler
+import os
+import socket
+import sys
+import threading
+import time
+
+import gamelog
+
+log = gamelog.get('watchdog')
+
+STALL_SECONDS = 15
+# C-level backstop for stalls that hold the GIL (the watchdog thread can't run then)
+BACKSTOP_FACTOR = 2
+REARM_SECONDS = 1.0
+
+
+def sd_notify(message):
+    """Send a state line to systemd (READY=1, WATCHDOG=1, STATUS=...) - no-op outside systemd"""
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return False
+    if address.startswith('@'):
+        address = '\0' + address[1:]  # abstract namespace
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(message.encode(), address)
+        return True
+    except OSError:
+        return False
+
+
+def ping_interval():
+    """Half of systemd's WatchdogSec if it is watching this process, else once a second"""
+    try:
+        usec = int(os.environ['WATCHDOG_USEC'])
+        pid = os.environ.get('WATCHDOG_PID')
+        if pid is None or int(pid) == os.getpid():
+            return usec / 2e6
+    except (KeyError, ValueError):
+        pass
+    return 1.0
+
+
+class Watchdog:
+    """Per-frame heartbeat with phase timings - phase('draw') ... beat() every frame"""
+    def __init__(self, stall_seconds=STALL_SECONDS, exit_on_stall=True):
+        self.stall_seconds = stall_seconds
+        self.exit_on_stall = exit_on_stall
+        # Crashes in C (SDL, NumPy) get a Python traceback too
+        faulthandler.enable()
+
+        now = time.monotonic()
+        self.last_beat = now
+        self.phase_name = 'startup'
+        self.phase_started = now
+        self.frame = {}
+        self.last_frame = {}
+        self.armed_at = 0
+        self.stalled = False
+
+        self.interval = min(ping_interval(), stall_seconds / 3)
+        self.thread = threading.Thread(target=self.watch, name='watchdog', daemon=True)
+        self.thread.start()
+        sd_notify('READY=1')
+
+    def phase(self, name):
+        """The loop moved on to another phase of the frame"""
+        now = time.monotonic()
+        self.frame[self.phase_name] = now - self.phase_started
+        self.phase_name = name
+        self.phase_started = now
+
+    def beat(self):
+        """End of a frame - the loop is alive"""
+        self.phase('events')  # next up: the top of the loop
+        self.last_frame, self.frame = self.frame, {}
+        now = self.phase_started
+        self.last_beat = now
+        if now - self.armed_at > REARM_SECONDS:
+            self.armed_at = now
+            faulthandler.dump_traceback_later(self.stall_seconds * BACKSTOP_FACTOR, exit=self.exit_on_stall)
+
+    def watch(self):
+        while True:
+            time.sleep(self.interval)
+            age = time.monotonic() - self.last_beat
+            if age < self.stall_seconds:
+                self.stalled = False
+                sd_notify('WATCHDOG=1')
+            elif not self.stalled:
+                self.stalled = True
+                self.report(age)
+                if self.exit_on_stall:
+                    sd_notify('STATUS=Game loop stalled - restarting')
+                    os._exit(1)
+
+    def report(self, age):
+        timings = ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.last_frame.items())
+        log.error("Game loop stalled for %.1fs in '%s' (last good frame: %s) - thread stacks follow",
+                  age, self.phase_name, timings or 'none', event='stall', seconds=round(age, 1), phase=self.phase_name,
+                  last_frame_ms={name: round(s * 1000, 1) for name, s in self.last_frame.items()})
+        # Written now, ahead of the stacks - we may be about to exit
+        gamelog.flush()
+        sys.stderr.flush()
+        faulthandler.dump_traceback(all_threads=True)
+
+    def close(self):
+        faulthandler.cancel_dump_traceback_later()
@@ -0,0 +1,142 @@
+"""
+Treat Quest weather
+Live weather from Open-Meteo, cached once per process and shared by every scene.
+Where weather_daemon.py is running, the snapshot comes from it over a Unix
+socket - one upstream fetch per location for every display at the site - and
+the game only fetches for itself when the daemon isn't there.
+
+    TREATQUEST_WEATHER_LOCATION=27.95,-82.46   # latitude,longitude (default Tampa)
+"""
+
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+
+import gamelog
+from paths import STATE_DIR
+
+log = gamelog.get('weather')
+
+WEATHER_API = 'https://api.open-meteo.com'
+WEATHER_QUERY = '/v1/forecast?latitude={lat}&longitude={lon}&current=weather_code,temperature_2m,is_day&temperature_unit=fahrenheit'
+WEATHER_UPDATE_INTERVAL = 600
+WEATHER_RETRY_INTERVAL = 60
+DAEMON_TIMEOUT = 15.0     # the daemon may be mid-fetch for us
+
+
+def parse_location(text):
+    """'lat,lon' -> (lat, lon) rounded to 2 places (about a kilometre) - the cache key too"""
+    lat, lon = (round(float(v), 2) for v in text.split(','))
+    return lat, lon
+
+
+LOCATION = parse_location(os.environ.get('TREATQUEST_WEATHER_LOCATION', '27.95,-82.46'))
+DAEMON_SOCKET = os.environ.get('TREATQUEST_WEATHER_SOCKET') or os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or STATE_DIR, 'treatquest-weather.sock')
+
+# Space weather cache
+weather_cache = {'condition': 'sunny', 'temp': 72, 'last_update': None}
+_fetch_thread = None
+_last_attempt = None
+
+
+def weather_url(location, api=WEATHER_API):
+    return api + WEATHER_QUERY.format(lat=location[0], lon=location[1])
+
+
+def snapshot_from(data):
+    """Open-Meteo response -> {'condition', 'temp', 'code'}"""
+    current = data.get('current', {})
+    code = current.get('weather_code', 0)
+
+    # Space weather conditions
+    if code in [95, 96, 99]:
+        condition = 'meteor_storm'
+    elif code in [51, 53, 55, 56, 57, 61, 63, 65, 80, 81, 82]:
+        condition = 'solar_rain'
+    elif code in [45, 48, 3]:
+        condition = 'nebula'
+    else:
+        condition = 'clear_space'
+    return {'condition': condition, 'temp': int(current.get('temperature_2m', 72)), 'code': code}
+
+
+def ask_daemon(location, path=None):
+    """The daemon's snapshot for location - None if there's no daemon or it has no weather for us,
+    so we fetch ourselves"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.connect(path or DAEMON_SOCKET)
+            sock.sendall(json.dumps({'lat': location[0], 'lon': location[1]}).encode() + b'\n')
+            reply = sock.makefile('rb').readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except OSError as e:
+        log.warning("Weather daemon unreachable, fetching directly: %s", e, event='weather_daemon_error')
+        return None
+    try:
+        reply = json.loads(reply)
+    except ValueError:
+        reply = {'error': 'no reply' if not reply else 'unreadable reply'}
+    if 'error' in reply:
+        # Just started, or upstream failing for it - we may still get through
+        log.warning("Weather daemon has nothing, fetching directly: %s", reply['error'], event='weather_daemon_error')
+        return None
+    return reply
+
+
+def fetch_direct(location):
+    cmd = ['curl', '-s', '--connect-timeout', '5', '--max-time', '10', weather_url(location)]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"curl exit {result.returncode}")
+    return snapshot_from(json.loads(result.stdout))
+
+
+def get_tampa_weather(location=LOCATION):
+    """Fetch weather (now from Space Station Tampa - or wherever TREATQUEST_WEATHER_LOCATION says!)"""
+    now = time.monotonic()
+
+    last = weather_cache['last_update']
+    if last is not None and now - last < WEATHER_UPDATE_INTERVAL:
+        return weather_cache
+
+    try:
+        snapshot = ask_daemon(location)
+        source = 'daemon'
+        if snapshot is None:
+            snapshot = fetch_direct(location)
+            source = 'direct'
+        weather_cache['condition'] = snapshot['condition']
+        weather_cache['temp'] = snapshot['temp']
+        # A snapshot the daemon has held for a while goes stale for us just as soon
+        weather_cache['last_update'] = now - min(snapshot.get('age', 0), WEATHER_UPDATE_INTERVAL)
+        log.info("Space weather: %s, Earth: %s°F", weather_cache['condition'], weather_cache['temp'],
+                 event='weather', condition=weather_cache['condition'], temp=weather_cache['temp'],
+                 source=source, age=snapshot.get('age'))
+    except Exception as e:
+        # Offline boxes retry every minute - one line every few minutes is plenty
+        log.warning("Space weather error: %s", e, event='weather_error', every=600)
+
+    return weather_cache
+
+
+def refresh_weather():
+    """Refresh the cache on a background thread if it is stale - safe to call every frame"""
+    global _fetch_thread, _last_attempt
+    now = time.monotonic()
+    last = weather_cache['last_update']
+    if last is not None and now - last < WEATHER_UPDATE_INTERVAL:
+        return weather_cache
+    # Failed fetches are retried once a minute, not every frame
+    if _last_attempt is not None and now - _last_attempt < WEATHER_RETRY_INTERVAL:
+        return weather_cache
+    if _fetch_thread is None or not _fetch_thread.is_alive():
+        _last_attempt = now
+        _fetch_thread = threading.Thread(target=get_tampa_weather, name='weather', daemon=True)
+        _fetch_thread.start()
+    return weather_cache
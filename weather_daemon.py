@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Treat Quest weather daemon
+One weather fetcher for every display at a site. Games ask over a Unix socket
+(one JSON line each way) and get the snapshot for their location; the daemon
+fetches each location at most once per update interval, over one kept-alive
+connection with conditional requests, and keeps what it has on disk so a
+restart doesn't refetch. Games that find no daemon fetch for themselves.
+
+    python3 weather_daemon.py                                   # serve on the default socket
+    python3 weather_daemon.py --upstream http://127.0.0.1:8000  # against a stub API server
+    python3 weather_daemon.py --status                          # ask a running daemon what it holds
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+
+import gamelog
+from paths import STATE_DIR
+from weather import DAEMON_SOCKET, WEATHER_API, WEATHER_QUERY, WEATHER_UPDATE_INTERVAL, parse_location, snapshot_from
+
+log = gamelog.get('weatherd')
+
+CACHE_PATH = os.path.join(STATE_DIR, 'weather_daemon.json')
+UPSTREAM_TIMEOUT = 10.0
+FAILURE_BACKOFF = 60       # after a failed fetch, serve what we have this long before trying again
+KEEP_WARM = 3600           # locations asked for this recently are refreshed before anyone has to wait
+PREFETCH_LEAD = 30         # ...this many seconds before they go stale
+CLIENT_TIMEOUT = 5.0
+
+
+class Upstream:
+    """One kept-alive HTTP(S) connection to the weather API - one request at a time"""
+    def __init__(self, base):
+        parts = urllib.parse.urlsplit(base)
+        cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.conn = cls(parts.netloc, timeout=UPSTREAM_TIMEOUT)
+        self.prefix = parts.path.rstrip('/')
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connects = 0
+
+    def get(self, path, headers):
+        """(status, response, body) - a keep-alive connection the server dropped is reopened once"""
+        with self.lock:
+            for attempt in (0, 1):
+                if self.conn.sock is None:
+                    self.connects += 1
+                try:
+                    self.conn.request('GET', self.prefix + path, headers=headers)
+                    response = self.conn.getresponse()
+                    body = response.read()
+                    self.requests += 1
+                    return response.status, response, body
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    self.conn.close()
+                    if attempt:
+                        raise
+                except (http.client.HTTPException, OSError):
+                    self.conn.close()
+                    raise
+
+
+class Location:
+    """What the daemon knows about one place - fetched_at is wall-clock so it survives a restart"""
+    def __init__(self, saved=None):
+        saved = saved or {}
+        self.snapshot = saved.get('snapshot')
+        self.fetched_at = saved.get('fetched_at', 0)
+        self.etag = saved.get('etag')
+        self.last_modified = saved.get('last_modified')
+        self.failed_at = 0
+        self.error = None
+        self.asked_at = 0
+        self.lock = threading.Lock()  # one fetch per location however many displays ask at once
+
+    def saved(self):
+        return {'snapshot': self.snapshot, 'fetched_at': self.fetched_at, 'etag': self.etag,
+                'last_modified': self.last_modified}
+
+
+class WeatherDaemon:
+    def __init__(self, upstream, cache_path=CACHE_PATH, interval=WEATHER_UPDATE_INTERVAL):
+        self.upstream = upstream
+        self.cache_path = cache_path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.counts = {'served': 0, 'fetched': 0, 'not_modified': 0, 'errors': 0}
+        self.locations = {}
+        try:
+            with open(cache_path) as f:
+                for key, saved in json.load(f).items():
+                    self.locations[key] = Location(saved)
+            log.info("Weather cache: %d location(s) from %s", len(self.locations), cache_path,
+                     event='weatherd_cache_loaded')
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning("Weather cache unreadable, starting empty: %s", e, event='weatherd_cache_error')
+
+    def entry(self, key):
+        with self.lock:
+            if key not in self.locations:
+                self.locations[key] = Location()
+            return self.locations[key]
+
+    def snapshot(self, location):
+        """Snapshot for (lat, lon) with its age - fetched first if it's stale and upstream isn't failing"""
+        key = f"{location[0]},{location[1]}"
+        entry = self.entry(key)
+        entry.asked_at = time.time()
+        with entry.lock:
+            self.refresh_if_stale(entry, location)
+            if entry.snapshot is None:
+                raise RuntimeError(f"no weather for {key} yet: {entry.error}")
+            age = time.time() - entry.fetched_at
+            snapshot = dict(entry.snapshot, age=round(age, 1), stale=age >= self.interval)
+        self.counts['served'] += 1
+        return snapshot
+
+    def refresh_if_stale(self, entry, location, lead=0):
+        now = time.time()
+        fresh = entry.snapshot is not None and now - entry.fetched_at < self.interval - lead
+        if fresh or now - entry.failed_at < FAILURE_BACKOFF:
+            return
+        try:
+            self.fetch(entry, location)
+        except Exception as e:
+            entry.failed_at = time.time()
+            entry.error = str(e)
+            self.counts['errors'] += 1
+            log.warning("Weather fetch failed for %s,%s: %s", location[0], location[1], e,
+                        event='weatherd_fetch_error', every=600)
+
+    def fetch(self, entry, location):
+        headers = {'Accept': 'application/json'}
+        # Validators only go with a snapshot to fall back on - a 304 has no body
+        if entry.snapshot is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        start = time.perf_counter()
+        status, response, body = self.upstream.get(WEATHER_QUERY.format(lat=location[0], lon=location[1]), headers)
+        ms = round((time.perf_counter() - start) * 1000, 1)
+        if status == 304 and entry.snapshot is not None:
+            self.counts['not_modified'] += 1
+        elif status == 200:
+            entry.snapshot = snapshot_from(json.loads(body))
+            entry.etag = response.getheader('ETag')
+            entry.last_modified = response.getheader('Last-Modified')
+            self.counts['fetched'] += 1
+        else:
+            raise RuntimeError(f"HTTP {status}")
+        entry.fetched_at = time.time()
+        entry.error = None
+        log.info("Weather for %s,%s: %s, %s°F (%s in %sms)", location[0], location[1], entry.snapshot['condition'],
+                 entry.snapshot['temp'], 'unchanged' if status == 304 else 'fetched', ms, event='weatherd_fetch',
+                 status=status, ms=ms)
+        self.save()
+
+    def prefetch(self):
+        """Background thread: refresh locations games still ask about just before they go stale"""
+        while True:
+            time.sleep(PREFETCH_LEAD / 2)
+            with self.lock:
+                entries = list(self.locations.items())
+            for key, entry in entries:
+                if time.time() - entry.asked_at < KEEP_WARM and entry.lock.acquire(blocking=False):
+                    try:
+                        self.refresh_if_stale(entry, parse_location(key), lead=PREFETCH_LEAD)
+                    finally:
+                        entry.lock.release()
+
+    def save(self):
+        with self.lock:
+            data = {key: entry.saved() for key, entry in self.locations.items() if entry.snapshot is not None}
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.cache_path)
+            except OSError as e:
+                log.warning("Weather cache not saved: %s", e, event='weatherd_cache_error')
+
+    def status(self):
+        now = time.time()
+        with self.lock:
+            locations = {key: {'snapshot': entry.snapshot, 'etag': entry.etag, 'error': entry.error,
+                               'age': round(now - entry.fetched_at, 1) if entry.snapshot else None}
+                         for key, entry in self.locations.items()}
+        return dict(self.counts, locations=locations, upstream_requests=self.upstream.requests,
+                    upstream_connects=self.upstream.connects)
+
+
+class SnapshotHandler(socketserver.StreamRequestHandler):
+    """One request line in ({"lat", "lon"} or {"status": true}), one reply line out"""
+    timeout = CLIENT_TIMEOUT
+
+    def handle(self):
+        daemon = self.server.weather
+        try:
+            request = json.loads(self.rfile.readline())
+            if request.get('status'):
+                reply = daemon.status()
+            else:
+                reply = daemon.snapshot(parse_location(f"{request['lat']},{request['lon']}"))
+        except Exception as e:
+            reply = {'error': str(e)}
+        try:
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+        except OSError:
+            pass  # the game gave up waiting
+
+
+def claim_socket(path):
+    """Clear a socket file left by a daemon that died - refuse if one is still answering"""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.remove(path)
+            return
+    sys.exit(f"A weather daemon is already listening on {path}")
+
+
+def query_status(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        sock.connect(path)
+        sock.sendall(b'{"status": true}\n')
+        return json.loads(sock.makefile('rb').readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared weather fetcher for every Treat Quest display on this box")
+    parser.add_argument('--socket', default=DAEMON_SOCKET)
+    parser.add_argument('--upstream', default=WEATHER_API, help="weather API base URL (a stub server when testing)")
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--interval', type=int, default=WEATHER_UPDATE_INTERVAL, help="seconds a snapshot stays fresh")
+    parser.add_argument('--status', action='store_true', help="print a running daemon's status and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        try:
+            print(json.dumps(query_status(args.socket), indent=1, ensure_ascii=False))
+        except OSError as e:
+            sys.exit(f"No weather daemon on {args.socket}: {e}")
+        return
+
+    daemon = WeatherDaemon(Upstream(args.upstream), args.cache, args.interval)
+    claim_socket(args.socket)
+    server = socketserver.ThreadingUnixStreamServer(args.socket, SnapshotHandler)
+    server.daemon_threads = True
+    server.weather = daemon
+    # Games may run as another user
+    os.chmod(args.socket, 0o666)
+    threading.Thread(target=daemon.prefetch, name='weather-prefetch', daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    log.info("Weather daemon on %s, upstream %s, %ds interval", args.socket, args.upstream, args.interval,
+             event='weatherd_started')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(args.socket)
+        except OSError:
+            pass
+        log.info("Weather daemon stopped", event='weatherd_stopped', **daemon.counts)
+
+
+if __name__ == "__main__":
+    main()